@@ -2,17 +2,42 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from datetime import datetime, date, timedelta
+import plotly.graph_objects as go
+from datetime import datetime, date
 import json
 import os
+import glob
 import base64
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
+import uuid
+from plm.profiler import profiler, PROFILE_ENABLED_BY_ENV
+from plm.schedule import backward_schedule
+from plm.calendar_html import (
+    PHASE_COLORS, MonthHtmlCache, calendar_months, calendar_pages, default_calendar_page, phase_intervals,
+    render_calendar_page, render_full_calendar,
+)
+from plm.sheets_format import build_product_rows
+from plm.portfolio import aggregate_for_gantt, compute_portfolio_schedule
+from plm.workload import weekly_workload
+from plm.kanban import KANBAN_STATUSES, classify_status
+from plm.overlay import PhaseIntervalIndex, overlay_months, render_overlay_page
+from plm.holidays import DEFAULT_REGION, HolidayCalendarStore, compile_holiday_store
+from plm.calendars import CALENDARS_PATH, CalendarRegistry, WEEKDAY_NAMES, load_calendars
+from plm.excludes import ExcludeSet
+from plm.export import PARQUET_AVAILABLE, available_formats, build_schedule_zip
+from plm.repository import ProductRepository
+from plm.state import ProductState, SyncTracker, normalize_phases_frame
+from plm.shared_store import SessionSync, SharedProductStore
+from plm.sheets_io import SheetsIO
+from plm.sheets_cache import REVISION_CELL, ProductSheetCache
+from plm.storage import SheetsStorage
+from plm.solver import DEFAULT_CRASH_COST, default_min_lead_time, solve_compression
+from plm.scenarios import SCENARIO_COLUMNS, compare_scenarios, phase_column_labels, scenarios_from_frame
+from plm.sensitivity import phase_sensitivity
+from plm.drift import STATUS_SAME, DriftDetector, drift_summary
+from plm.asana_sync import DEFAULT_STATE_PATH as ASANA_STATE_PATH, sync_task_dates
 # Google Sheets 관련 라이브러리 (선택적)
 try:
     import gspread
@@ -25,16 +50,83 @@ except ImportError:
 # ✅ 앱 설정
 st.set_page_config(page_title="이퀄베리 신제품 일정 관리", layout="wide")
 
+# ✅ 성능 프로파일링 (선택: 사이드바 토글 또는 PLM_PROFILE=1)
+perf_debug_enabled = st.sidebar.checkbox("🐢 성능 디버그 모드", key="perf_debug_enabled",
+                                         help="구간별 실행 시간과 Sheets API 호출 시간을 측정합니다")
+profiler.begin_run(enabled=PROFILE_ENABLED_BY_ENV or perf_debug_enabled)
+
 # ✅ 기본 단계 정의
 DEFAULT_PHASES = [
-    {"단계": "사전 시장조사", "리드타임": 20, "담당자": "", "Asana Task 코드": ""},
-    {"단계": "부자재 사양확정 및 샘플링", "리드타임": 30, "담당자": "", "Asana Task 코드": ""},
-    {"단계": "CT 및 사전 품질 확보", "리드타임": 10, "담당자": "", "Asana Task 코드": ""},
-    {"단계": "부자재 발주~입고", "리드타임": 20, "담당자": "", "Asana Task 코드": ""},
-    {"단계": "완제품 발주~생산", "리드타임": 15, "담당자": "", "Asana Task 코드": ""},
-    {"단계": "품질 초도 검사~입고", "리드타임": 5, "담당자": "", "Asana Task 코드": ""},
+    {"단계": "사전 시장조사", "리드타임": 20, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
+    {"단계": "부자재 사양확정 및 샘플링", "리드타임": 30, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
+    {"단계": "CT 및 사전 품질 확보", "리드타임": 10, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
+    {"단계": "부자재 발주~입고", "리드타임": 20, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
+    {"단계": "완제품 발주~생산", "리드타임": 15, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
+    {"단계": "품질 초도 검사~입고", "리드타임": 5, "담당자": "", "Asana Task 코드": "", "캘린더": ""},
 ]
 
+# ✅ 공휴일 저장소 설정
+HOLIDAY_SOURCE_PATTERN = "공휴일_*_exclude_settings.json"
+HOLIDAY_STORE_PATH = "holiday_store.bin"
+HOLIDAY_STORE_YEARS = (2020, 2035)
+
+@st.cache_resource(show_spinner=False)
+def open_holiday_stores():
+    """경로별로 현재 열려 있는 공휴일 저장소 (새로 열 때 이전 저장소의 mmap을 닫기 위해 보관)"""
+    return {}
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_holiday_store(source_signature, store_path=HOLIDAY_STORE_PATH):
+    """공휴일 비트셋 저장소를 mmap으로 열기 (없거나 소스 JSON보다 오래되었으면 다시 컴파일)
+
+    소스가 바뀌어 다시 열면 이전 캐시 항목은 밀려나고 그 저장소의 mmap도 닫음.
+    """
+    source_files = [path for path, _ in source_signature]
+    if not source_files:
+        raise FileNotFoundError(HOLIDAY_SOURCE_PATTERN)
+    newest_source = max(mtime for _, mtime in source_signature)
+    if not os.path.exists(store_path) or os.path.getmtime(store_path) < newest_source:
+        compile_holiday_store(store_path, {DEFAULT_REGION: source_files}, *HOLIDAY_STORE_YEARS)
+    store = HolidayCalendarStore(store_path)
+    previous = open_holiday_stores().get(store_path)
+    open_holiday_stores()[store_path] = store
+    if previous is not None:
+        previous.close()
+    return store
+
+def holiday_source_signature():
+    """공휴일 소스 파일 목록과 수정 시각 (캐시 키)"""
+    return tuple((path, os.path.getmtime(path)) for path in sorted(glob.glob(HOLIDAY_SOURCE_PATTERN)))
+
+# ✅ 단계별 근무 캘린더 (공급사/공장별 근무 요일·휴일) 설정
+WORKING_CALENDARS_PATH = os.environ.get("PLM_CALENDARS_PATH", CALENDARS_PATH)
+
+@st.cache_resource(show_spinner=False)
+def load_working_calendars(source_signature):
+    """근무 캘린더 정의 읽기 - 캘린더별 근무일 인덱스를 모든 세션이 공유 (정의 파일이 바뀌면 다시 읽음)"""
+    return load_calendars(source_signature[0])
+
+def working_calendars_signature(path=WORKING_CALENDARS_PATH):
+    """근무 캘린더 정의 파일 경로와 수정 시각 (캐시 키, 파일이 없으면 None)"""
+    return (path, os.path.getmtime(path) if os.path.exists(path) else None)
+
+# ✅ 로컬 제품 저장소 설정 (*_product_data.json 디렉터리)
+PRODUCT_DATA_DIR = os.environ.get("PLM_PRODUCT_DIR", ".")
+
+# 변경 추적 대상 (마지막 저장 이후 바뀐 제품만 저장)
+SYNC_LOCAL = "로컬"
+SYNC_SHEETS = "Sheets"
+
+@st.cache_resource(show_spinner=False)
+def get_product_repository(directory=PRODUCT_DATA_DIR):
+    """제품 저장소 (인덱스만 메모리에 유지, 본문은 선택 시 로드)"""
+    return ProductRepository(directory)
+
+@st.cache_resource(show_spinner=False)
+def get_shared_store():
+    """모든 세션이 함께 쓰는 제품 저장소 (제품별 버전으로 동시 편집 충돌 감지)"""
+    return SharedProductStore()
+
 # ✅ 총 리드타임 계산 (세션 상태 초기화 후)
 def calculate_total_lead_time():
     total_lead_time = 0
@@ -45,6 +137,26 @@ def calculate_total_lead_time():
 
 
 
+@st.cache_resource(show_spinner=False)
+def get_sheets_io():
+    """모든 세션이 함께 쓰는 Sheets 호출 계층 (할당량 속도 제한, 429/5xx 재시도, 동일 읽기 병합)"""
+    return SheetsIO()
+
+@st.cache_resource(show_spinner=False)
+def get_product_sheet_cache():
+    """모든 세션이 함께 쓰는 제품 워크시트 파싱 결과 캐시 (저장일시가 같으면 재사용)"""
+    return ProductSheetCache()
+
+@st.cache_resource(show_spinner=False)
+def get_month_html_cache():
+    """모든 세션이 함께 쓰는 월별 캘린더 HTML 조각 저장소"""
+    return MonthHtmlCache()
+
+def sheets_call(name, fn, *args, dedupe_key=None, **kwargs):
+    """Google Sheets API 호출 (공통 I/O 계층 + 프로파일러 계측) - dedupe_key는 읽기 호출에만 지정"""
+    return profiler.timed_call(f"Sheets API: {name}", get_sheets_io().call, name, fn, *args,
+                               dedupe_key=dedupe_key, **kwargs)
+
 def get_google_sheets_client():
     """Google Sheets API 클라이언트 생성"""
     if not GOOGLE_SHEETS_AVAILABLE:
@@ -91,7 +203,8 @@ def get_google_sheets_client():
             )
         
         st.info("gspread 클라이언트 생성 중...")
-        client = gspread.authorize(creds)
+        # 인증 객체 생성만 하고 API 요청은 보내지 않으므로 할당량 계층을 거치지 않음
+        client = profiler.timed_call("Sheets API: authorize", gspread.authorize, creds)
         st.info("Google Sheets 클라이언트 생성 완료")
         return client
     except Exception as e:
@@ -123,13 +236,13 @@ def save_product_data_to_sheets(product_name, product_data, spreadsheet_id=None)
         if spreadsheet_id:
             try:
                 st.info(f"기존 스프레드시트 열기 시도: {spreadsheet_id}")
-                spreadsheet = client.open_by_key(spreadsheet_id)
+                spreadsheet = sheets_call("open_by_key", client.open_by_key, spreadsheet_id, dedupe_key=spreadsheet_id)
                 st.info(f"기존 스프레드시트 열기 성공: {spreadsheet_id}")
             except Exception as e:
                 st.error(f"기존 스프레드시트 열기 실패: {e}")
                 st.info("새 스프레드시트를 생성합니다...")
                 try:
-                    spreadsheet = client.create("이퀄베리_PLM_데이터")
+                    spreadsheet = sheets_call("create", client.create, "이퀄베리_PLM_데이터")
                     spreadsheet_id = spreadsheet.id
                     st.info(f"새 스프레드시트 생성됨: {spreadsheet_id}")
                 except Exception as e2:
@@ -139,123 +252,32 @@ def save_product_data_to_sheets(product_name, product_data, spreadsheet_id=None)
             # 스프레드시트 ID가 없으면 새로 생성
             try:
                 st.info("새 스프레드시트 생성 중...")
-                spreadsheet = client.create("이퀄베리_PLM_데이터")
+                spreadsheet = sheets_call("create", client.create, "이퀄베리_PLM_데이터")
                 spreadsheet_id = spreadsheet.id
                 st.info(f"새 스프레드시트 생성됨: {spreadsheet_id}")
             except Exception as e:
                 st.error(f"스프레드시트 생성 실패: {e}")
                 return False, None, None
         
-        # 제품명으로 워크시트 탭 생성 (기존 탭이 있으면 덮어쓰기)
-        worksheet_title = f"{product_name}_데이터"
-        
-        st.info(f"워크시트 탭 생성 중: {worksheet_title}")
-        
-        # 기존 워크시트가 있으면 삭제
-        try:
-            existing_worksheet = spreadsheet.worksheet(worksheet_title)
-            spreadsheet.del_worksheet(existing_worksheet)
-            st.info("기존 워크시트 삭제 완료")
-        except Exception as e:
-            st.info(f"기존 워크시트가 없거나 삭제 실패: {e}")
-        
-        # 새 워크시트 생성
-        try:
-            worksheet = spreadsheet.add_worksheet(title=worksheet_title, rows=100, cols=20)
-            st.info("새 워크시트 생성 완료")
-        except Exception as e:
-            st.error(f"워크시트 생성 실패: {e}")
-            return False, None, None
-        
-        # 데이터 준비
-        phases_df = product_data["phases"]
-        excludes_list = list(product_data["custom_excludes"])
-        target_date = product_data["target_date"].isoformat() if product_data["target_date"] else ""
-        team_members = product_data.get("team_members", [])
-        
-        # 헤더와 데이터 준비
-        data_to_write = []
-        
-        # 1. 제품 정보
-        data_to_write.extend([
-            ["제품명", product_name],
-            ["목표완료일", target_date],
-            ["저장일시", datetime.now().isoformat()],
-            [""],  # 빈 줄
-        ])
-        
-        # 2. 담당자 목록
-        data_to_write.extend([
-            ["담당자 목록"],
-            ["번호", "담당자명"]
-        ])
-        for i, member in enumerate(team_members, 1):
-            data_to_write.append([i, member])
-        data_to_write.append([""])  # 빈 줄
+        # 제품명으로 워크시트 탭 생성 (기존 탭이 있으면 삭제 후 새로 생성)
+        storage = SheetsStorage(spreadsheet, call=sheets_call, cache=get_product_sheet_cache())
+        st.info(f"워크시트 탭 생성 중: {storage.worksheet_title(product_name)}")
         
-        # 3. 제외일 목록
-        data_to_write.extend([
-            ["제외일 목록"],
-            ["번호", "제외일"]
-        ])
-        for i, exclude_date in enumerate(sorted(excludes_list), 1):
-            data_to_write.append([i, exclude_date.isoformat()])
-        data_to_write.append([""])  # 빈 줄
-        
-        # 4. 단계별 데이터
-        data_to_write.extend([
-            ["단계별 개발 일정"],
-            ["단계", "리드타임", "담당자", "Asana Task 코드"]
-        ])
-        for _, row in phases_df.iterrows():
-            data_to_write.append([
-                row["단계"],
-                row["리드타임"],
-                row["담당자"],
-                row["Asana Task 코드"]
-            ])
-        
-        # 5. 단계별 시작/종료일 계산 및 저장
-        try:
-            # target_date가 문자열인 경우 date 객체로 변환
-            if isinstance(target_date, str):
-                target_date = datetime.fromisoformat(target_date).date()
-            elif target_date is None:
-                target_date = datetime.today().date()
-            
-            # 시작/종료일 계산
-            schedule_data = backward_schedule(target_date, phases_df.to_dict('records'), excludes_list)
-            schedule_df = pd.DataFrame(schedule_data)
-            
-            data_to_write.extend([
-                [""],  # 빈 줄
-                ["단계별 시작/종료일"],
-                ["단계", "시작일", "종료일", "담당자", "Asana Task 코드"]
-            ])
-            
-            for _, row in schedule_df.iterrows():
-                data_to_write.append([
-                    row["단계"],
-                    row["시작일"].strftime("%Y-%m-%d") if pd.notna(row["시작일"]) else "",
-                    row["종료일"].strftime("%Y-%m-%d") if pd.notna(row["종료일"]) else "",
-                    row["담당자"],
-                    row["Asana Task 코드"]
-                ])
-        except Exception as e:
-            st.warning(f"시작/종료일 계산 중 오류 발생: {e}")
-            data_to_write.extend([
-                [""],  # 빈 줄
-                ["단계별 시작/종료일"],
-                ["⚠️ 시작/종료일 계산 실패"]
-            ])
+        # 데이터 준비 (제품 정보 / 담당자 / 제외일 / 단계 / 시작·종료일 섹션)
+        saved_at = datetime.now().isoformat()
+        data_to_write, schedule_error = build_product_rows(
+            product_name, product_data, saved_at=saved_at, calendars=working_calendars
+        )
+        if schedule_error:
+            st.warning(f"시작/종료일 계산 중 오류 발생: {schedule_error}")
         
-        # 데이터 쓰기
+        # 데이터 쓰기 (저장한 값으로 캐시도 채움 - 저장일시가 버전)
         try:
             st.info(f"데이터 쓰기 중... (총 {len(data_to_write)}행)")
-            worksheet.update('A1', data_to_write)
+            storage.write_rows(product_name, data_to_write, saved_at)
             st.info("데이터 쓰기 완료")
         except Exception as e:
-            st.error(f"데이터 쓰기 실패: {e}")
+            st.error(f"워크시트 저장 실패: {e}")
             return False, None, None
         
         # 스프레드시트 URL 반환
@@ -275,105 +297,22 @@ def load_product_data_from_sheets(spreadsheet_id, product_name=None):
         if not client:
             return None
         
-        spreadsheet = client.open_by_key(spreadsheet_id)
+        spreadsheet = sheets_call("open_by_key", client.open_by_key, spreadsheet_id, dedupe_key=spreadsheet_id)
+        storage = SheetsStorage(spreadsheet, call=sheets_call, cache=get_product_sheet_cache())
         
-        # 제품명이 지정되지 않으면 사용 가능한 워크시트 목록 표시
+        # 제품명이 지정되지 않으면 첫 번째 제품 데이터 워크시트 사용
         if not product_name:
-            worksheets = spreadsheet.worksheets()
-            worksheet_names = [ws.title for ws in worksheets if ws.title.endswith("_데이터")]
-            if not worksheet_names:
+            product_names = storage.names()
+            if not product_names:
                 st.error("❌ 저장된 제품 데이터가 없습니다.")
                 return None
-            
-            # 첫 번째 제품 데이터 워크시트 사용
-            worksheet_title = worksheet_names[0]
-            product_name = worksheet_title.replace("_데이터", "")
-        else:
-            worksheet_title = f"{product_name}_데이터"
+            product_name = product_names[0]
         
-        try:
-            worksheet = spreadsheet.worksheet(worksheet_title)
-        except:
+        # 저장일시 셀이 캐시와 같으면 전체 값 다운로드/파싱 생략
+        loaded_data = storage.load(product_name)
+        if loaded_data is None:
             st.error(f"❌ '{product_name}' 제품 데이터를 찾을 수 없습니다.")
-            return None
-        
-        # 모든 데이터 읽기
-        all_data = worksheet.get_all_values()
-        
-        # 데이터 파싱
-        product_name = ""
-        target_date = None
-        team_members = []
-        excludes_list = []
-        phases_data = []
-        
-        current_section = None
-        schedule_data = []  # 시작/종료일 데이터 저장용
-        
-        for row in all_data:
-            if not row or not row[0]:  # 빈 줄 건너뛰기
-                continue
-            
-            if row[0] == "제품명":
-                product_name = row[1] if len(row) > 1 else ""
-            elif row[0] == "목표완료일":
-                target_date_str = row[1] if len(row) > 1 else ""
-                if target_date_str:
-                    target_date = datetime.fromisoformat(target_date_str).date()
-            elif row[0] == "담당자 목록":
-                current_section = "team_members"
-            elif row[0] == "제외일 목록":
-                current_section = "excludes"
-            elif row[0] == "단계별 개발 일정":
-                current_section = "phases"
-            elif row[0] == "단계별 시작/종료일":
-                current_section = "schedule"
-            elif current_section == "team_members" and row[0] != "번호":
-                if len(row) > 1:
-                    team_members.append(row[1])
-            elif current_section == "excludes" and row[0] != "번호":
-                if len(row) > 1:
-                    try:
-                        exclude_date = datetime.fromisoformat(row[1]).date()
-                        excludes_list.append(exclude_date)
-                    except:
-                        pass
-            elif current_section == "phases" and row[0] != "단계":
-                if len(row) >= 4:
-                    phases_data.append({
-                        "단계": row[0],
-                        "리드타임": int(row[1]) if row[1].isdigit() else 0,
-                        "담당자": row[2],
-                        "Asana Task 코드": row[3]
-                    })
-            elif current_section == "schedule" and row[0] != "단계" and row[0] != "⚠️ 시작/종료일 계산 실패":
-                if len(row) >= 5:
-                    try:
-                        start_date = datetime.strptime(row[1], "%Y-%m-%d").date() if row[1] else None
-                        end_date = datetime.strptime(row[2], "%Y-%m-%d").date() if row[2] else None
-                        schedule_data.append({
-                            "단계": row[0],
-                            "시작일": start_date,
-                            "종료일": end_date,
-                            "담당자": row[3],
-                            "Asana Task 코드": row[4]
-                        })
-                    except:
-                        pass
-        
-        # DataFrame 생성
-        phases_df = pd.DataFrame(phases_data)
-        schedule_df = pd.DataFrame(schedule_data) if schedule_data else pd.DataFrame()
-        excludes_set = set(excludes_list)
-        
-        return {
-            "product_name": product_name,
-            "phases": phases_df,
-            "schedule": schedule_df,  # 시작/종료일 데이터 추가
-            "custom_excludes": excludes_set,
-            "target_date": target_date,
-            "team_members": team_members
-        }
+        return loaded_data
     except Exception as e:
         st.error(f"Google 스프레드시트 불러오기 중 오류 발생: {e}")
         return None
@@ -381,38 +320,6 @@ def load_product_data_from_sheets(spreadsheet_id, product_name=None):
 
 
 
-# ✅ 일정 역산
-def backward_schedule(target_date, phases, excluded_days):
-    schedule = []
-    current_date = target_date
-    
-    for phase in reversed(phases):
-        name, lead_time = phase['단계'], phase['리드타임']
-        담당자, asana_code = phase.get("담당자", ""), phase.get("Asana Task 코드", "")
-        workdays, date_cursor = 0, current_date
-        
-        # 리드타임만큼 평일을 역산
-        while workdays < lead_time:
-            date_cursor -= timedelta(days=1)
-            if date_cursor.weekday() < 5 and date_cursor not in excluded_days:
-                workdays += 1
-        
-        # 시작일이 주말이거나 제외일인 경우 평일로 조정
-        start_date = date_cursor + timedelta(days=1)
-        while start_date.weekday() >= 5 or start_date in excluded_days:
-            start_date -= timedelta(days=1)
-        
-        schedule.append({
-            "단계": name,
-            "시작일": start_date,
-            "종료일": current_date,
-            "담당자": 담당자,
-            "Asana Task 코드": asana_code
-        })
-        current_date = start_date
-    
-    return list(reversed(schedule))
-
 # ✅ 시각화 옵션들
 def show_timeline_view(df):
     """타임라인 뷰 - 각 단계별 진행 상황을 시간순으로 표시"""
@@ -421,6 +328,10 @@ def show_timeline_view(df):
     df_chart["종료일"] = pd.to_datetime(df_chart["종료일"])
     df_chart["기간"] = (df_chart["종료일"] - df_chart["시작일"]).dt.days + 1
     
+    # 막대 라벨 (단계명 + 담당자) - annotation 대신 트레이스 텍스트로 표시
+    담당자_표시 = df_chart["담당자"].fillna("").astype(str)
+    df_chart["라벨"] = df_chart["단계"].astype(str) + 담당자_표시.map(lambda member: f"<br>👤 {member}" if member else "")
+    
     # 연도 정보 추가
     start_year = df_chart["시작일"].min().year
     end_year = df_chart["종료일"].max().year
@@ -428,7 +339,9 @@ def show_timeline_view(df):
     
     # 타임라인 차트
     fig = px.timeline(df_chart, x_start="시작일", x_end="종료일", y="단계", 
-                      color="단계", hover_data=["담당자", "Asana Task 코드", "기간"])
+                      color="단계", text="라벨", hover_data=["담당자", "Asana Task 코드", "기간"])
+    fig.update_traces(textposition="inside", insidetextanchor="middle",
+                      textfont=dict(size=10, color="white"))
     
     # 세로축 개선 - 가로 구분선 추가
     fig.update_yaxes(
@@ -462,37 +375,109 @@ def show_timeline_view(df):
         margin=dict(l=50, r=50, t=80, b=50)
     )
     
-    # 타임라인 바에 텍스트 추가
-    for i, row in df_chart.iterrows():
-        # 중간 지점 계산
-        mid_date = row["시작일"] + (row["종료일"] - row["시작일"]) / 2
-        
-        # 텍스트 추가
-        fig.add_annotation(
-            x=mid_date,
-            y=row["단계"],
-            text=row["단계"],
-            showarrow=False,
-            font=dict(size=10, color="white"),
-            bgcolor="rgba(0,0,0,0.7)",
-            bordercolor="white",
-            borderwidth=1
-        )
-        
-        # 담당자 정보도 추가 (있는 경우)
-        if row["담당자"]:
-            fig.add_annotation(
-                x=mid_date,
-                y=row["단계"],
-                text=f"👤 {row['담당자']}",
-                showarrow=False,
-                font=dict(size=8, color="white"),
-                bgcolor="rgba(0,0,0,0.5)",
-                bordercolor="white",
-                borderwidth=1,
-                yshift=-20
-            )
+    st.plotly_chart(fig, use_container_width=True)
+
+def show_portfolio_gantt(portfolio_df, max_bars=1500):
+    """포트폴리오 간트 뷰 - 전체 제품 일정을 WebGL 트레이스로 표시 (막대가 많으면 자동 집계)"""
+    st.subheader("🗂️ 포트폴리오 간트 차트")
+    
+    if portfolio_df.empty:
+        st.info("표시할 제품 일정이 없습니다. 먼저 제품을 추가해주세요.")
+        return
+    
+    level, bars = aggregate_for_gantt(portfolio_df, max_bars=max_bars)
+    if level != "단계":
+        st.caption(f"⚡ 단계 {len(portfolio_df):,}개를 {level} 단위 막대 {len(bars):,}개로 집계하여 표시합니다.")
     
+    row_count = len(bars)
+    height = int(min(max(row_count * 22 + 120, 400), 1600))
+    bar_width = max(2, min(14, int((height - 120) / row_count * 0.7)))
+    
+    # 그룹(단계명)이 너무 많으면 상위 그룹만 색 구분하고 나머지는 '기타'로 묶음
+    group_counts = bars["그룹"].value_counts()
+    if len(group_counts) > 20:
+        top_groups = set(group_counts.index[:19])
+        bars = bars.assign(그룹=bars["그룹"].where(bars["그룹"].isin(top_groups), "기타"))
+    
+    # 막대 1개 = (시작, 종료, None) 3점짜리 선분 - 그룹별로 하나의 Scattergl 트레이스에 모음
+    fig = go.Figure()
+    palette = px.colors.qualitative.Plotly + px.colors.qualitative.Set2 + px.colors.qualitative.Pastel
+    for color_index, (group, group_bars) in enumerate(bars.groupby("그룹", sort=False)):
+        n = len(group_bars)
+        x = np.empty(n * 3, dtype=object)
+        x[0::3] = group_bars["시작일"].to_numpy()
+        x[1::3] = group_bars["종료일"].to_numpy()
+        x[2::3] = None
+        y = np.full(n * 3, np.nan)
+        y[0::3] = group_bars.index.to_numpy()
+        y[1::3] = group_bars.index.to_numpy()
+        hover = np.empty(n * 3, dtype=object)
+        hover[0::3] = (group_bars["라벨"] + "<br>" + group_bars["시작일"].dt.strftime("%Y/%m/%d") + " ~ "
+                       + group_bars["종료일"].dt.strftime("%Y/%m/%d") + "<br>" + group_bars["상세"]).to_numpy()
+        hover[1::3] = hover[0::3]
+        hover[2::3] = None
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode="lines", name=str(group),
+            line=dict(width=bar_width, color=palette[color_index % len(palette)]),
+            hovertext=hover, hoverinfo="text", connectgaps=False
+        ))
+    
+    # 오늘 기준선
+    fig.add_vline(x=pd.Timestamp(datetime.today().date()), line_dash="dot", line_color="red")
+    
+    # 행 수가 적을 때만 세로축 라벨 표시 (많으면 hover로 확인)
+    if row_count <= 80:
+        fig.update_yaxes(tickmode="array", tickvals=list(range(row_count)), ticktext=bars["라벨"].tolist())
+    else:
+        fig.update_yaxes(showticklabels=False)
+    fig.update_yaxes(autorange="reversed", showgrid=False, zeroline=False)
+    fig.update_xaxes(title="날짜", type="date", showgrid=True, gridcolor="lightgray")
+    fig.update_layout(
+        height=height,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=50, r=50, t=60, b=50),
+        hovermode="closest"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def show_workload_heatmap(portfolio_df, holidays_by_product, members, weekly_capacity=5, calendars=None):
+    """담당자 워크로드 히트맵 - 전체 제품 기준 담당자별 ISO 주차 근무일 부하"""
+    st.subheader("🔥 담당자별 주간 워크로드")
+    
+    if portfolio_df.empty:
+        st.info("표시할 제품 일정이 없습니다. 먼저 제품을 추가해주세요.")
+        return
+    
+    workload = weekly_workload(portfolio_df, holidays_by_product, members, calendars)
+    if workload.empty or workload.shape[1] == 0:
+        st.info("담당자에게 배정된 일정이 없습니다.")
+        return
+    
+    # 과부하 요약 (주당 근무일 수를 넘는 셀)
+    overloaded = workload[workload > weekly_capacity].stack()
+    if overloaded.empty:
+        st.success(f"✅ 주당 {weekly_capacity}일을 넘는 담당자가 없습니다.")
+    else:
+        worst = overloaded.sort_values(ascending=False).head(5)
+        details = ", ".join(f"{member} {week} ({load}일)" for (member, week), load in worst.items())
+        st.warning(f"⚠️ 과부하 {len(overloaded)}건 (주당 {weekly_capacity}일 초과) - {details}")
+    
+    fig = px.imshow(
+        workload,
+        color_continuous_scale="YlOrRd",
+        zmin=0,
+        zmax=max(weekly_capacity * 2, int(workload.values.max())),
+        aspect="auto",
+        text_auto=workload.size <= 600,
+        labels=dict(x="ISO 주차", y="담당자", color="근무일")
+    )
+    fig.update_layout(
+        height=int(min(max(len(workload) * 36 + 160, 320), 1200)),
+        margin=dict(l=50, r=50, t=40, b=50)
+    )
+    fig.update_xaxes(side="top")
     st.plotly_chart(fig, use_container_width=True)
 
 def show_progress_cards(df):
@@ -543,6 +528,29 @@ def show_progress_cards(df):
             </div>
             """, unsafe_allow_html=True)
 
+def calendar_page_navigator(pages, key):
+    """3개월 단위 캘린더 이동 (◀ 이전 / 다음 ▶) - 현재 페이지 번호 반환 (처음에는 오늘이 속한 페이지)"""
+    if not 0 <= st.session_state.get(key, -1) < len(pages):
+        st.session_state[key] = default_calendar_page(pages, date.today())
+    
+    def move(step):
+        st.session_state[key] = min(max(st.session_state[key] + step, 0), len(pages) - 1)
+    
+    page = st.session_state[key]
+    col_prev, col_label, col_next = st.columns([1, 4, 1])
+    with col_prev:
+        st.button("◀ 이전", key=f"{key}_prev", on_click=move, args=(-1,), disabled=page == 0)
+    with col_label:
+        first, last = pages[page][0], pages[page][-1]
+        st.markdown(
+            f"<div style='text-align: center; font-weight: bold; padding-top: 6px;'>"
+            f"{first.strftime('%Y년 %m월')} ~ {last.strftime('%Y년 %m월')} ({page + 1}/{len(pages)})</div>",
+            unsafe_allow_html=True,
+        )
+    with col_next:
+        st.button("다음 ▶", key=f"{key}_next", on_click=move, args=(1,), disabled=page == len(pages) - 1)
+    return page
+
 def show_calendar_grid(df, excluded_days=None):
     """캘린더 그리드 뷰 - 월별 캘린더 안에 주별 단계 표시"""
     st.subheader("📅 월별 캘린더 뷰")
@@ -553,18 +561,10 @@ def show_calendar_grid(df, excluded_days=None):
     
     # 색상별 단계 설명을 상단에 한 번만 표시
     st.markdown("### 🎨 단계별 색상 설명")
-    phase_colors = {
-        "사전 시장조사": "#E3F2FD",
-        "부자재 사양확정 및 샘플링": "#F3E5F5",
-        "CT 및 사전 품질 확보": "#E8F5E8",
-        "부자재 발주~입고": "#FFF3E0",
-        "완제품 발주~생산": "#FCE4EC",
-        "품질 초도 검사~입고": "#E0F2F1"
-    }
     
     # 색상 설명을 2열로 배치
     legend_cols = st.columns(2)
-    for i, (phase, color) in enumerate(phase_colors.items()):
+    for i, (phase, color) in enumerate(PHASE_COLORS.items()):
         with legend_cols[i % 2]:
             st.markdown(f"""
             <div style="display: flex; align-items: center; margin: 8px 0;">
@@ -575,27 +575,19 @@ def show_calendar_grid(df, excluded_days=None):
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # 모든 날짜 범위 계산
-    all_dates = []
-    for _, row in df.iterrows():
-        start = pd.to_datetime(row["시작일"])
-        end = pd.to_datetime(row["종료일"])
-        date_range = pd.date_range(start, end, freq='D')
-        all_dates.extend([(d, row["단계"], row["담당자"], row["Asana Task 코드"]) for d in date_range])
+    # 일정이 걸친 월 목록 (날짜를 펼치지 않음) - 화면에는 3개월씩만 그림
+    intervals = phase_intervals(df)
+    months = calendar_months(df, intervals)
     
-    if all_dates:
-        # 월별로 그룹화
-        df_dates = pd.DataFrame(all_dates, columns=['날짜', '단계', '담당자', 'Asana Task 코드'])
-        df_dates['월'] = df_dates['날짜'].dt.to_period('M')
-        
-        # 연도별로 그룹화하여 표시
-        df_dates['연도'] = df_dates['날짜'].dt.year
-        years = sorted(df_dates['연도'].unique())
-        
-        # 캘린더 HTML 생성
-        calendar_html = generate_calendar_html(df_dates, years, phase_colors, excluded_days)
-        
-        # 캘린더 표시
+    if months:
+        pages = calendar_pages(months)
+        page = calendar_page_navigator(pages, "calendar_grid_page")
+        
+        # 보이는 3개월만 월별 HTML 조각 저장소에서 가져와 표시 (일정 길이와 무관하게 일정한 비용)
+        with profiler.section("캘린더 렌더링"):
+            calendar_html = render_calendar_page(
+                df, pages[page], PHASE_COLORS, excluded_days, get_month_html_cache(), intervals
+            )
         st.markdown(calendar_html, unsafe_allow_html=True)
         
         # 이미지 저장 기능
@@ -619,8 +611,10 @@ def show_calendar_grid(df, excluded_days=None):
                 if st.button("🖼️ 캘린더 이미지 생성", key="generate_calendar_image_btn"):
                     with st.spinner("이미지를 생성하고 있습니다..."):
                         try:
-                            # 이미지 생성
-                            image_data = generate_calendar_image(calendar_html)
+                            # 이미지 생성 (전체 기간)
+                            image_data = generate_calendar_image(
+                                render_full_calendar(df, PHASE_COLORS, excluded_days, get_month_html_cache())
+                            )
                             if image_data:
                                 st.session_state.calendar_image = image_data
                                 st.success("✅ 캘린더 이미지가 생성되었습니다!")
@@ -649,198 +643,113 @@ def show_calendar_grid(df, excluded_days=None):
         st.markdown("### 📄 HTML 다운로드 (대안)")
         st.info("이미지 생성이 실패하는 경우 HTML 파일을 다운로드하여 브라우저에서 열어보세요.")
         
-        # 색깔별 설명 HTML 생성
-        phase_colors = {
-            "사전 시장조사": "#E3F2FD",
-            "부자재 사양확정 및 샘플링": "#F3E5F5",
-            "CT 및 사전 품질 확보": "#E8F5E8",
-            "부자재 발주~입고": "#FFF3E0",
-            "완제품 발주~생산": "#FCE4EC",
-            "품질 초도 검사~입고": "#E0F2F1"
-        }
+        # 전체 기간 HTML은 요청했을 때만 만들고 세션에 보관 (재실행마다 전체 캘린더를 그리지 않고, 다운로드 버튼도 유지)
+        download_key = (int(pd.util.hash_pandas_object(df, index=False).sum()), ExcludeSet(excluded_days).to_token())
+        if st.button("📄 전체 캘린더 HTML 만들기", key="build_calendar_html_btn"):
+            calendar_html = render_full_calendar(df, PHASE_COLORS, excluded_days, get_month_html_cache())
+            
+            # 색깔별 설명 HTML 생성
+            legend_html = """
+            <div style="margin-bottom: 10px; padding: 10px; background: #f8f9fa; border-radius: 8px; border: 1px solid #e9ecef;">
+                <h3 style="margin: 0 0 15px 0; color: #333; font-size: 14px;">🎨 단계별 색상 설명</h3>
+                <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 5px;">
+            """
         
-        legend_html = """
-        <div style="margin-bottom: 10px; padding: 10px; background: #f8f9fa; border-radius: 8px; border: 1px solid #e9ecef;">
-            <h3 style="margin: 0 0 15px 0; color: #333; font-size: 14px;">🎨 단계별 색상 설명</h3>
-            <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 5px;">
-        """
+            for phase, color in PHASE_COLORS.items():
+                legend_html += f"""
+                    <div style="display: flex; align-items: center; padding: 4px; background: white; border-radius: 4px; border: 1px solid #ddd;">
+                        <div style="width: 10px; height: 10px; background: {color}; border: 1px solid #ccc; border-radius: 3px; margin-right: 10px;"></div>
+                        <span style="font-size: 5px; font-weight: 500; color: #333;">{phase}</span>
+                    </div>
+                """
         
-        for phase, color in phase_colors.items():
-            legend_html += f"""
-                <div style="display: flex; align-items: center; padding: 4px; background: white; border-radius: 4px; border: 1px solid #ddd;">
-                    <div style="width: 10px; height: 10px; background: {color}; border: 1px solid #ccc; border-radius: 3px; margin-right: 10px;"></div>
-                    <span style="font-size: 5px; font-weight: 500; color: #333;">{phase}</span>
+            legend_html += """
                 </div>
-            """
-        
-        legend_html += """
             </div>
-        </div>
-        """
+            """
         
-        # HTML 파일 생성
-        html_filename = f"캘린더_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        html_content_full = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>개발 일정 캘린더</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 0; 
-                    padding: 15px 100px 15px 15px;
-                    background: white;
-                    width: 1200px;
-                    overflow: hidden;
-                }}
-                .calendar-container {{
-                    background: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                    overflow: hidden;
-                    margin-left: 0;
-                }}
-                /* 스크롤바 숨기기 */
-                ::-webkit-scrollbar {{
-                    display: none;
-                }}
-                html {{
-                    scrollbar-width: none;
-                }}
-                body {{
-                    -ms-overflow-style: none;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="calendar-container">
-                {legend_html}
-                {calendar_html}
-            </div>
-        </body>
-        </html>
-        """
+            # HTML 파일 생성
+            html_content_full = f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="utf-8">
+                <title>개발 일정 캘린더</title>
+                <style>
+                    body {{ 
+                        font-family: Arial, sans-serif; 
+                        margin: 0; 
+                        padding: 15px 100px 15px 15px;
+                        background: white;
+                        width: 1200px;
+                        overflow: hidden;
+                    }}
+                    .calendar-container {{
+                        background: white;
+                        padding: 20px;
+                        border-radius: 10px;
+                        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+                        overflow: hidden;
+                        margin-left: 0;
+                    }}
+                    /* 스크롤바 숨기기 */
+                    ::-webkit-scrollbar {{
+                        display: none;
+                    }}
+                    html {{
+                        scrollbar-width: none;
+                    }}
+                    body {{
+                        -ms-overflow-style: none;
+                    }}
+                </style>
+            </head>
+            <body>
+                <div class="calendar-container">
+                    {legend_html}
+                    {calendar_html}
+                </div>
+            </body>
+            </html>
+            """
+            
+            st.session_state.calendar_html_download = {
+                "key": download_key,
+                "data": html_content_full.encode('utf-8'),
+                "file_name": f"캘린더_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
+            }
         
-        st.download_button(
-            "📥 HTML 다운로드",
-            data=html_content_full.encode('utf-8'),
-            file_name=html_filename,
-            mime="text/html",
-            key="download_calendar_html_btn"
-        )
+        html_download = st.session_state.get("calendar_html_download")
+        if html_download and html_download["key"] == download_key:
+            st.download_button(
+                "📥 HTML 다운로드",
+                data=html_download["data"],
+                file_name=html_download["file_name"],
+                mime="text/html",
+                key="download_calendar_html_btn"
+            )
     else:
         st.info("표시할 일정이 없습니다.")
 
-def generate_calendar_html(df_dates, years, phase_colors, excluded_days):
-    """캘린더 HTML 생성 - 연도 구분 없이 연속 표시"""
-    html_parts = []
-    
-    # 모든 월을 연도 구분 없이 하나의 리스트로 합치기
-    all_months = []
-    for year in years:
-        year_data = df_dates[df_dates['연도'] == year]
-        months = sorted(year_data['월'].unique())
-        all_months.extend(months)
-    
-    # 월별로 가로 배치 (최대 3개월씩)
-    for i in range(0, len(all_months), 3):
-        month_group = all_months[i:i+3]
-        
-        html_parts.append('<div style="display: flex; gap: 20px; margin-bottom: 30px;">')
-        
-        for j in range(3):  # 항상 3개 컬럼 사용
-            if j < len(month_group):
-                month = month_group[j]
-                # 해당 월의 데이터 찾기
-                month_data = df_dates[df_dates['월'] == month]
-                
-                html_parts.append(f'''
-                <div style="border: 2px solid #e0e0e0; border-radius: 8px; padding: 15px; background: #fafafa; flex: 1; min-width: 200px;">
-                    <h4 style="margin: 0 0 15px 0; text-align: center; color: #333;">{month.strftime('%Y년 %m월')}</h4>
-                ''')
-                
-                # 요일 헤더
-                weekdays = ['월', '화', '수', '목', '금', '토', '일']
-                header_html = '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 10px;">'
-                for day in weekdays:
-                    header_html += f'<div style="text-align: center; font-weight: bold; font-size: 12px; padding: 5px;">{day}</div>'
-                header_html += '</div>'
-                html_parts.append(header_html)
-                
-                # 월의 첫 주 시작일과 마지막 주 종료일 계산
-                month_start = month_data['날짜'].min()
-                month_end = month_data['날짜'].max()
-                first_week_start = month_start - timedelta(days=month_start.weekday())
-                last_week_end = month_end + timedelta(days=6-month_end.weekday())
-                
-                # 주별로 캘린더 표시
-                current_date = first_week_start
-                while current_date <= last_week_end:
-                    week_html = '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 5px;">'
-                    
-                    for k in range(7):  # 한 주의 7일
-                        check_date = current_date + timedelta(days=k)
-                        
-                        # 해당 날짜의 단계 정보 확인
-                        date_data = month_data[month_data['날짜'] == check_date]
-                        
-                        # 날짜 스타일 결정
-                        date_style = "text-align: center; padding: 8px; font-size: 12px; border-radius: 4px;"
-                        
-                        if check_date.weekday() >= 5 or check_date.date() in excluded_days:
-                            # 주말 또는 제외일
-                            date_style += "color: #ff4444; background: #f8f8f8;"
-                            date_text = f'<div style="{date_style}">{check_date.day}</div>'
-                        elif not date_data.empty:
-                            # 단계가 있는 날짜
-                            phase = date_data.iloc[0]['단계']
-                            color = phase_colors.get(phase, "#E0E0E0")
-                            date_style += f"background: {color}; border: 1px solid #ddd;"
-                            date_text = f'<div style="{date_style}">{check_date.day}</div>'
-                        else:
-                            # 일반 날짜
-                            date_style += "background: white; border: 1px solid #eee;"
-                            date_text = f'<div style="{date_style}">{check_date.day}</div>'
-                        
-                        week_html += date_text
-                    
-                    week_html += '</div>'
-                    html_parts.append(week_html)
-                    
-                    current_date += timedelta(days=7)
-                
-                html_parts.append('</div>')
-            else:
-                # 빈 컬럼
-                html_parts.append('<div style="flex: 1;"></div>')
-        
-        html_parts.append('</div>')
-    
-    return ''.join(html_parts)
-
 def generate_calendar_image(html_content):
     """HTML을 이미지로 변환 (색깔별 설명 포함)"""
+    temp_file = None
     try:
-        # 색깔별 설명 텍스트 생성
-        phase_colors = {
-            "사전 시장조사": "#E3F2FD",
-            "부자재 사양확정 및 샘플링": "#F3E5F5",
-            "CT 및 사전 품질 확보": "#E8F5E8",
-            "부자재 발주~입고": "#FFF3E0",
-            "완제품 발주~생산": "#FCE4EC",
-            "품질 초도 검사~입고": "#E0F2F1"
-        }
+        # Selenium은 이미지 생성 시에만 필요하므로 여기서 불러옴 (앱 시작 시간 단축)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         
+        # 색깔별 설명 텍스트 생성
         legend_html = """
         <div style="margin-bottom: 12px; padding: 8px; background: #f8f9fa; border-radius: 6px; border: 1px solid #e9ecef;">
             <h3 style="margin: 0 0 6px 0; color: #333; font-size: 12px;">🎨 단계별 색상 설명</h3>
             <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 4px;">
         """
         
-        for phase, color in phase_colors.items():
+        for phase, color in PHASE_COLORS.items():
             legend_html += f"""
                 <div style="display: flex; align-items: center; padding: 3px; background: white; border-radius: 3px; border: 1px solid #ddd;">
                     <div style="width: 12px; height: 12px; background: {color}; border: 1px solid #ccc; border-radius: 2px; margin-right: 4px;"></div>
@@ -1133,106 +1042,222 @@ def generate_calendar_image(html_content):
         st.error(f"이미지 생성 중 오류: {e}")
         # 임시 파일 정리
         try:
-            if os.path.exists(temp_file):
+            if temp_file and os.path.exists(temp_file):
                 os.remove(temp_file)
         except:
             pass
         return None
 
+# 칸반 상태별 색상 (배경, 테두리)
+KANBAN_COLORS = {
+    "준비중": ("#FFE6B3", "#FFA500"),  # 연한 주황
+    "진행중": ("#E6F3FF", "#0066CC"),  # 연한 파랑
+    "완료": ("#E6FFE6", "#00CC00"),  # 연한 초록
+}
+
+def kanban_cards_html(cards, status, show_product=False):
+    """상태 컬럼 하나의 카드들을 하나의 HTML 블록으로 생성"""
+    status_color, border_color = KANBAN_COLORS[status]
+    parts = []
+    for card in cards:
+        duration = (card["종료일"] - card["시작일"]).days + 1
+        
+        # 단계명 길이에 따른 폰트 크기 자동 조정
+        phase_length = len(card['단계'])
+        if phase_length <= 10:
+            title_font_size = "16px"
+            content_font_size = "12px"
+        elif phase_length <= 15:
+            title_font_size = "14px"
+            content_font_size = "11px"
+        else:
+            title_font_size = "12px"
+            content_font_size = "10px"
+        
+        product_line = f'<small style="font-size: {content_font_size};">📦 {card["제품"]}</small><br>' if show_product else ""
+        parts.append(f"""
+        <div style="border: 2px solid {border_color}; border-radius: 8px; padding: 10px; margin: 5px 0; background: {status_color}; min-height: 120px; display: flex; flex-direction: column; justify-content: space-between;">
+            <strong style="font-size: {title_font_size}; line-height: 1.2; word-wrap: break-word;">{card['단계']}</strong>
+            <div>
+                {product_line}<small style="font-size: {content_font_size};">📅 {card['시작일'].strftime('%Y/%m/%d')} ~ {card['종료일'].strftime('%Y/%m/%d')}</small><br>
+                <small style="font-size: {content_font_size};">⏱️ {duration}일</small><br>
+                <small style="font-size: {content_font_size};">👤 {card['담당자'] if card['담당자'] else '미정'}</small>
+            </div>
+        </div>
+        """)
+    return "".join(parts)
+
 def show_kanban_board(df):
     """칸반 보드 뷰 - 진행 상태별로 단계를 분류"""
+    df_kanban = df.copy()
+    df_kanban["시작일"] = pd.to_datetime(df_kanban["시작일"])
+    df_kanban["종료일"] = pd.to_datetime(df_kanban["종료일"])
+    
     # 연도 정보 계산
-    df_temp = df.copy()
-    df_temp["시작일"] = pd.to_datetime(df_temp["시작일"])
-    df_temp["종료일"] = pd.to_datetime(df_temp["종료일"])
-    start_year = df_temp["시작일"].min().year
-    end_year = df_temp["종료일"].max().year
+    start_year = df_kanban["시작일"].min().year
+    end_year = df_kanban["종료일"].max().year
     year_range = f"{start_year}년" if start_year == end_year else f"{start_year}년~{end_year}년"
     
     st.subheader(f"📊 칸반 보드 ({year_range})")
     
     # 오늘 날짜 기준으로 진행 상태 자동 판단
-    today = datetime.today().date()
-    
-    def determine_status(row):
-        start_date = pd.to_datetime(row["시작일"]).date()
-        end_date = pd.to_datetime(row["종료일"]).date()
-        
-        if start_date <= today <= end_date:
-            return "진행중"
-        elif start_date > today and end_date > today:
-            return "준비중"
-        elif start_date < today and end_date < today:
-            return "완료"
-        else:
-            return "진행중"  # 기본값
-    
-    df_kanban = df.copy()
-    df_kanban["상태"] = df_kanban.apply(determine_status, axis=1)
+    df_kanban["상태"] = classify_status(df_kanban, datetime.today().date())
     
     # 상태별 컬럼 생성
-    statuses = ["준비중", "진행중", "완료"]
-    cols = st.columns(len(statuses))
+    cols = st.columns(len(KANBAN_STATUSES))
     
-    for i, status in enumerate(statuses):
+    for i, status in enumerate(KANBAN_STATUSES):
         with cols[i]:
-            # 상태별 색상 설정
-            if status == "준비중":
-                status_color = "#FFE6B3"  # 연한 주황
-                border_color = "#FFA500"
-            elif status == "진행중":
-                status_color = "#E6F3FF"  # 연한 파랑
-                border_color = "#0066CC"
-            else:  # 완료
-                status_color = "#E6FFE6"  # 연한 초록
-                border_color = "#00CC00"
-            
             st.markdown(f"### {status}")
             status_data = df_kanban[df_kanban["상태"] == status]
             
             if status_data.empty:
                 st.info(f"📝 {status} 상태의 작업이 없습니다.")
             else:
-                for _, row in status_data.iterrows():
-                    start_date = pd.to_datetime(row["시작일"])
-                    end_date = pd.to_datetime(row["종료일"])
-                    duration = (end_date - start_date).days + 1
-                    
-                    # 단계명 길이에 따른 폰트 크기 자동 조정
-                    phase_length = len(row['단계'])
-                    if phase_length <= 10:
-                        title_font_size = "16px"
-                        content_font_size = "12px"
-                    elif phase_length <= 15:
-                        title_font_size = "14px"
-                        content_font_size = "11px"
-                    else:
-                        title_font_size = "12px"
-                        content_font_size = "10px"
-                    
-                    st.markdown(f"""
-                    <div style="border: 2px solid {border_color}; border-radius: 8px; padding: 10px; margin: 5px 0; background: {status_color}; height: 120px; display: flex; flex-direction: column; justify-content: space-between;">
-                        <strong style="font-size: {title_font_size}; line-height: 1.2; word-wrap: break-word;">{row['단계']}</strong>
-                        <div>
-                            <small style="font-size: {content_font_size};">📅 {start_date.strftime('%Y/%m/%d')} ~ {end_date.strftime('%Y/%m/%d')}</small><br>
-                            <small style="font-size: {content_font_size};">⏱️ {duration}일</small><br>
-                            <small style="font-size: {content_font_size};">👤 {row['담당자'] if row['담당자'] else '미정'}</small>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown(kanban_cards_html(status_data.to_dict("records"), status), unsafe_allow_html=True)
+
+def show_portfolio_kanban(portfolio_df):
+    """포트폴리오 칸반 보드 - 전체 제품 단계를 담당자/제품 필터와 페이지 단위로 표시"""
+    st.subheader("🗃️ 포트폴리오 칸반 보드")
+    
+    if portfolio_df.empty:
+        st.info("표시할 제품 일정이 없습니다. 먼저 제품을 추가해주세요.")
+        return
+    
+    # 필터
+    col_member, col_product, col_page_size = st.columns([2, 2, 1])
+    with col_member:
+        member_filter = st.multiselect(
+            "담당자 필터",
+            options=sorted(portfolio_df["담당자"].fillna("").replace("", "미정").unique()),
+            key="kanban_member_filter"
+        )
+    with col_product:
+        product_filter = st.multiselect(
+            "제품 필터",
+            options=list(portfolio_df["제품"].unique()),
+            key="kanban_product_filter"
+        )
+    with col_page_size:
+        page_size = st.selectbox("페이지당 카드", [20, 50, 100], key="kanban_page_size")
+    
+    df_kanban = portfolio_df
+    if member_filter:
+        df_kanban = df_kanban[df_kanban["담당자"].fillna("").replace("", "미정").isin(member_filter)]
+    if product_filter:
+        df_kanban = df_kanban[df_kanban["제품"].isin(product_filter)]
+    
+    # 오늘 날짜 기준 진행 상태 (벡터 연산 1회)
+    statuses = classify_status(df_kanban, datetime.today().date())
+    
+    cols = st.columns(len(KANBAN_STATUSES))
+    for i, status in enumerate(KANBAN_STATUSES):
+        with cols[i]:
+            status_data = df_kanban[statuses == status]
+            total = len(status_data)
+            st.markdown(f"### {status} ({total:,})")
+            
+            if status_data.empty:
+                st.info(f"📝 {status} 상태의 작업이 없습니다.")
+                continue
+            
+            # 컬럼별 페이지 (필터가 바뀌어 범위를 벗어나면 마지막 페이지로)
+            page_count = -(-total // page_size)
+            page_key = f"kanban_page_{status}"
+            page = min(st.session_state.get(page_key, 0), page_count - 1)
+            
+            if page_count > 1:
+                col_prev, col_info, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if st.button("◀", key=f"kanban_prev_{status}", disabled=page == 0):
+                        page -= 1
+                with col_next:
+                    if st.button("▶", key=f"kanban_next_{status}", disabled=page >= page_count - 1):
+                        page += 1
+                with col_info:
+                    st.caption(f"{page + 1} / {page_count} 페이지")
+            st.session_state[page_key] = page
+            
+            page_data = status_data.iloc[page * page_size:(page + 1) * page_size]
+            st.markdown(kanban_cards_html(page_data.to_dict("records"), status, show_product=True), unsafe_allow_html=True)
+
+def show_portfolio_calendar(portfolio_df):
+    """포트폴리오 캘린더 뷰 - 전체 제품 단계를 겹쳐 일별 진행 단계 수와 담당자 중복 배정 표시"""
+    st.subheader("🗓️ 포트폴리오 캘린더")
+
+    if portfolio_df.empty:
+        st.info("표시할 제품 일정이 없습니다. 먼저 제품을 추가해주세요.")
+        return
+
+    # 시작일 순 구간 색인 1회 → 보이는 3개월만 이진 탐색 + 차분 배열로 집계
+    with profiler.section("겹침 캘린더 색인"):
+        index = PhaseIntervalIndex(portfolio_df)
+    months = overlay_months(index)
+    if not months:
+        st.info("표시할 제품 일정이 없습니다.")
+        return
+
+    st.caption("칸의 숫자는 그날 진행 중인 단계 수 (주말 제외), 빨간 테두리(⚠️)는 한 담당자가 여러 단계에 배정된 날입니다. 칸에 마우스를 올리면 내역이 보입니다.")
+    pages = calendar_pages(months)
+    page = calendar_page_navigator(pages, "overlay_calendar_page")
+
+    with profiler.section("캘린더 렌더링"):
+        calendar_html, window = render_overlay_page(index, pages[page])
+    st.markdown(calendar_html, unsafe_allow_html=True)
+
+    conflicts = index.conflicts(window)
+    if conflicts.empty:
+        st.success("✅ 이 기간에 중복 배정된 담당자가 없습니다.")
+    else:
+        st.warning(f"⚠️ 담당자 중복 배정 {len(conflicts)}건 ({conflicts['담당자'].nunique()}명)")
+        st.dataframe(conflicts, use_container_width=True, hide_index=True)
 
 # ✅ 세션 초기화
+profiler.mark("세션 초기화")
 if "products" not in st.session_state:
     st.session_state.products = {}
+# 이전 형식(dict)의 제품은 불변 상태로 변환 (이미 변환된 제품은 그대로)
+for _name, _product in st.session_state.products.items():
+    if not isinstance(_product, ProductState):
+        st.session_state.products[_name] = ProductState.from_product(_product)
 if "current_product" not in st.session_state:
     st.session_state.current_product = "새 제품"
+if "sync_tracker" not in st.session_state:
+    st.session_state.sync_tracker = SyncTracker()
+
+# 단계별 근무 캘린더 (정의 오류가 있으면 모든 단계를 제품 기본 캘린더로 계산)
+try:
+    working_calendars = load_working_calendars(working_calendars_signature())
+except (OSError, ValueError) as e:
+    st.error(f"근무 캘린더 정의를 읽을 수 없습니다 ({WORKING_CALENDARS_PATH}): {e}")
+    working_calendars = CalendarRegistry()
+
+if "drift_detector" not in st.session_state:
+    st.session_state.drift_detector = DriftDetector(working_calendars)
+st.session_state.drift_detector.set_calendars(working_calendars)
+
+# 공유 저장소와 동기화 (첫 실행: 다른 세션의 제품을 메모리에서 가져옴, 이후: 다른 세션의 변경만 반영)
+if "shared_sync" not in st.session_state:
+    st.session_state.shared_sync = SessionSync(get_shared_store(), uuid.uuid4().hex[:8])
+    st.session_state.shared_sync.attach(st.session_state.products)
+    shared_applied, shared_conflicted = [], []
+else:
+    # 편집 중인 제품은 이번 실행의 편집을 확인한 뒤(자동 저장 단계) 반영
+    shared_applied, shared_conflicted = st.session_state.shared_sync.pull(
+        st.session_state.products, hold=(st.session_state.current_product,)
+    )
+    if st.session_state.pop("shared_refreshed", None):
+        shared_applied.append({"product": st.session_state.current_product})
+if st.session_state.current_product not in st.session_state.products and st.session_state.current_product != "새 제품":
+    # 다른 세션에서 삭제된 제품을 보고 있던 경우
+    st.session_state.current_product = "새 제품"
 if "phases" not in st.session_state:
     st.session_state.phases = pd.DataFrame(DEFAULT_PHASES).copy()
     # Asana Task 코드 컬럼이 없으면 추가
     if "Asana Task 코드" not in st.session_state.phases.columns:
         st.session_state.phases["Asana Task 코드"] = ""
 if "custom_excludes" not in st.session_state:
-    st.session_state.custom_excludes = set()
+    st.session_state.custom_excludes = ExcludeSet()
 
 if "team_members" not in st.session_state:
     st.session_state.team_members = []
@@ -1262,17 +1287,24 @@ if "phases" in st.session_state and not st.session_state.phases.empty:
         "품질 입고 검사": "품질 초도 검사~입고"
     }
     
-    # 단계명 업데이트
-    st.session_state.phases["단계"] = st.session_state.phases["단계"].replace(old_to_new)
+    # 단계명 업데이트 (제품 상태와 공유하는 DataFrame이므로 바뀐 경우에만 새로 만듦)
+    renamed_phases = st.session_state.phases["단계"].replace(old_to_new)
+    if not renamed_phases.equals(st.session_state.phases["단계"]):
+        st.session_state.phases = st.session_state.phases.assign(단계=renamed_phases)
     
     # 비고 컬럼을 Asana Task 코드로 변경
     if "비고" in st.session_state.phases.columns:
         st.session_state.phases = st.session_state.phases.rename(columns={"비고": "Asana Task 코드"})
     elif "Asana Task 코드" not in st.session_state.phases.columns:
         # Asana Task 코드 컬럼이 없으면 빈 컬럼 추가
-        st.session_state.phases["Asana Task 코드"] = ""
+        st.session_state.phases = st.session_state.phases.assign(**{"Asana Task 코드": ""})
+    
+    # 근무 캘린더 컬럼이 없는 이전 데이터는 빈 칸 (제품 기본 캘린더)
+    if "캘린더" not in st.session_state.phases.columns:
+        st.session_state.phases = st.session_state.phases.assign(캘린더="")
 
 # ✅ 제목과 총 리드타임 표시
+profiler.mark("제품 관리")
 total_lead_time = calculate_total_lead_time()
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -1284,18 +1316,26 @@ st.markdown("---")
 
 # ✅ 제품 관리
 st.subheader("📦 제품 관리")
+product_repository = get_product_repository()
+product_repository.refresh_if_changed()  # CLI/API/다른 프로세스가 쓴 파일 반영 (디렉터리·인덱스 mtime이 바뀐 경우만)
+
+# 다른 세션에서 바뀐 제품 알림
+if shared_applied:
+    changed_names = list(dict.fromkeys(change["product"] for change in shared_applied))
+    st.info(f"🔄 다른 사용자의 변경을 반영했습니다: {', '.join(changed_names[:5])}{' 외' if len(changed_names) > 5 else ''}")
 
 def add_product():
     """제품 추가 함수"""
     if st.session_state.new_product_input and st.session_state.new_product_input.strip():
         product_name = st.session_state.new_product_input.strip()
-        if product_name not in st.session_state.products:
-            st.session_state.products[product_name] = {
-                "phases": pd.DataFrame(DEFAULT_PHASES),
-                "custom_excludes": set(),
+        if product_name not in st.session_state.products and product_name not in product_repository:
+            st.session_state.products[product_name] = ProductState.from_product({
+                "phases": DEFAULT_PHASES,
+                "custom_excludes": ExcludeSet(),
                 "target_date": datetime.today().date(),
-                "team_members": st.session_state.team_members.copy() if st.session_state.team_members else []
-            }
+                "team_members": st.session_state.team_members
+            })
+            st.session_state.shared_sync.push(product_name, st.session_state.products[product_name])
             st.session_state.current_product = product_name
             st.session_state.product_added = True
             st.success(f"✅ '{product_name}' 제품이 추가되었습니다.")
@@ -1325,8 +1365,8 @@ with col1:
             add_product()
 
 with col2:
-    # 제품 추가/삭제 버튼을 나란히 배치
-    col_add, col_del = st.columns(2)
+    # 제품 추가/삭제/로컬 저장 버튼을 나란히 배치
+    col_add, col_del, col_local = st.columns(3)
     
     with col_add:
         if st.button("➕ 제품 추가", key="add_product_btn"):
@@ -1336,18 +1376,68 @@ with col2:
         if st.button("🗑️ 삭제", key="delete_product_btn"):
             if st.session_state.current_product in st.session_state.products:
                 del st.session_state.products[st.session_state.current_product]
+                st.session_state.sync_tracker.forget(st.session_state.current_product)
+                st.session_state.shared_sync.remove(st.session_state.current_product)
+                st.session_state.drift_detector.forget(st.session_state.current_product)
                 st.session_state.current_product = "새 제품"
                 st.success("✅ 제품이 삭제되었습니다.")
                 st.rerun()
 
-# 제품 선택 드롭다운
-product_options = ["새 제품"] + list(st.session_state.products.keys())
-selected_product = st.selectbox("📋 제품 선택", product_options, index=product_options.index(st.session_state.current_product))
+    with col_local:
+        if st.button("💾 로컬 저장", key="local_save_btn", help="현재 제품을 로컬 *_product_data.json 파일로 저장"):
+            if st.session_state.current_product in st.session_state.products:
+                product_state = st.session_state.products[st.session_state.current_product]
+                saved_file = product_repository.save(st.session_state.current_product, product_state)
+                st.session_state.sync_tracker.mark_synced(SYNC_LOCAL, st.session_state.current_product, product_state)
+                st.success(f"✅ {saved_file} 파일로 저장되었습니다.")
+            else:
+                st.warning("저장할 제품을 먼저 선택해주세요.")
+
+# 제품 선택 드롭다운 (로컬 저장소 제품은 선택할 때 본문을 불러옴)
+stored_products = [name for name in product_repository.names() if name not in st.session_state.products]
+product_options = ["새 제품"] + list(st.session_state.products.keys()) + stored_products
+if st.session_state.current_product not in product_options:
+    st.session_state.current_product = "새 제품"
+selected_product = st.selectbox(
+    "📋 제품 선택",
+    product_options,
+    index=product_options.index(st.session_state.current_product),
+    format_func=lambda name: f"📁 {name}" if name in stored_products else name,
+)
 
 if selected_product != st.session_state.current_product:
+    if selected_product in stored_products:
+        with profiler.section("로컬 제품 불러오기"):
+            loaded_product = product_repository.load(selected_product)
+        if loaded_product is None:
+            st.error(f"❌ '{selected_product}' 제품 파일을 찾을 수 없습니다.")
+            st.stop()
+        st.session_state.products[selected_product] = ProductState.from_product(loaded_product)
+        st.session_state.sync_tracker.mark_synced(SYNC_LOCAL, selected_product, st.session_state.products[selected_product])
+        st.session_state.shared_sync.push(selected_product, st.session_state.products[selected_product])
+        if loaded_product["target_date"]:
+            st.session_state.target_date = loaded_product["target_date"]
     st.session_state.current_product = selected_product
     st.rerun()
 
+# 마지막 저장 이후 바뀐 제품 표시 및 일괄 로컬 저장
+local_dirty = st.session_state.sync_tracker.dirty(SYNC_LOCAL, st.session_state.products)
+col_dirty, col_batch, col_auto = st.columns([2, 1, 1])
+with col_dirty:
+    # 자동 저장 후 다시 계산해 채움 (이번 재실행의 편집까지 반영)
+    dirty_status = st.empty()
+with col_batch:
+    if local_dirty and st.button(f"💾 변경된 {len(local_dirty)}개 로컬 저장", key="local_batch_save_btn"):
+        with profiler.section("로컬 일괄 저장"):
+            for product_name in local_dirty:
+                product_state = st.session_state.products[product_name]
+                product_repository.save(product_name, product_state)
+                st.session_state.sync_tracker.mark_synced(SYNC_LOCAL, product_name, product_state)
+        st.success(f"✅ {len(local_dirty)}개 제품을 로컬 파일로 저장했습니다.")
+        st.rerun()
+with col_auto:
+    st.checkbox("변경 시 로컬 자동 저장", key="local_autosave", help="제품 내용이 바뀐 경우에만 *_product_data.json 파일을 다시 씀")
+
 # 현재 제품 정보 표시
 if st.session_state.current_product != "새 제품":
     st.info(f"📋 현재 선택된 제품: **{st.session_state.current_product}**")
@@ -1374,22 +1464,19 @@ if st.session_state.current_product != "새 제품":
         else:
             st.warning("⚠️ 아직 저장된 정보가 없습니다.")
 
-# ✅ 제품별 데이터 불러오기
+# ✅ 제품별 데이터 불러오기 (제품 상태가 바뀐 경우에만 - 복사 없이 공유)
 if st.session_state.current_product != "새 제품":
     if st.session_state.current_product in st.session_state.products:
         product_data = st.session_state.products[st.session_state.current_product]
         
-        # 단계 정보 불러오기
-        if "phases" in product_data:
-            st.session_state.phases = product_data["phases"].copy()
-        
-        # 제외일 정보 불러오기
-        if "custom_excludes" in product_data:
-            st.session_state.custom_excludes = product_data["custom_excludes"].copy()
-        
-        # 담당자 정보 불러오기
-        if "team_members" in product_data:
-            st.session_state.team_members = product_data["team_members"].copy()
+        if st.session_state.get("loaded_product_state") is not product_data:
+            # 단계/제외일은 불변 상태를 그대로 참조, 담당자 목록은 화면에서 직접 수정하므로 새 목록
+            st.session_state.phases = product_data.phases_frame()
+            st.session_state.custom_excludes = product_data.custom_excludes
+            st.session_state.team_members = list(product_data.team_members)
+            if product_data.target_date:
+                st.session_state.target_date = product_data.target_date
+            st.session_state.loaded_product_state = product_data
         
         if "target_date" in product_data:
             target_date_default = product_data["target_date"]
@@ -1405,6 +1492,7 @@ if 'target_date_default' not in locals():
     target_date_default = datetime.today().date()
 
 # ✅ 설정 관리 섹션
+profiler.mark("설정 관리")
 st.markdown("## ⚙️ 설정 관리")
 settings_expander = st.expander("설정 관리", expanded=False)
 
@@ -1451,18 +1539,16 @@ with settings_expander:
     with col2:
         st.markdown("### 📅 제외일 설정")
         
-        # 기본 제외일 파일 자동 불러오기
+        # 기본 제외일 자동 불러오기 (공휴일 JSON을 컴파일한 비트셋 저장소에서 조회)
         try:
-            with open("공휴일_2025_Second_exclude_settings.json", "r", encoding="utf-8") as f:
-                default_exclude_data = json.load(f)
-                default_exclude_dates = default_exclude_data.get("exclude_dates", [])
-                if default_exclude_dates:
-                    # ISO 형식의 날짜 문자열을 date 객체로 변환
-                    exclude_dates = {datetime.fromisoformat(date_str).date() for date_str in default_exclude_dates}
-                    st.session_state.custom_excludes.update(exclude_dates)
-                    st.success(f"✅ 기본 제외일 설정을 불러왔습니다. ({len(exclude_dates)}개)")
-                else:
-                    st.warning("기본 제외일 파일이 비어있습니다.")
+            holiday_store = load_holiday_store(holiday_source_signature())
+            exclude_dates = holiday_store.exclude_set(DEFAULT_REGION)
+            if exclude_dates:
+                if not st.session_state.custom_excludes.issuperset(exclude_dates):
+                    st.session_state.custom_excludes = st.session_state.custom_excludes | exclude_dates
+                st.success(f"✅ 기본 제외일 설정을 불러왔습니다. ({len(exclude_dates)}개)")
+            else:
+                st.warning("기본 제외일 파일이 비어있습니다.")
         except FileNotFoundError:
             st.error("❌ 기본 제외일 파일을 찾을 수 없습니다.")
         except Exception as e:
@@ -1472,7 +1558,7 @@ with settings_expander:
         exclude_date = st.date_input("제외할 날짜 선택", key="exclude_date_input")
         if st.button("➕ 제외일 추가", key="add_exclude_btn"):
             if exclude_date not in st.session_state.custom_excludes:
-                st.session_state.custom_excludes.add(exclude_date)
+                st.session_state.custom_excludes = st.session_state.custom_excludes | {exclude_date}
                 st.success(f"✅ {exclude_date.strftime('%Y-%m-%d')} 제외일로 추가되었습니다!")
                 st.rerun()
             else:
@@ -1487,7 +1573,9 @@ with settings_expander:
                     st.write(f"• {exclude_date.strftime('%Y-%m-%d')}")
                 with col_d:
                     if st.button("🗑️", key=f"delete_exclude_{exclude_date}"):
-                        st.session_state.custom_excludes.remove(exclude_date)
+                        remaining_excludes = st.session_state.custom_excludes.copy()
+                        remaining_excludes.remove(exclude_date)
+                        st.session_state.custom_excludes = remaining_excludes
                         st.success(f"✅ '{exclude_date.strftime('%Y-%m-%d')}' 제외일이 삭제되었습니다.")
                         st.rerun()
         else:
@@ -1498,13 +1586,32 @@ with settings_expander:
         
         with col_clear1:
             if st.button("🗑️ 제외일 전체 초기화", key="clear_all_excludes_btn"):
-                st.session_state.custom_excludes.clear()
+                st.session_state.custom_excludes = ExcludeSet()
                 st.success("✅ 모든 제외일이 초기화되었습니다.")
         
         with col_clear2:
             if st.button("🗑️ 담당자 전체 초기화", key="clear_all_members_btn"):
                 st.session_state.team_members.clear()
                 st.success("✅ 모든 담당자가 초기화되었습니다.")
+    
+    # 공급사/공장 근무 캘린더 (정의 파일에서 읽기 - 단계 표의 '근무 캘린더' 칸에서 선택)
+    st.markdown("### 🏭 근무 캘린더")
+    if working_calendars:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "이름": calendar.name,
+                    "근무 요일": "".join(WEEKDAY_NAMES[day] for day in calendar.workdays),
+                    "휴일 수": len(calendar.holidays),
+                }
+                for calendar in working_calendars.values()
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(f"💡 정의 파일: {WORKING_CALENDARS_PATH} (수정하면 다음 실행부터 반영)")
+    else:
+        st.info(f"등록된 근무 캘린더가 없습니다. {WORKING_CALENDARS_PATH}에 정의하면 단계별로 선택할 수 있습니다.")
 
 # ✅ 담당자 추가 함수
 def add_new_member():
@@ -1516,6 +1623,7 @@ def add_new_member():
 st.markdown("---")
 
 # ✅ 리드타임 입력
+profiler.mark("데이터 에디터")
 st.subheader("📋 단계별 리드타임 / 담당자 / Asana Task 코드 입력")
 
 # 담당자 연동 상태 표시
@@ -1530,116 +1638,281 @@ if "team_members" in st.session_state and st.session_state.team_members:
 else:
     member_options = [""]
 
-# 데이터 타입 명시적 설정
+# 데이터 타입 명시적 설정 (이미 맞으면 같은 DataFrame 유지, 제자리 수정 없음)
 if not st.session_state.phases.empty:
-    st.session_state.phases["단계"] = st.session_state.phases["단계"].astype(str)
-    st.session_state.phases["담당자"] = st.session_state.phases["담당자"].astype(str)
-    
-    # Asana Task 코드 컬럼 강제 생성
-    if "Asana Task 코드" not in st.session_state.phases.columns:
-        st.session_state.phases["Asana Task 코드"] = ""
-    st.session_state.phases["Asana Task 코드"] = st.session_state.phases["Asana Task 코드"].astype(str)
-
-# 데이터 에디터에 담당자 드롭다운 적용
-edited_df = st.data_editor(
-    st.session_state.phases,
-    num_rows="dynamic",
-    use_container_width=True,
-    key="phases_editor",
-    column_order=("단계", "리드타임", "담당자", "Asana Task 코드"),
-    column_config={
-        "단계": st.column_config.TextColumn(
-            "단계",
-            help="개발 단계명",
-            max_chars=50,
-            validate="^.+$"
-        ),
-        "리드타임": st.column_config.NumberColumn(
-            "L/T 워킹데이 기준 (일)",
-            min_value=1,
-            max_value=365,
-            help="작업 소요 일수"
-        ),
-        "담당자": st.column_config.SelectboxColumn(
-            "담당자",
-            options=member_options,
-            required=False,
-            help="설정 관리에서 등록한 담당자 중 선택하세요"
-        ),
-        "Asana Task 코드": st.column_config.TextColumn(
-            "Asana Task 코드",
-            help="Asana 작업 코드 (자동화용)",
-            max_chars=50
-        )
-    }
-)
+    st.session_state.phases = normalize_phases_frame(st.session_state.phases)
+
+# 데이터 에디터 옆에 단계별 민감도 표시 (목표일 입력 후 채움)
+col_editor, col_sensitivity = st.columns([3, 2])
+with col_sensitivity:
+    sensitivity_panel = st.empty()
+
+with col_editor:
+    # 데이터 에디터에 담당자 드롭다운 적용
+    edited_df = st.data_editor(
+        st.session_state.phases,
+        num_rows="dynamic",
+        use_container_width=True,
+        key="phases_editor",
+        column_order=("단계", "리드타임", "담당자", "Asana Task 코드", "캘린더"),
+        column_config={
+            "단계": st.column_config.TextColumn(
+                "단계",
+                help="개발 단계명",
+                max_chars=50,
+                validate="^.+$"
+            ),
+            "리드타임": st.column_config.NumberColumn(
+                "L/T 워킹데이 기준 (일)",
+                min_value=1,
+                max_value=365,
+                help="작업 소요 일수"
+            ),
+            "담당자": st.column_config.SelectboxColumn(
+                "담당자",
+                options=member_options,
+                required=False,
+                help="설정 관리에서 등록한 담당자 중 선택하세요"
+            ),
+            "Asana Task 코드": st.column_config.TextColumn(
+                "Asana Task 코드",
+                help="Asana 작업 코드 (자동화용)",
+                max_chars=50
+            ),
+            "캘린더": st.column_config.SelectboxColumn(
+                "근무 캘린더",
+                options=[""] + list(working_calendars),
+                required=False,
+                help="공급사/공장 근무 캘린더 (비우면 월~금 + 제품 제외일)"
+            )
+        }
+    )
 
 # 데이터 에디터의 변경사항을 즉시 세션 상태에 반영
 if edited_df is not None:
-    st.session_state.phases = edited_df.copy()
+    st.session_state.phases = edited_df
 
 # ✅ 목표일 입력
 st.session_state.target_date = st.date_input("✅ 목표 완료일", value=st.session_state.target_date)
 
-# ✅ 주말 제외일 자동 설정
-def get_weekends_between(start: date, end: date) -> set:
-    weekends = set()
-    current = start
-    while current <= end:
-        if current.weekday() >= 5:
-            weekends.add(current)
-        current += timedelta(days=1)
-    return weekends
+# ✅ 단계별 민감도 - 각 단계가 늦어질 때 첫 시작일이 얼마나 앞당겨지는지 (전 단계 한 번에 계산)
+if not st.session_state.phases.empty:
+    with profiler.section("민감도 계산"):
+        sensitivity_df = phase_sensitivity(
+            st.session_state.target_date,
+            st.session_state.phases.to_dict(orient="records"),
+            st.session_state.custom_excludes,
+            calendars=working_calendars,
+        )
+    with sensitivity_panel.container():
+        st.markdown("**📈 단계별 지연 민감도**")
+        st.dataframe(
+            sensitivity_df.drop(columns=["리드타임"]),
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption("💡 해당 단계가 근무일 1일/5일 늦어지면 첫 시작일을 며칠 앞당겨야 하는지 (주말·제외일 포함 달력일 기준 순위)")
 
-earliest_possible_start = st.session_state.target_date - timedelta(days=300)
-weekend_excludes = get_weekends_between(earliest_possible_start, st.session_state.target_date)
 
 # ✅ 제품별 데이터 자동 저장
+profiler.mark("자동 저장")
 if st.session_state.current_product != "새 제품":
-    st.session_state.products[st.session_state.current_product] = {
-        "phases": st.session_state.phases,
-        "custom_excludes": st.session_state.custom_excludes,
-        "target_date": st.session_state.target_date,
-        "team_members": st.session_state.team_members.copy() if st.session_state.team_members else []
-    }
-    
-    # 저장 상태 표시
-    saved_count = 0
-    saved_details = []
-    
-    if not st.session_state.phases.empty:
-        phase_count = len([phase for phase in st.session_state.phases["단계"] if phase])
-        if phase_count > 0:
-            saved_count += 1
-            saved_details.append(f"단계 {phase_count}개")
-    
-    if st.session_state.custom_excludes:
-        saved_count += 1
-        saved_details.append(f"제외일 {len(st.session_state.custom_excludes)}개")
+    # 바뀐 필드만 새로 만들고, 아무것도 바뀌지 않았으면 기존 상태 객체를 그대로 유지
+    product_state = st.session_state.products.get(st.session_state.current_product)
+    if product_state is None:
+        product_state = ProductState.from_product({})
+    updated_state = product_state.with_changes(
+        phases=st.session_state.phases,
+        custom_excludes=st.session_state.custom_excludes,
+        target_date=st.session_state.target_date,
+        team_members=st.session_state.team_members,
+    )
+    product_changed = updated_state is not product_state or st.session_state.current_product not in st.session_state.products
+    if product_changed:
+        st.session_state.products[st.session_state.current_product] = updated_state
+        # 공유 저장소에 반영 (다른 세션이 먼저 저장했으면 충돌로 표시하고 덮어쓰지 않음)
+        st.session_state.shared_sync.push(st.session_state.current_product, updated_state)
+    elif st.session_state.shared_sync.refresh(st.session_state.products, st.session_state.current_product):
+        # 내 편집이 없으면 다른 세션의 새 버전을 불러와 다시 그림
+        st.session_state.shared_refreshed = True
+        st.rerun()
+    st.session_state.phases = updated_state.phases_frame()
+    st.session_state.custom_excludes = updated_state.custom_excludes
+    st.session_state.loaded_product_state = updated_state
     
-    if st.session_state.team_members:
-        saved_count += 1
-        saved_details.append(f"담당자 {len(st.session_state.team_members)}명")
+    # Sheets에서 방금 불러온 제품은 Sheets와 같은 상태로 기록
+    if st.session_state.pop("sheets_loaded_product", None) == st.session_state.current_product:
+        st.session_state.sync_tracker.mark_synced(SYNC_SHEETS, st.session_state.current_product, updated_state)
     
-    if st.session_state.target_date:
-        saved_count += 1
-        saved_details.append(f"목표일")
+    # 로컬 자동 저장 (내용이 실제로 바뀐 경우에만 파일 쓰기)
+    if st.session_state.get("local_autosave") and st.session_state.sync_tracker.is_dirty(
+        SYNC_LOCAL, st.session_state.current_product, updated_state
+    ):
+        with profiler.section("로컬 자동 저장"):
+            product_repository.save(st.session_state.current_product, updated_state)
+        st.session_state.sync_tracker.mark_synced(SYNC_LOCAL, st.session_state.current_product, updated_state)
     
-    if saved_count > 0:
-        st.info(f"💾 **{st.session_state.current_product}** 제품 데이터가 자동 저장되었습니다. ({', '.join(saved_details)})")
+    # 저장 상태 표시 (변경이 있을 때만)
+    if product_changed:
+        saved_count = 0
+        saved_details = []
+        
+        if not st.session_state.phases.empty:
+            phase_count = len([phase for phase in st.session_state.phases["단계"] if phase])
+            if phase_count > 0:
+                saved_count += 1
+                saved_details.append(f"단계 {phase_count}개")
+        
+        if st.session_state.custom_excludes:
+            saved_count += 1
+            saved_details.append(f"제외일 {len(st.session_state.custom_excludes)}개")
+        
+        if st.session_state.team_members:
+            saved_count += 1
+            saved_details.append(f"담당자 {len(st.session_state.team_members)}명")
+        
+        if st.session_state.target_date:
+            saved_count += 1
+            saved_details.append(f"목표일")
+        
+        if saved_count > 0:
+            st.info(f"💾 **{st.session_state.current_product}** 제품 데이터가 자동 저장되었습니다. ({', '.join(saved_details)})")
+
+# 동시 편집 충돌 해결
+shared_sync = st.session_state.shared_sync
+if st.session_state.current_product in shared_sync.conflicts:
+    conflict_product = st.session_state.current_product
+    st.warning(
+        f"⚠️ **{conflict_product}** 제품을 다른 사용자가 먼저 수정했습니다 "
+        f"(공유 버전 {shared_sync.store.version(conflict_product)}). 내 변경은 아직 공유되지 않았습니다."
+    )
+    col_mine, col_theirs = st.columns(2)
+    with col_mine:
+        if st.button("내 변경으로 덮어쓰기", key="shared_keep_mine_btn"):
+            shared_sync.keep_mine(conflict_product, st.session_state.products[conflict_product])
+            st.rerun()
+    with col_theirs:
+        if st.button("공유 버전 불러오기", key="shared_take_theirs_btn"):
+            if shared_sync.take_theirs(st.session_state.products, conflict_product) is None:
+                st.session_state.current_product = "새 제품"
+            st.rerun()
+elif shared_conflicted:
+    st.warning(f"⚠️ 다른 사용자와 동시에 수정된 제품: {', '.join(shared_conflicted)} (제품을 선택해 해결)")
+
+local_dirty = st.session_state.sync_tracker.dirty(SYNC_LOCAL, st.session_state.products)
+if local_dirty:
+    dirty_status.caption(f"🟠 로컬에 저장되지 않은 변경: {len(local_dirty)}개 제품 ({', '.join(local_dirty[:5])}{' 외' if len(local_dirty) > 5 else ''})")
+elif st.session_state.products:
+    dirty_status.caption("🟢 모든 제품이 로컬 파일과 같습니다.")
 
 st.markdown("---")
 
 # ✅ 일정 계산
+profiler.mark("일정 계산")
 phases_data = st.session_state.phases.to_dict(orient="records")
-excluded = weekend_excludes | st.session_state.custom_excludes
-result_df = pd.DataFrame(backward_schedule(st.session_state.target_date, phases_data, excluded))
-
+# 주말은 backward_schedule/캘린더에서 요일로 판단하므로 사용자 제외일만 전달
+excluded = st.session_state.custom_excludes
+with profiler.section("backward_schedule"):
+    result_df = pd.DataFrame(backward_schedule(st.session_state.target_date, phases_data, excluded, working_calendars))
 
+unknown_calendars = working_calendars.unknown(phases_data)
+if unknown_calendars:
+    st.warning(f"⚠️ 등록되지 않은 근무 캘린더는 제품 기본 캘린더로 계산했습니다: {', '.join(unknown_calendars)}")
+if any(phase.get("캘린더") for phase in phases_data):
+    st.caption("💡 근무 캘린더가 지정된 단계는 해당 캘린더의 근무 요일·휴일로 역산합니다 (민감도/단축 계획/시나리오 비교 포함).")
 
 st.success("✅ 주요 단계별 시작/종료일 산출")
 st.dataframe(result_df)
 
+# ✅ 목표일 맞추기 - 첫 단계 시작일이 오늘 이전이면 최소 비용 리드타임 단축안 제시
+today = datetime.today().date()
+if not result_df.empty and result_df["시작일"].iloc[0] < today:
+    st.warning(
+        f"⚠️ 첫 단계 시작일({result_df['시작일'].iloc[0].strftime('%Y-%m-%d')})이 오늘보다 이전입니다. "
+        "아래에서 리드타임 단축안을 확인하세요."
+    )
+    with st.expander("🎯 목표일 맞추기 (리드타임 단축)", expanded=True):
+        crash_input = pd.DataFrame({
+            "단계": st.session_state.phases["단계"],
+            "리드타임": st.session_state.phases["리드타임"],
+            "최소 리드타임": [default_min_lead_time(lead) for lead in st.session_state.phases["리드타임"]],
+            "하루 단축 비용": DEFAULT_CRASH_COST,
+        })
+        crash_df = st.data_editor(
+            crash_input,
+            use_container_width=True,
+            hide_index=True,
+            disabled=("단계", "리드타임"),
+            key=f"crash_editor_{st.session_state.current_product}",
+            column_config={
+                "최소 리드타임": st.column_config.NumberColumn("최소 리드타임 (일)", min_value=0, max_value=365, step=1),
+                "하루 단축 비용": st.column_config.NumberColumn("하루 단축 비용", min_value=0.0, help="단계별 하루 단축의 상대 비용"),
+            },
+        )
+        with profiler.section("리드타임 단축 계산"):
+            plan = solve_compression(
+                st.session_state.target_date,
+                phases_data,
+                excluded,
+                earliest_start=today,
+                min_lead_times=crash_df["최소 리드타임"].fillna(0).tolist(),
+                crash_costs=crash_df["하루 단축 비용"].tolist(),
+                calendars=working_calendars,
+            )
+        
+        if not plan["feasible"]:
+            st.error(
+                f"❌ 최소 리드타임까지 줄여도 시작일이 {plan['start'].strftime('%Y-%m-%d')}입니다 "
+                f"(근무일 {plan['shortfall']}일 부족). 최소 리드타임을 낮추거나 목표일을 늦춰주세요."
+            )
+        else:
+            st.success(
+                f"✅ 총 {sum(row['단축일'] for row in plan['compressed'])}일 단축 (비용 {plan['cost']:g})으로 "
+                f"첫 시작일이 {plan['start'].strftime('%Y-%m-%d')}이 됩니다."
+            )
+            st.dataframe(pd.DataFrame(plan["compressed"]), hide_index=True)
+            if not plan["verified"]:
+                st.warning("⚠️ 단축안 검증 결과가 일치하지 않습니다. 적용 전 일정을 확인해주세요.")
+            if st.button("✅ 단축 리드타임 적용", key="apply_compression_btn"):
+                st.session_state.phases = st.session_state.phases.assign(리드타임=plan["lead_times"])
+                # 단계 편집기의 이전 편집 내용이 새 리드타임을 덮어쓰지 않도록 초기화
+                st.session_state.pop("phases_editor", None)
+                st.rerun()
+
+# ✅ 시나리오 비교 - 리드타임/추가 제외일/목표일 이동 변형을 한 번에 계산해 나란히 비교
+with st.expander("🧪 시나리오 비교", expanded=False):
+    st.caption(
+        "💡 행마다 시나리오 1개: 단계 열에 바꿀 리드타임만 입력(비우면 현재 값), "
+        "추가 제외일은 '2026-11-03, 2026-11-04'처럼 쉼표로 구분합니다."
+    )
+    phase_labels = phase_column_labels(phases_data)
+    scenario_input = pd.DataFrame(
+        [["대안 1", 0, ""] + [None] * len(phase_labels)],
+        columns=SCENARIO_COLUMNS + phase_labels,
+    ).astype({label: "Int64" for label in phase_labels})
+    scenario_df = st.data_editor(
+        scenario_input,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        # 단계 구성이 바뀌면 열이 달라지므로 편집기를 새로 만듦
+        key=f"scenario_editor_{st.session_state.current_product}_{hash(tuple(phase_labels))}",
+        column_config={
+            "목표일 이동(일)": st.column_config.NumberColumn("목표일 이동(일)", step=1, help="+면 목표일을 늦춤"),
+            **{label: st.column_config.NumberColumn(label, min_value=0, max_value=365, step=1) for label in phase_labels},
+        },
+    )
+    scenarios, invalid_dates = scenarios_from_frame(scenario_df, phases_data)
+    if invalid_dates:
+        st.warning(f"⚠️ 날짜 형식이 올바르지 않은 추가 제외일: {', '.join(invalid_dates[:10])}")
+    if scenarios and phases_data:
+        with profiler.section("시나리오 비교"):
+            scenario_summary, scenario_by_phase = compare_scenarios(
+                st.session_state.target_date, phases_data, excluded, scenarios, working_calendars
+            )
+        st.dataframe(scenario_summary, hide_index=True, use_container_width=True)
+        st.dataframe(scenario_by_phase, use_container_width=True)
+
 # ✅ 다운로드
 csv = result_df.to_csv(index=False).encode("utf-8-sig")
 if st.session_state.current_product != "새 제품":
@@ -1648,13 +1921,84 @@ else:
     filename = "개발일정표.csv"
 st.download_button("📥 엑셀 다운로드", data=csv, file_name=filename, mime="text/csv")
 
+# ✅ 전체 제품 일괄 내보내기 (제품 하나씩 스트리밍하여 ZIP 생성)
+with st.expander("📦 전체 제품 일괄 내보내기", expanded=False):
+    export_formats = available_formats()
+    export_label = st.radio("내보내기 형식", list(export_formats), horizontal=True, key="bulk_export_format")
+    if not PARQUET_AVAILABLE:
+        st.caption("💡 Parquet 형식은 'pyarrow' 패키지를 설치하면 사용할 수 있습니다.")
+    
+    if not st.session_state.products:
+        st.info("내보낼 제품이 없습니다. 먼저 제품을 추가해주세요.")
+    elif st.button(f"📦 전체 {len(st.session_state.products)}개 제품 ZIP 생성", key="bulk_export_btn"):
+        export_progress = st.progress(0.0)
+        product_total = len(st.session_state.products)
+        with profiler.section("일괄 내보내기"):
+            export_data, export_count, export_filename = build_schedule_zip(
+                st.session_state.products,
+                export_formats[export_label],
+                on_progress=lambda done, name: export_progress.progress(done / product_total, text=f"{done}/{product_total} {name}"),
+                calendars=working_calendars
+            )
+        st.session_state.bulk_export = (export_data, export_filename, export_count)
+    
+    if st.session_state.get("bulk_export"):
+        export_data, export_filename, export_count = st.session_state.bulk_export
+        st.download_button(
+            f"📥 ZIP 다운로드 ({export_count}개 제품, {len(export_data) / 1024:,.0f}KB)",
+            data=export_data,
+            file_name=export_filename,
+            mime="application/zip",
+            key="bulk_export_download_btn"
+        )
+
+# ✅ Asana 일정 동기화 (Asana Task 코드가 있는 단계의 시작/마감일 전송, 변경된 작업만)
+with st.expander("🔄 Asana 일정 동기화", expanded=False):
+    asana_token = st.text_input(
+        "Asana 개인 액세스 토큰",
+        value=os.environ.get("ASANA_ACCESS_TOKEN", ""),
+        type="password",
+        key="asana_token_input"
+    )
+    asana_force = st.checkbox("변경 없는 작업도 다시 전송", value=False, key="asana_force_sync")
+    st.caption("💡 'Asana Task 코드'에 작업 ID(숫자) 또는 작업 URL을 입력한 단계만 동기화됩니다.")
+    
+    if st.button("🔄 전체 제품 Asana 동기화", key="asana_sync_btn"):
+        if not asana_token:
+            st.warning("Asana 액세스 토큰을 입력해주세요.")
+        elif not st.session_state.products:
+            st.info("동기화할 제품이 없습니다.")
+        else:
+            sync_progress = st.progress(0.0)
+            with profiler.section("Asana 동기화"):
+                sync_report = sync_task_dates(
+                    st.session_state.products,
+                    asana_token,
+                    state_path=ASANA_STATE_PATH,
+                    force=asana_force,
+                    on_progress=lambda done, total: sync_progress.progress(done / total, text=f"{done}/{total} 작업 전송"),
+                    calendars=working_calendars
+                )
+            st.success(
+                f"✅ 작업 {sync_report['total']}개 중 {sync_report['sent']}개 전송, "
+                f"{sync_report['skipped']}개 변경 없음 ({sync_report['elapsed']}초, 요청 {sync_report['requests']}회)"
+            )
+            if sync_report["failed"]:
+                st.error(f"❌ {sync_report['failed']}개 작업 전송 실패")
+                st.code("\n".join(sync_report["errors"][:50]))
+            if sync_report["invalid"]:
+                st.warning(f"⚠️ 형식이 올바르지 않은 Asana Task 코드 {len(sync_report['invalid'])}개: " + ", ".join(sync_report["invalid"][:10]))
+            if sync_report["duplicates"]:
+                st.warning(f"⚠️ 여러 단계에 연결된 Asana 작업 {len(sync_report['duplicates'])}개 (전송하지 않음): " + " / ".join(sync_report["duplicates"][:10]))
+
 st.markdown("---")
 
 # ✅ 시각화
+profiler.mark("시각화")
 st.subheader("📊 시각화 옵션")
 visualization_option = st.selectbox(
     "시각화 방식 선택",
-    ["타임라인 뷰", "진행 카드 뷰", "캘린더 그리드 뷰", "칸반 보드 뷰"],
+    ["타임라인 뷰", "진행 카드 뷰", "캘린더 그리드 뷰", "칸반 보드 뷰", "포트폴리오 간트 뷰", "담당자 워크로드 히트맵", "포트폴리오 칸반 뷰", "포트폴리오 캘린더 뷰"],
     index=0
 )
 
@@ -1666,8 +2010,29 @@ elif visualization_option == "캘린더 그리드 뷰":
     show_calendar_grid(result_df, excluded)
 elif visualization_option == "칸반 보드 뷰":
     show_kanban_board(result_df)
+elif visualization_option == "포트폴리오 간트 뷰":
+    with profiler.section("포트폴리오 일정 계산"):
+        portfolio_df = compute_portfolio_schedule(st.session_state.products, working_calendars)
+    show_portfolio_gantt(portfolio_df)
+elif visualization_option == "담당자 워크로드 히트맵":
+    with profiler.section("포트폴리오 일정 계산"):
+        portfolio_df = compute_portfolio_schedule(st.session_state.products, working_calendars)
+    holidays_by_product = {
+        product_name: product_data.get("custom_excludes", set())
+        for product_name, product_data in st.session_state.products.items()
+    }
+    show_workload_heatmap(portfolio_df, holidays_by_product, st.session_state.team_members, calendars=working_calendars)
+elif visualization_option == "포트폴리오 칸반 뷰":
+    with profiler.section("포트폴리오 일정 계산"):
+        portfolio_df = compute_portfolio_schedule(st.session_state.products, working_calendars)
+    show_portfolio_kanban(portfolio_df)
+elif visualization_option == "포트폴리오 캘린더 뷰":
+    with profiler.section("포트폴리오 일정 계산"):
+        portfolio_df = compute_portfolio_schedule(st.session_state.products, working_calendars)
+    show_portfolio_calendar(portfolio_df)
 
 # ✅ Google 스프레드시트 데이터 관리
+profiler.mark("Google 스프레드시트")
 st.markdown("---")
 st.subheader("💾 Google 스프레드시트 데이터 관리")
 product_data_expander = st.expander("제품 데이터 저장/불러오기", expanded=False)
@@ -1707,6 +2072,15 @@ with product_data_expander:
                 )
                 
                 if success:
+                    if st.session_state.current_product in st.session_state.products:
+                        st.session_state.sync_tracker.mark_synced(
+                            SYNC_SHEETS, st.session_state.current_product,
+                            st.session_state.products[st.session_state.current_product]
+                        )
+                        st.session_state.drift_detector.mark_saved(
+                            st.session_state.current_product,
+                            st.session_state.products[st.session_state.current_product]
+                        )
                     st.success(f"✅ **{st.session_state.current_product}** 제품 데이터가 Google 스프레드시트에 저장되었습니다!")
                     st.info(f"📊 스프레드시트 URL: {spreadsheet_url}")
                     st.info(f"🔑 스프레드시트 ID: `{spreadsheet_id}`")
@@ -1715,6 +2089,30 @@ with product_data_expander:
                     st.session_state.saved_spreadsheet_id = spreadsheet_id
                 else:
                     st.error("❌ Google 스프레드시트 저장에 실패했습니다.")
+            
+            # 마지막 Sheets 저장 이후 바뀐 제품만 일괄 저장
+            sheets_dirty = st.session_state.sync_tracker.dirty(SYNC_SHEETS, st.session_state.products)
+            if sheets_dirty:
+                st.caption(f"🟠 Sheets에 저장되지 않은 변경: {', '.join(sheets_dirty[:5])}{' 외' if len(sheets_dirty) > 5 else ''}")
+                if st.button(f"📊 변경된 {len(sheets_dirty)}개 제품 일괄 저장", key="sheets_batch_save_btn"):
+                    batch_progress = st.progress(0.0)
+                    saved_names = []
+                    for index, product_name in enumerate(sheets_dirty, 1):
+                        product_state = st.session_state.products[product_name]
+                        success, saved_spreadsheet_id, _ = save_product_data_to_sheets(product_name, product_state, spreadsheet_id)
+                        if success:
+                            spreadsheet_id = saved_spreadsheet_id or spreadsheet_id
+                            st.session_state.sync_tracker.mark_synced(SYNC_SHEETS, product_name, product_state)
+                            st.session_state.drift_detector.mark_saved(product_name, product_state)
+                            saved_names.append(product_name)
+                        batch_progress.progress(index / len(sheets_dirty), text=f"{index}/{len(sheets_dirty)} {product_name}")
+                    st.session_state.saved_spreadsheet_id = spreadsheet_id
+                    if len(saved_names) == len(sheets_dirty):
+                        st.success(f"✅ {len(saved_names)}개 제품을 Google 스프레드시트에 저장했습니다.")
+                    else:
+                        st.error(f"❌ {len(sheets_dirty) - len(saved_names)}개 제품 저장에 실패했습니다.")
+            elif st.session_state.products:
+                st.caption("🟢 모든 제품이 Sheets와 같습니다.")
         
         with col_sheets_load:
             st.markdown("### 📊 Google 스프레드시트 불러오기")
@@ -1734,11 +2132,11 @@ with product_data_expander:
             # 스프레드시트에서 사용 가능한 제품 목록 가져오기
             available_products = []
             try:
-                client = get_google_sheets_client()
-                if client:
-                    spreadsheet = client.open_by_key(spreadsheet_id)
-                    worksheets = spreadsheet.worksheets()
-                    available_products = [ws.title.replace("_데이터", "") for ws in worksheets if ws.title.endswith("_데이터")]
+                with profiler.section("Sheets 목록 조회"):
+                    client = get_google_sheets_client()
+                    if client:
+                        spreadsheet = sheets_call("open_by_key", client.open_by_key, spreadsheet_id, dedupe_key=spreadsheet_id)
+                        available_products = SheetsStorage(spreadsheet, call=sheets_call).names()
             except Exception as e:
                 st.warning(f"스프레드시트 접근 중 오류: {e}")
             
@@ -1768,6 +2166,11 @@ with product_data_expander:
                         st.session_state.target_date = loaded_data["target_date"]
                     if loaded_data["team_members"]:
                         st.session_state.team_members = loaded_data["team_members"]
+                    st.session_state.sheets_loaded_product = st.session_state.current_product
+                    # 함께 읽은 '단계별 시작/종료일' 섹션은 변경 검출의 저장본으로 사용
+                    st.session_state.drift_detector.set_stored(
+                        st.session_state.current_product, loaded_data, revision=loaded_data.get("saved_at")
+                    )
                     st.success(f"✅ **{loaded_data['product_name']}** 제품 데이터를 불러왔습니다!")
                     
                     # 스프레드시트 ID 저장
@@ -1775,7 +2178,43 @@ with product_data_expander:
                     st.rerun()
                 else:
                     st.error("❌ 스프레드시트에서 데이터를 불러오는데 실패했습니다.")
-
+            
+            st.caption(f"💡 저장일시({REVISION_CELL})가 그대로인 제품은 다시 내려받지 않고 캐시에서 불러옵니다. "
+                       "시트를 직접 수정했다면 캐시를 비워주세요.")
+            if st.button("🧹 Sheets 캐시 비우기", key="clear_sheet_cache_btn"):
+                get_product_sheet_cache().invalidate(spreadsheet_id)
+                st.success("✅ 캐시를 비웠습니다.")
+
+        # ✅ 저장본 대비 일정 변경 검출 (Sheets의 '단계별 시작/종료일' vs 현재 데이터로 재계산)
+        st.markdown("### 🔍 Sheets 저장본 대비 일정 변경")
+        drift_detector = st.session_state.drift_detector
+        missing_stored = [
+            name for name in st.session_state.products
+            if name in available_products and name not in drift_detector.stored_names()
+        ]
+        if missing_stored and st.button(f"📥 저장본이 없는 {len(missing_stored)}개 제품 Sheets에서 읽기", key="drift_fetch_btn"):
+            fetch_progress = st.progress(0.0)
+            for index, product_name in enumerate(missing_stored, 1):
+                loaded_data = load_product_data_from_sheets(spreadsheet_id, product_name)
+                if loaded_data:
+                    drift_detector.set_stored(product_name, loaded_data, revision=loaded_data.get("saved_at"))
+                fetch_progress.progress(index / len(missing_stored), text=f"{index}/{len(missing_stored)} {product_name}")
+        
+        with profiler.section("일정 변경 검출"):
+            drift_report = drift_detector.report(st.session_state.products)
+        if drift_report.empty:
+            st.caption("💡 Sheets에서 불러오거나 저장한 제품부터 비교할 수 있습니다.")
+        else:
+            drift_changed = drift_report[drift_report["상태"] != STATUS_SAME]
+            if drift_changed.empty:
+                st.success(f"✅ 비교한 {drift_report['제품'].nunique()}개 제품의 일정이 저장본과 같습니다.")
+            else:
+                st.warning(
+                    f"⚠️ {drift_changed['제품'].nunique()}개 제품의 {len(drift_changed)}개 단계가 저장본과 다릅니다. "
+                    "Sheets에 다시 저장하면 반영됩니다."
+                )
+                st.dataframe(drift_summary(drift_report), hide_index=True, use_container_width=True)
+                st.dataframe(drift_changed, hide_index=True, use_container_width=True)
         
     else:
         st.error("❌ Google Sheets 기능을 사용할 수 없습니다.")
@@ -1792,3 +2231,23 @@ with product_data_expander:
         
         또는 **로컬에서 실행**하여 Google Sheets 기능을 테스트할 수 있습니다.
         """)
+
+# ✅ 성능 디버그 패널
+if profiler.enabled:
+    profiler.end_run()
+    st.markdown("---")
+    with st.expander("🐢 성능 디버그 패널", expanded=False):
+        perf_rows = profiler.summary()
+        if perf_rows:
+            st.dataframe(pd.DataFrame(perf_rows), use_container_width=True, hide_index=True)
+        st.caption(f"최근 {profiler.window}회 기준 p50/p95 · 실행 로그: `{os.path.abspath(profiler.log_path)}`")
+        sheets_io_rows = get_sheets_io().summary()
+        if sheets_io_rows:
+            st.markdown("**Sheets API 호출 계층** (프로세스 전체 누적 · 재시도/속도 제한 대기 포함)")
+            st.dataframe(pd.DataFrame(sheets_io_rows), use_container_width=True, hide_index=True)
+        sheet_cache = get_product_sheet_cache()
+        st.caption(f"제품 워크시트 캐시: {len(sheet_cache)}개 · 적중 {sheet_cache.stats['hits']} · 미적중 {sheet_cache.stats['misses']}")
+        if st.button("🔄 통계 초기화", key="reset_profiler_btn"):
+            profiler.reset()
+            get_sheets_io().reset_stats()
+            st.rerun()
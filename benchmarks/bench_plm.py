@@ -0,0 +1,417 @@
+# benchmarks/bench_plm.py - 합성 포트폴리오 기반 성능 벤치마크
+#
+# 사용 예:
+#   python benchmarks/bench_plm.py --preset quick --output bench_results.json
+#   python benchmarks/bench_plm.py --preset quick --baseline bench_results.json   # 회귀 시 종료 코드 1
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plm.asana_sync import sync_task_dates  # noqa: E402
+from plm.calendars import CalendarRegistry, WorkingCalendar  # noqa: E402
+from plm.calendar_html import (  # noqa: E402
+    MonthHtmlCache, calendar_months, calendar_pages, render_calendar_page, render_full_calendar,
+)
+from plm.fake_asana import start_fake_asana  # noqa: E402
+from plm.fake_sheets import FakeSheetsBackend  # noqa: E402
+from plm.overlay import PhaseIntervalIndex, overlay_months, render_overlay_page  # noqa: E402
+from plm.portfolio import compute_portfolio_schedule  # noqa: E402
+from plm.schedule import backward_schedule, get_weekends_between  # noqa: E402
+from plm.sheets_format import build_product_rows, parse_product_values  # noqa: E402
+from plm.sheets_cache import ProductSheetCache  # noqa: E402
+from plm.sheets_io import SheetsIO  # noqa: E402
+from plm.storage import JsonStorage, SqliteStorage, fake_sheets_storage  # noqa: E402
+from plm.scenarios import Scenario, compare_scenarios  # noqa: E402
+from plm.sensitivity import phase_sensitivity  # noqa: E402
+from plm.solver import solve_compression  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+PHASE_NAMES = [
+    "사전 시장조사",
+    "부자재 사양확정 및 샘플링",
+    "CT 및 사전 품질 확보",
+    "부자재 발주~입고",
+    "완제품 발주~생산",
+    "품질 초도 검사~입고",
+]
+PHASE_COLORS = {
+    "사전 시장조사": "#E3F2FD",
+    "부자재 사양확정 및 샘플링": "#F3E5F5",
+    "CT 및 사전 품질 확보": "#E8F5E8",
+    "부자재 발주~입고": "#FFF3E0",
+    "완제품 발주~생산": "#FCE4EC",
+    "품질 초도 검사~입고": "#E0F2F1",
+}
+MEMBERS = ["성지현", "정현택", "박솔비", "노미소", "권세진", "김민정", "도기웅"]
+BASE_TARGET = date(2027, 6, 30)
+
+# ✅ 프리셋별 케이스 (case, params)
+PRESETS = {
+    "quick": [
+        ("backward_schedule", {"products": 1, "phases": 6, "excludes": 10}),
+        ("backward_schedule", {"products": 100, "phases": 20, "excludes": 100}),
+        ("backward_schedule", {"products": 1000, "phases": 6, "excludes": 10}),
+        ("backward_schedule", {"products": 1000, "phases": 6, "excludes": 10, "calendars": 2}),
+        ("get_weekends_between", {"years": 1}),
+        ("get_weekends_between", {"years": 5}),
+        ("full_calendar", {"phases": 6, "years": 1, "excludes": 10}),
+        ("full_calendar", {"phases": 20, "years": 2, "excludes": 100}),
+        ("calendar_page", {"phases": 20, "years": 2, "excludes": 100, "cached": False}),
+        ("calendar_page", {"phases": 20, "years": 2, "excludes": 100, "cached": True}),
+        ("overlay_calendar", {"products": 300, "phases": 6}),
+        ("parse_product_values", {"products": 100, "phases": 6, "excludes": 10}),
+        ("parse_product_values", {"products": 100, "phases": 50, "excludes": 500}),
+        ("asana_sync", {"products": 50, "phases": 6, "latency_ms": 20, "batch_size": 10}),
+        ("sheets_io", {"products": 20, "sessions": 8, "latency_ms": 20, "fail_every": 10}),
+        ("storage_roundtrip", {"backend": "json", "products": 50}),
+        ("storage_roundtrip", {"backend": "sqlite", "products": 50}),
+        ("storage_roundtrip", {"backend": "fake_sheets", "products": 50}),
+        ("solve_compression", {"phases": 6, "excludes": 10, "shortfall": 0.15}),
+        ("solve_compression", {"phases": 40, "excludes": 100, "shortfall": 0.15}),
+        ("compare_scenarios", {"scenarios": 20, "phases": 20, "excludes": 100}),
+        ("phase_sensitivity", {"phases": 20, "excludes": 100}),
+    ],
+    "full": [
+        ("backward_schedule", {"products": 1, "phases": 6, "excludes": 10}),
+        ("backward_schedule", {"products": 1000, "phases": 20, "excludes": 100}),
+        ("backward_schedule", {"products": 5000, "phases": 6, "excludes": 10}),
+        ("backward_schedule", {"products": 5000, "phases": 100, "excludes": 2000}),
+        ("backward_schedule", {"products": 5000, "phases": 100, "excludes": 2000, "calendars": 4}),
+        ("get_weekends_between", {"years": 1}),
+        ("get_weekends_between", {"years": 20}),
+        ("full_calendar", {"phases": 6, "years": 1, "excludes": 10}),
+        ("full_calendar", {"phases": 100, "years": 5, "excludes": 2000}),
+        ("calendar_page", {"phases": 100, "years": 5, "excludes": 2000, "cached": False}),
+        ("calendar_page", {"phases": 100, "years": 5, "excludes": 2000, "cached": True}),
+        ("overlay_calendar", {"products": 300, "phases": 6}),
+        ("overlay_calendar", {"products": 2000, "phases": 20}),
+        ("parse_product_values", {"products": 1000, "phases": 6, "excludes": 10}),
+        ("parse_product_values", {"products": 1000, "phases": 100, "excludes": 2000}),
+        ("asana_sync", {"products": 200, "phases": 6, "latency_ms": 20, "batch_size": 1}),
+        ("asana_sync", {"products": 200, "phases": 6, "latency_ms": 20, "batch_size": 10}),
+        ("sheets_io", {"products": 100, "sessions": 16, "latency_ms": 20, "fail_every": 10}),
+        ("storage_roundtrip", {"backend": "json", "products": 1000}),
+        ("storage_roundtrip", {"backend": "sqlite", "products": 1000}),
+        ("storage_roundtrip", {"backend": "fake_sheets", "products": 1000}),
+        ("solve_compression", {"phases": 6, "excludes": 10, "shortfall": 0.15}),
+        ("solve_compression", {"phases": 100, "excludes": 2000, "shortfall": 0.2}),
+        ("compare_scenarios", {"scenarios": 20, "phases": 20, "excludes": 100}),
+        ("compare_scenarios", {"scenarios": 200, "phases": 100, "excludes": 2000}),
+        ("phase_sensitivity", {"phases": 20, "excludes": 100}),
+        ("phase_sensitivity", {"phases": 100, "excludes": 2000}),
+    ],
+}
+
+
+# ✅ 합성 데이터 생성
+def make_excludes(rng, count, start, end):
+    """start~end 사이 평일 중 count개를 무작위 제외일로 선택"""
+    span = (end - start).days
+    weekdays = [start + timedelta(days=i) for i in range(span + 1) if (start + timedelta(days=i)).weekday() < 5]
+    return set(rng.sample(weekdays, min(count, len(weekdays))))
+
+
+def make_product(rng, index, phases, excludes, years=None):
+    """합성 제품 1개 (years가 주어지면 전체 일정이 해당 기간에 걸치도록 리드타임 조정)"""
+    if years:
+        mean_lead = max(1, int(years * 250 / phases))
+    else:
+        mean_lead = 15
+    phase_rows = [{
+        "단계": PHASE_NAMES[i % len(PHASE_NAMES)] + (f" {i // len(PHASE_NAMES) + 1}" if i >= len(PHASE_NAMES) else ""),
+        "리드타임": rng.randint(max(1, mean_lead // 2), mean_lead * 3 // 2 + 1),
+        "담당자": rng.choice(MEMBERS),
+        "Asana Task 코드": f"1200{index:06d}{i:04d}",  # Asana gid처럼 숫자만
+    } for i in range(phases)]
+    target_date = BASE_TARGET + timedelta(days=rng.randint(0, 365))
+    horizon_days = sum(row["리드타임"] for row in phase_rows) * 7 // 5 + 60
+    return {
+        "product_name": f"합성제품_{index:05d}",
+        "phases": phase_rows,
+        "custom_excludes": make_excludes(rng, excludes, target_date - timedelta(days=horizon_days), target_date),
+        "target_date": target_date,
+        "team_members": list(MEMBERS),
+    }
+
+
+def make_portfolio(seed, products, phases, excludes, years=None):
+    rng = random.Random(seed)
+    return [make_product(rng, i, phases, excludes, years) for i in range(products)]
+
+
+def record_worksheet_values(product):
+    """build_product_rows 결과를 get_all_values()와 같은 문자열 행렬로 기록"""
+    product_data = dict(product, phases=pd.DataFrame(product["phases"]))
+    rows, _ = build_product_rows(product["product_name"], product_data, saved_at="2025-07-29T16:11:50.060031")
+    width = max(len(row) for row in rows)
+    return [[str(value) for value in row] + [""] * (width - len(row)) for row in rows]
+
+
+# ✅ 케이스별 준비/실행 함수 (준비 시간은 측정에서 제외)
+def prepare_case(case, params, seed, recording=None):
+    if case == "backward_schedule":
+        portfolio = make_portfolio(seed, params["products"], params["phases"], params["excludes"])
+        calendars = None
+        if params.get("calendars"):
+            # 발주/생산 단계에 공급사 캘린더 지정 (주 6일/5일 번갈아, 캘린더마다 휴일 다름)
+            rng = random.Random(seed)
+            calendars = CalendarRegistry(
+                WorkingCalendar(f"공급사 {i}", "월화수목금토" if i % 2 == 0 else "월화수목금",
+                                make_excludes(rng, 60, BASE_TARGET - timedelta(days=365 * 3), BASE_TARGET + timedelta(days=365)))
+                for i in range(params["calendars"])
+            )
+            names = list(calendars)
+            for product in portfolio:
+                for i, phase in enumerate(product["phases"]):
+                    if "발주" in phase["단계"]:
+                        phase["캘린더"] = names[i % len(names)]
+
+        def run():
+            for product in portfolio:
+                backward_schedule(product["target_date"], product["phases"], product["custom_excludes"], calendars)
+        return run
+
+    if case == "get_weekends_between":
+        start = BASE_TARGET - timedelta(days=365 * params["years"])
+        return lambda: get_weekends_between(start, BASE_TARGET)
+
+    if case == "full_calendar":
+        # 전체 기간 캘린더 HTML (내보내기/CLI --html 분량)
+        product = make_portfolio(seed, 1, params["phases"], params["excludes"], years=params["years"])[0]
+        excluded = product["custom_excludes"]
+        df = pd.DataFrame(backward_schedule(product["target_date"], product["phases"], excluded))
+        return lambda: render_full_calendar(df, PHASE_COLORS, excluded)
+
+    if case == "calendar_page":
+        # 캘린더 뷰 1회 재실행 분량: 월 목록 계산 + 보이는 3개월(가운데 페이지)만 렌더링
+        product = make_portfolio(seed, 1, params["phases"], params["excludes"], years=params["years"])[0]
+        excluded = product["custom_excludes"]
+        df = pd.DataFrame(backward_schedule(product["target_date"], product["phases"], excluded))
+        cache = MonthHtmlCache() if params["cached"] else None
+
+        def run():
+            pages = calendar_pages(calendar_months(df))
+            render_calendar_page(df, pages[len(pages) // 2], PHASE_COLORS, excluded, cache)
+        return run
+
+    if case == "overlay_calendar":
+        # 포트폴리오 캘린더 1회 재실행 분량: 구간 색인 + 가운데 3개월 렌더링 + 담당자 중복 목록
+        portfolio = make_portfolio(seed, params["products"], params["phases"], 10)
+        products = {product["product_name"]: dict(product, phases=pd.DataFrame(product["phases"])) for product in portfolio}
+        portfolio_df = compute_portfolio_schedule(products)
+
+        def run():
+            index = PhaseIntervalIndex(portfolio_df)
+            pages = calendar_pages(overlay_months(index))
+            _, window = render_overlay_page(index, pages[len(pages) // 2])
+            index.conflicts(window)
+        return run
+
+    if case == "parse_product_values":
+        if recording is not None:
+            values = recording
+        else:
+            portfolio = make_portfolio(seed, params["products"], params["phases"], params["excludes"])
+            values = [record_worksheet_values(product) for product in portfolio]
+
+        def run():
+            for all_data in values:
+                parse_product_values(all_data)
+        return run
+
+    if case == "asana_sync":
+        # 로컬 가짜 Asana 서버 대상, 매번 전체 전송 (속도 제한은 측정에서 배제)
+        portfolio = make_portfolio(seed, params["products"], params["phases"], 10)
+        products = {product["product_name"]: dict(product, phases=pd.DataFrame(product["phases"])) for product in portfolio}
+        _, base_url = start_fake_asana(latency=params["latency_ms"] / 1000)
+
+        def run():
+            sync_task_dates(products, "bench", state_path=None, base_url=base_url, rate=10000, burst=10000,
+                            concurrency=8, batch_size=params["batch_size"])
+        return run
+
+    if case == "sheets_io":
+        # 가짜 Sheets 대상, 여러 세션이 동시에 전체 제품을 읽음 (동일 읽기 병합 + 일시 오류 재시도, 속도 제한은 배제)
+        portfolio = make_portfolio(seed, params["products"], 6, 10)
+        backend = FakeSheetsBackend(latency=params["latency_ms"] / 1000)
+        spreadsheet = backend.client().create("bench")
+        for product in portfolio:
+            worksheet = spreadsheet.add_worksheet(title=f"{product['product_name']}_데이터", rows=100, cols=20)
+            worksheet.update("A1", record_worksheet_values(product))
+        worksheets = spreadsheet.worksheets()
+        backend.fail_every = params["fail_every"]
+
+        def load_all(sheets_io):
+            for worksheet in worksheets:
+                values = sheets_io.call("get_all_values", worksheet.get_all_values,
+                                        dedupe_key=(spreadsheet.id, worksheet.title))
+                parse_product_values(values)
+
+        def run():
+            sheets_io = SheetsIO(rate=100000, burst=100000, base_delay=0.001)
+            with ThreadPoolExecutor(params["sessions"]) as pool:
+                list(pool.map(load_all, [sheets_io] * params["sessions"]))
+        return run
+
+    if case == "storage_roundtrip":
+        # 저장소 구현별 전체 저장 → 버전 확인 + 불러오기 (가짜 Sheets는 파싱 캐시 사용, 지연/할당량 없음)
+        portfolio = make_portfolio(seed, params["products"], 6, 10)
+        products = [(product["product_name"], dict(product, phases=pd.DataFrame(product["phases"]))) for product in portfolio]
+        if params["backend"] == "json":
+            storage = JsonStorage(tempfile.mkdtemp(prefix="bench_storage_"))
+        elif params["backend"] == "sqlite":
+            storage = SqliteStorage(os.path.join(tempfile.mkdtemp(prefix="bench_storage_"), "products.db"))
+        else:
+            storage, _ = fake_sheets_storage(cache=ProductSheetCache(max_entries=params["products"]))
+
+        def run():
+            for product_name, product_data in products:
+                storage.save(product_name, product_data)
+            for product_name in storage.names():
+                storage.load(product_name)
+        return run
+
+    if case == "solve_compression":
+        # 전체 기간의 shortfall 비율만큼 시작일이 과거인 제품 (최소 리드타임 기본값 = 75%)
+        product = make_portfolio(seed, 1, params["phases"], params["excludes"])[0]
+        first_start = backward_schedule(product["target_date"], product["phases"], product["custom_excludes"])[0]["시작일"]
+        earliest = first_start + (product["target_date"] - first_start) * params["shortfall"]
+        rng = random.Random(seed)
+        costs = [rng.choice([1, 2, 3, 5]) for _ in product["phases"]]
+
+        def run():
+            solve_compression(product["target_date"], product["phases"], product["custom_excludes"],
+                              earliest_start=earliest, crash_costs=costs)
+        return run
+
+    if case == "compare_scenarios":
+        # 시나리오마다 단계 3개 리드타임 변경 + 추가 제외일 2개 + 목표일 이동
+        product = make_portfolio(seed, 1, params["phases"], params["excludes"])[0]
+        rng = random.Random(seed)
+        target = product["target_date"]
+        scenarios = [Scenario(
+            f"대안 {i + 1}",
+            {rng.randrange(params["phases"]): rng.randint(1, 40) for _ in range(3)},
+            [target - timedelta(days=rng.randint(1, 200)) for _ in range(2)],
+            rng.randint(-30, 30),
+        ) for i in range(params["scenarios"])]
+        return lambda: compare_scenarios(target, product["phases"], product["custom_excludes"], scenarios)
+
+    if case == "phase_sensitivity":
+        product = make_portfolio(seed, 1, params["phases"], params["excludes"])[0]
+        return lambda: phase_sensitivity(product["target_date"], product["phases"], product["custom_excludes"])
+
+    raise ValueError(f"알 수 없는 케이스: {case}")
+
+
+def time_case(run, repeat, warmup=1):
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def case_key(result):
+    return result["case"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare_with_baseline(results, baseline_path, threshold):
+    """기준 결과 대비 median이 threshold배 이상 느려진 케이스 목록"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {case_key(result): result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        base = baseline.get(case_key(result))
+        if base and base["median_ms"] > 0:
+            ratio = result["median_ms"] / base["median_ms"]
+            result["baseline_median_ms"] = base["median_ms"]
+            result["ratio"] = round(ratio, 3)
+            if ratio >= threshold:
+                regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PLM 일정/캘린더/Sheets 파서 벤치마크")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--case", action="append", help="특정 케이스만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (미지정 시 표준출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="회귀로 판단할 median 배수")
+    parser.add_argument("--recording", help="parse_product_values에 사용할 기록된 워크시트 값 JSON")
+    parser.add_argument("--save-recording", help="합성 워크시트 값을 JSON으로 기록 후 종료")
+    args = parser.parse_args(argv)
+
+    if args.save_recording:
+        portfolio = make_portfolio(args.seed, 100, 6, 10)
+        with open(args.save_recording, "w", encoding="utf-8") as f:
+            json.dump([record_worksheet_values(product) for product in portfolio], f, ensure_ascii=False)
+        print(f"기록 완료: {args.save_recording}", file=sys.stderr)
+        return 0
+
+    recording = None
+    if args.recording:
+        with open(args.recording, "r", encoding="utf-8") as f:
+            recording = json.load(f)
+
+    results = []
+    for case, params in PRESETS[args.preset]:
+        if args.case and case not in args.case:
+            continue
+        run = prepare_case(case, params, args.seed, recording if case == "parse_product_values" else None)
+        samples = time_case(run, args.repeat)
+        result = {
+            "case": case,
+            "params": params,
+            "repeat": args.repeat,
+            "min_ms": round(min(samples), 3),
+            "median_ms": round(statistics.median(samples), 3),
+            "max_ms": round(max(samples), 3),
+        }
+        results.append(result)
+        print(f"{case:<24} {json.dumps(params, ensure_ascii=False):<52} median {result['median_ms']:>10.3f} ms", file=sys.stderr)
+
+    regressions = compare_with_baseline(results, args.baseline, args.threshold) if args.baseline else []
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "preset": args.preset,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    for result in regressions:
+        print(f"⚠️ 회귀: {result['case']} {result['params']} - {result['ratio']}배", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
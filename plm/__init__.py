@@ -0,0 +1 @@
+# plm - 이퀄베리 신제품 일정 관리 라이브러리 (Streamlit 없이 사용 가능한 공용 로직)
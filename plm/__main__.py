@@ -0,0 +1,7 @@
+# plm/__main__.py - python -m plm 실행 진입점
+
+import sys
+
+from plm.cli import main
+
+sys.exit(main())
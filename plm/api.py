@@ -0,0 +1,281 @@
+# plm/api.py - 로컬 HTTP 일정 계산 API (Asana 자동화용, 표준 라이브러리만 사용)
+#
+# 사용 예:
+#   python -m plm serve --products . --port 8765
+#   curl -s localhost:8765/schedule -d '{"target_date": "2026-03-31", "phases": [{"단계": "기획", "리드타임": 5, "Asana Task 코드": "T-1"}]}'
+#   curl -s localhost:8765/tasks/T-1
+#
+# 엔드포인트:
+#   POST /schedule      {"target_date", "phases", "custom_excludes"} 또는 {"product": 제품명[, "target_date"]}
+#   GET  /tasks/<코드>   저장소의 모든 제품에서 Asana Task 코드로 일정 조회
+#   GET  /health, GET /stats
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from plm.calendars import load_calendars
+from plm.repository import ProductRepository, normalize_phase_record, read_product_file
+from plm.schedule import backward_schedule
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+MAX_LEAD_TIME = 3650  # 단계 리드타임 상한 (근무일) - 역산이 하루씩 세므로 큰 값이 요청 스레드를 오래 붙잡지 않도록
+
+
+class ApiError(Exception):
+    """HTTP 상태 코드를 가진 요청 오류"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_date(value, field):
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        raise ApiError(400, f"{field} 날짜 형식이 올바르지 않습니다: {value}") from None
+
+
+def payload_key(payload):
+    """요청 내용의 정규화된 해시 (키 순서/공백과 무관)"""
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def schedule_response(target_date, phases, excluded, calendars=None):
+    """일정 역산 결과 - 단계 순서 목록과 Asana Task 코드별 조회용 dict"""
+    too_long = [phase["단계"] for phase in phases if phase["리드타임"] > MAX_LEAD_TIME]
+    if too_long:
+        raise ApiError(400, f"리드타임은 {MAX_LEAD_TIME}일 이하여야 합니다: {', '.join(map(str, too_long))}")
+    schedule = backward_schedule(target_date, phases, excluded, calendars)
+    rows = [
+        {**row, "시작일": row["시작일"].isoformat(), "종료일": row["종료일"].isoformat()}
+        for row in schedule
+    ]
+    by_task = {row["Asana Task 코드"]: row for row in rows if row["Asana Task 코드"]}
+    return {"target_date": target_date.isoformat(), "schedule": rows, "by_task": by_task}
+
+
+class ScheduleService:
+    """일정 계산 + LRU 응답 캐시 + 동일 요청 동시 처리 병합(single-flight)"""
+
+    def __init__(self, repository=None, cache_size=1024, calendars=None):
+        self.repository = repository
+        self.cache_size = cache_size
+        self.calendars = calendars  # 단계별 근무 캘린더 (서버 수명 동안 고정 - 캐시 키에 넣지 않음)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    # ✅ 캐시/병합
+    def cached(self, key, compute):
+        """key의 응답 bytes를 캐시에서 찾고, 없으면 한 스레드만 compute() 실행 (나머지는 결과 대기)"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._cache[key]
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = self._inflight[key] = {"event": threading.Event(), "result": None, "error": None}
+                owner = True
+                self.stats["misses"] += 1
+            else:
+                owner = False
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            waiter["event"].wait()
+            if waiter["error"] is not None:
+                raise waiter["error"]
+            return waiter["result"]
+
+        try:
+            body = compute()
+            waiter["result"] = body
+            with self._lock:
+                self._cache[key] = body
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return body
+        except Exception as e:
+            waiter["error"] = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter["event"].set()
+
+    def snapshot_stats(self):
+        with self._lock:
+            return {**self.stats, "cached": len(self._cache), "inflight": len(self._inflight)}
+
+    # ✅ 저장소
+    def _product_path(self, product_name):
+        if self.repository is None:
+            raise ApiError(400, "제품 저장소가 설정되지 않았습니다 (--products)")
+        entry = self.repository.summary(product_name)
+        if entry is None and self.repository.refresh_if_changed():
+            entry = self.repository.summary(product_name)
+        if entry is None:
+            raise ApiError(404, f"제품을 찾을 수 없습니다: {product_name}")
+        return os.path.join(self.repository.directory, entry["file"])
+
+    def _product_inputs(self, product_name, target_override=None):
+        data = read_product_file(self._product_path(product_name))
+        target = target_override or data.get("target_date")
+        if not target:
+            raise ApiError(400, f"목표완료일이 없습니다: {product_name}")
+        phases = [normalize_phase_record(phase) for phase in data.get("phases", [])]
+        excluded = {_parse_date(d, "custom_excludes") for d in data.get("custom_excludes", [])}
+        return _parse_date(target, "target_date"), phases, excluded
+
+    # ✅ 요청 처리
+    def schedule(self, payload):
+        """POST /schedule - 응답 JSON bytes"""
+        if not isinstance(payload, dict):
+            raise ApiError(400, "요청 본문은 JSON 객체여야 합니다")
+
+        if "product" in payload:
+            if not isinstance(payload["product"], str) or not payload["product"]:
+                raise ApiError(400, "product는 제품명 문자열이어야 합니다")
+            # 제품 파일이 바뀌면 캐시 키도 바뀌도록 수정 시각을 포함
+            path = self._product_path(payload["product"])
+            key = payload_key({**payload, "_mtime": os.path.getmtime(path)})
+
+            def compute():
+                result = schedule_response(*self._product_inputs(payload["product"], payload.get("target_date")), self.calendars)
+                return _encode({"product": payload["product"], **result})
+        else:
+            if "target_date" not in payload or not isinstance(payload.get("phases"), list):
+                raise ApiError(400, "target_date와 phases(목록)가 필요합니다")
+            key = payload_key(payload)
+
+            def compute():
+                try:
+                    phases = [normalize_phase_record(phase) for phase in payload["phases"]]
+                except (AttributeError, TypeError, ValueError) as e:
+                    raise ApiError(400, f"phases 형식 오류: {e}") from None
+                excluded = {_parse_date(d, "custom_excludes") for d in payload.get("custom_excludes", [])}
+                return _encode(schedule_response(
+                    _parse_date(payload["target_date"], "target_date"), phases, excluded, self.calendars
+                ))
+
+        return self.cached(key, compute)
+
+    def task(self, task_code):
+        """GET /tasks/<코드> - 저장소 모든 제품에서 해당 코드의 단계 일정"""
+        if self.repository is None:
+            raise ApiError(400, "제품 저장소가 설정되지 않았습니다 (--products)")
+        self.repository.refresh_if_changed()
+        matches = []
+        for product_name in self.repository.names():
+            result = json.loads(self.schedule({"product": product_name}))
+            row = result["by_task"].get(task_code)
+            if row:
+                matches.append({"product": product_name, **row})
+        if not matches:
+            raise ApiError(404, f"Asana Task 코드를 찾을 수 없습니다: {task_code}")
+        return _encode({"task": task_code, "matches": matches})
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PLMScheduleAPI/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, action):
+        try:
+            self._send(200, action())
+        except ApiError as e:
+            self._send(e.status, _encode({"error": str(e)}))
+        except Exception as e:
+            self._send(500, _encode({"error": f"{type(e).__name__}: {e}"}))
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        service = self.server.service
+        if path == "/health":
+            self._handle(lambda: _encode({"status": "ok"}))
+        elif path == "/stats":
+            self._handle(lambda: _encode(service.snapshot_stats()))
+        elif path.startswith("/tasks/"):
+            self._handle(lambda: service.task(unquote(path[len("/tasks/"):])))
+        else:
+            self._send(404, _encode({"error": f"알 수 없는 경로: {path}"}))
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path != "/schedule":
+            self._send(404, _encode({"error": f"알 수 없는 경로: {path}"}))
+            return
+
+        def action():
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise ApiError(400, "Content-Length가 올바르지 않습니다")
+            if length > MAX_BODY_BYTES:
+                raise ApiError(413, "요청 본문이 너무 큽니다")
+            try:
+                payload = json.loads(self.rfile.read(length) or b"null")
+            except ValueError:
+                raise ApiError(400, "JSON 형식이 올바르지 않습니다") from None
+            return self.server.service.schedule(payload)
+
+        self._handle(action)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, verbose=False):
+    """요청마다 스레드를 쓰는 HTTP 서버 생성 (port=0이면 빈 포트 자동 선택)"""
+    server = ThreadingHTTPServer((host, port), ScheduleRequestHandler)
+    server.daemon_threads = True
+    server.service = service or ScheduleService()
+    server.verbose = verbose
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, products_dir=None, cache_size=1024, verbose=False, calendars_path=None):
+    repository = ProductRepository(products_dir) if products_dir else None
+    calendars = load_calendars(calendars_path) if calendars_path else None
+    server = make_server(host, port, ScheduleService(repository, cache_size, calendars), verbose)
+    print(f"PLM 일정 API 실행 중: http://{host}:{server.server_address[1]} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,224 @@
+# plm/asana_sync.py - 단계별 시작/마감일을 Asana 작업에 동시 전송 (속도 제한, 배치, 변경분만)
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+
+from plm.portfolio import iter_product_schedules
+from plm.ratelimit import TokenBucket, parse_retry_after
+from plm.repository import atomic_write_json
+
+ASANA_API_URL = os.environ.get("ASANA_API_URL", "https://app.asana.com/api/1.0")
+DEFAULT_STATE_PATH = "asana_sync_state.json"
+BATCH_LIMIT = 10  # Asana Batch API의 요청당 최대 작업 수
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+TaskUpdate = namedtuple("TaskUpdate", ["gid", "product", "phase", "start_on", "due_on"])
+
+
+def task_gid(code):
+    """Asana Task 코드 → 작업 gid (숫자 ID 또는 작업 URL의 마지막 숫자 경로, 비어있거나 형식이 다르면 None)"""
+    code = str(code or "").strip()
+    if not code:
+        return None
+    if "://" in code:
+        numbers = re.findall(r"/(\d+)(?=/|$)", code.split("?")[0])
+        return numbers[-1] if numbers else None
+    return code if re.fullmatch(r"\d+", code) else None  # Asana gid는 숫자뿐 ("T-12" 같은 코드는 요청 전에 걸러냄)
+
+
+def update_digest(update):
+    """전송 내용 해시 - 이전 동기화 때와 같으면 전송 생략"""
+    return hashlib.sha1(f"{update.start_on}|{update.due_on}".encode("utf-8")).hexdigest()[:16]
+
+
+def collect_task_updates(products, calendars=None):
+    """전체 제품 일정에서 Asana Task 코드가 있는 단계만 골라 전송 목록 생성
+
+    반환: (TaskUpdate 목록, 형식이 잘못된 코드 목록, 중복 gid 목록)
+    같은 gid가 여러 단계에 연결되어 있으면 어느 날짜가 맞는지 알 수 없으므로 전송하지 않고 중복 목록으로 보고
+    """
+    updates = {}
+    sources = {}
+    invalid = []
+    for product_name, _, schedule in iter_product_schedules(products, calendars):
+        for row in schedule:
+            code = row.get("Asana Task 코드", "")
+            gid = task_gid(code)
+            if gid is None:
+                if str(code or "").strip():
+                    invalid.append(f"{product_name} · {row['단계']}: {code}")
+                continue
+            updates[gid] = TaskUpdate(gid, product_name, row["단계"], row["시작일"].isoformat(), row["종료일"].isoformat())
+            sources.setdefault(gid, []).append(f"{product_name} · {row['단계']}")
+    duplicates = [f"{gid}: {', '.join(labels)}" for gid, labels in sources.items() if len(labels) > 1]
+    return [update for gid, update in updates.items() if len(sources[gid]) == 1], invalid, duplicates
+
+
+def load_sync_state(path):
+    """마지막으로 전송에 성공한 작업별 해시 {gid: digest}"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("tasks", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_sync_state(path, state):
+    atomic_write_json(path, {"tasks": state, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+
+class AsanaSyncClient:
+    """Asana 작업 날짜 갱신 클라이언트 - 토큰 버킷 + 동시 요청 수 제한 + Batch API"""
+
+    def __init__(self, token, base_url=ASANA_API_URL, rate=2.5, burst=5, concurrency=4,
+                 batch_size=BATCH_LIMIT, max_retries=5, timeout=30, bucket=None):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.bucket = bucket or TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.batch_size = max(1, min(batch_size, BATCH_LIMIT))
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stats = {"requests": 0, "retries": 0}
+
+    def _request(self, method, path, payload):
+        """동기 HTTP 요청 (asyncio.to_thread로 실행) - (상태 코드, 헤더, 본문)"""
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode("utf-8"),
+            method=method,
+            headers={
+                "Authorization": f"Bearer {self.token}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, dict(response.headers), json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            try:
+                body = json.loads(e.read() or b"{}")
+            except ValueError:
+                body = {}
+            return e.code, dict(e.headers or {}), body
+        except (urllib.error.URLError, OSError) as e:
+            return 0, {}, {"errors": [{"message": str(e)}]}
+
+    async def _acquire(self, cost):
+        """토큰 cost개 확보 - 버킷 용량보다 크면 용량만큼씩 나눠서 기다림"""
+        while cost > 0:
+            tokens = min(cost, self.bucket.capacity)
+            await self.bucket.acquire_async(tokens)
+            cost -= tokens
+
+    async def _call(self, method, path, payload, cost=1):
+        """속도 제한을 지키며 요청, 429/5xx/연결 오류는 지수 백오프로 재시도
+
+        cost: 요청 1번이 소모하는 토큰 수 - Asana는 Batch API의 작업마다 한 번씩 속도 제한에 셈
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(cost)
+            self.stats["requests"] += 1
+            status, headers, body = await asyncio.to_thread(self._request, method, path, payload)
+            if status not in RETRY_STATUSES and status != 0:
+                return status, body
+            if attempt == self.max_retries:
+                break
+            self.stats["retries"] += 1
+            retry_after = parse_retry_after(headers.get("Retry-After")) if status == 429 else None
+            if retry_after:
+                # 서버가 알려준 시간만큼 모든 요청이 함께 쉬도록 버킷에 반영
+                self.bucket.penalize(retry_after)
+            else:
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2))
+        return status, body
+
+    @staticmethod
+    def _error_message(status, body):
+        errors = body.get("errors") if isinstance(body, dict) else None
+        message = errors[0].get("message") if errors else ""
+        return f"HTTP {status}: {message}" if status else message or "연결 오류"
+
+    async def _send_batch(self, batch):
+        """작업 묶음 1개 전송 - [(TaskUpdate, 오류 메시지 또는 None)]"""
+        if len(batch) == 1:
+            update = batch[0]
+            status, body = await self._call(
+                "PUT", f"/tasks/{update.gid}", {"data": {"start_on": update.start_on, "due_on": update.due_on}}
+            )
+            return [(update, None if status == 200 else self._error_message(status, body))]
+
+        actions = [{
+            "relative_path": f"/tasks/{update.gid}",
+            "method": "put",
+            "data": {"start_on": update.start_on, "due_on": update.due_on},
+        } for update in batch]
+        status, body = await self._call("POST", "/batch", {"data": {"actions": actions}}, cost=len(actions))
+        if status != 200:
+            message = self._error_message(status, body)
+            return [(update, message) for update in batch]
+        results = []
+        for update, result in zip(batch, body.get("data", [])):
+            code = result.get("status_code", 0)
+            results.append((update, None if code == 200 else self._error_message(code, result.get("body", {}))))
+        return results
+
+    async def push(self, updates, on_progress=None):
+        """전송 목록을 batch_size개씩 묶어 최대 concurrency개 동시 전송"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [updates[i:i + self.batch_size] for i in range(0, len(updates), self.batch_size)]
+        done = [0]
+
+        async def run(batch):
+            async with semaphore:
+                results = await self._send_batch(batch)
+            done[0] += len(batch)
+            if on_progress:
+                on_progress(done[0], len(updates))
+            return results
+
+        batch_results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [result for results in batch_results for result in results]
+
+
+def sync_task_dates(products, token, state_path=DEFAULT_STATE_PATH, force=False, on_progress=None,
+                    client=None, calendars=None, **client_options):
+    """전체 제품의 단계별 날짜를 Asana에 동기화하고 결과 요약 반환 (이전과 같은 작업은 생략)"""
+    started = time.perf_counter()
+    updates, invalid, duplicates = collect_task_updates(products, calendars)
+    state = load_sync_state(state_path) if state_path else {}
+    pending = [update for update in updates if force or state.get(update.gid) != update_digest(update)]
+
+    client = client or AsanaSyncClient(token, **client_options)
+    results = asyncio.run(client.push(pending, on_progress)) if pending else []
+
+    errors = []
+    for update, error in results:
+        if error is None:
+            state[update.gid] = update_digest(update)
+        else:
+            errors.append(f"{update.product} · {update.phase} ({update.gid}): {error}")
+    if state_path and results:
+        save_sync_state(state_path, state)
+
+    return {
+        "total": len(updates),
+        "sent": len(results) - len(errors),
+        "skipped": len(updates) - len(pending),
+        "failed": len(errors),
+        "invalid": invalid,
+        "duplicates": duplicates,
+        "errors": errors,
+        "requests": client.stats["requests"],
+        "retries": client.stats["retries"],
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
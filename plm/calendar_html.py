@@ -0,0 +1,202 @@
+# plm/calendar_html.py - 월별 캘린더 HTML 생성 (월 단위 조각 + 화면 단위 렌더링)
+
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# 단계별 캘린더 색상
+PHASE_COLORS = {
+    "사전 시장조사": "#E3F2FD",
+    "부자재 사양확정 및 샘플링": "#F3E5F5",
+    "CT 및 사전 품질 확보": "#E8F5E8",
+    "부자재 발주~입고": "#FFF3E0",
+    "완제품 발주~생산": "#FCE4EC",
+    "품질 초도 검사~입고": "#E0F2F1"
+}
+
+
+WEEKDAY_LABELS = ['월', '화', '수', '목', '금', '토', '일']
+MONTHS_PER_PAGE = 3  # 한 화면(가로 한 줄)에 표시하는 월 수
+
+
+def phase_intervals(df):
+    """일정표 → (단계명 배열, 시작일 배열, 종료일 배열) - 날짜는 datetime64[D], 날짜가 빈 행은 제외"""
+    if df is None or df.empty:
+        empty = np.array([], dtype="datetime64[D]")
+        return np.array([], dtype=object), empty, empty
+    starts = pd.to_datetime(df["시작일"]).to_numpy().astype("datetime64[D]")
+    ends = pd.to_datetime(df["종료일"]).to_numpy().astype("datetime64[D]")
+    valid = ~(np.isnat(starts) | np.isnat(ends))
+    return df["단계"].to_numpy(dtype=object)[valid], starts[valid], ends[valid]
+
+
+def calendar_months(df, intervals=None):
+    """일정표의 단계 기간이 걸친 월 목록 (pd.Period, 오름차순) - 날짜를 펼치지 않고 기간 양 끝 월의 차분 배열로 계산"""
+    _, starts, ends = intervals or phase_intervals(df)
+    valid = ends >= starts
+    if not valid.any():
+        return []
+    first = starts[valid].astype("datetime64[M]").astype(np.int64)
+    last = ends[valid].astype("datetime64[M]").astype(np.int64)
+    base = int(first.min())
+    coverage = np.zeros(int(last.max()) - base + 2, dtype=np.int64)
+    np.add.at(coverage, first - base, 1)
+    np.add.at(coverage, last - base + 1, -1)
+    covered = np.flatnonzero(np.cumsum(coverage)[:-1] > 0) + base
+    return [pd.Period(month, freq="M") for month in covered.astype("datetime64[M]")]
+
+
+def month_day_phases(df, month, intervals=None):
+    """month 안의 날짜 → 그 날 진행 중인 첫 단계명 (일정표 행 순서 기준 - 겹치면 앞 단계)"""
+    phases, starts, ends = intervals or phase_intervals(df)
+    month_first = np.datetime64(month.start_time.date(), "D")
+    month_last = np.datetime64(month.end_time.date(), "D")
+    overlapping = np.flatnonzero((starts <= month_last) & (ends >= month_first))
+    day_phases = {}
+    for i in overlapping:
+        lo = max(starts[i], month_first).astype(object)
+        hi = min(ends[i], month_last).astype(object)
+        for offset in range((hi - lo).days + 1):
+            day_phases.setdefault(lo + timedelta(days=offset), phases[i])
+    return day_phases
+
+
+def _grid_span(day_phases):
+    """월 캘린더에 표시할 첫 주 월요일 ~ 마지막 주 일요일 (단계가 있는 첫날/마지막 날 기준)"""
+    month_start = min(day_phases)
+    month_end = max(day_phases)
+    return month_start - timedelta(days=month_start.weekday()), month_end + timedelta(days=6 - month_end.weekday())
+
+
+def render_month_html(month, day_phases, phase_colors, excluded_days):
+    """월 1개의 캘린더 HTML 조각 (day_phases: month_day_phases 결과)"""
+    html_parts = [f'''
+                <div style="border: 2px solid #e0e0e0; border-radius: 8px; padding: 15px; background: #fafafa; flex: 1; min-width: 200px;">
+                    <h4 style="margin: 0 0 15px 0; text-align: center; color: #333;">{month.strftime('%Y년 %m월')}</h4>
+                ''']
+    
+    # 요일 헤더
+    header_html = '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 10px;">'
+    for day in WEEKDAY_LABELS:
+        header_html += f'<div style="text-align: center; font-weight: bold; font-size: 12px; padding: 5px;">{day}</div>'
+    header_html += '</div>'
+    html_parts.append(header_html)
+    
+    # 주별로 캘린더 표시
+    current_date, last_week_end = _grid_span(day_phases)
+    while current_date <= last_week_end:
+        week_html = '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 5px;">'
+        
+        for k in range(7):  # 한 주의 7일
+            check_date = current_date + timedelta(days=k)
+            phase = day_phases.get(check_date)
+            
+            # 날짜 스타일 결정
+            date_style = "text-align: center; padding: 8px; font-size: 12px; border-radius: 4px;"
+            
+            if check_date.weekday() >= 5 or check_date in excluded_days:
+                # 주말 또는 제외일
+                date_style += "color: #ff4444; background: #f8f8f8;"
+            elif phase is not None:
+                # 단계가 있는 날짜
+                color = phase_colors.get(phase, "#E0E0E0")
+                date_style += f"background: {color}; border: 1px solid #ddd;"
+            else:
+                # 일반 날짜
+                date_style += "background: white; border: 1px solid #eee;"
+            week_html += f'<div style="{date_style}">{check_date.day}</div>'
+        
+        week_html += '</div>'
+        html_parts.append(week_html)
+        
+        current_date += timedelta(days=7)
+    
+    html_parts.append('</div>')
+    return ''.join(html_parts)
+
+
+def render_month_row(month_blocks):
+    """월 HTML 조각들을 가로 한 줄로 배치 (항상 MONTHS_PER_PAGE개 컬럼, 모자라면 빈 컬럼)"""
+    html_parts = ['<div style="display: flex; gap: 20px; margin-bottom: 30px;">']
+    html_parts.extend(month_blocks)
+    html_parts.extend(['<div style="flex: 1;"></div>'] * (MONTHS_PER_PAGE - len(month_blocks)))
+    html_parts.append('</div>')
+    return ''.join(html_parts)
+
+
+class MonthHtmlCache:
+    """월별 캘린더 HTML 조각 저장소 - (월, 그 월의 날짜별 단계, 표시 범위의 제외일, 색상)이 같으면 재사용
+
+    제품/세션이 달라도 같은 달의 모양이 같으면 조각을 함께 쓴다 (LRU).
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def render(self, month, day_phases, phase_colors, excluded_days):
+        first, last = _grid_span(day_phases)
+        excluded_in_grid = tuple(
+            day for day in (first + timedelta(days=i) for i in range((last - first).days + 1))
+            if day.weekday() < 5 and day in excluded_days
+        )
+        key = (str(month), tuple(sorted(day_phases.items())), excluded_in_grid, tuple(sorted(phase_colors.items())))
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return html
+            self.stats["misses"] += 1
+        html = render_month_html(month, day_phases, phase_colors, excluded_days)
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def calendar_pages(months, per_page=MONTHS_PER_PAGE):
+    """월 목록을 화면 단위(기본 3개월)로 나눔"""
+    return [months[i:i + per_page] for i in range(0, len(months), per_page)]
+
+
+def default_calendar_page(pages, today):
+    """오늘이 속한 페이지 (일정 밖이면 가장 가까운 쪽 끝 페이지)"""
+    current = pd.Period(today, freq="M")
+    for index, page in enumerate(pages):
+        if page[0] <= current <= page[-1] or current < page[0]:
+            return index
+    return len(pages) - 1
+
+
+def render_calendar_page(df, months, phase_colors, excluded_days, cache=None, intervals=None):
+    """months(한 페이지)만 그린 캘린더 HTML - 다른 월은 날짜를 펼치지도 않음"""
+    intervals = intervals or phase_intervals(df)
+    blocks = []
+    for month in months:
+        day_phases = month_day_phases(df, month, intervals)
+        if not day_phases:
+            continue
+        if cache is not None:
+            blocks.append(cache.render(month, day_phases, phase_colors, excluded_days))
+        else:
+            blocks.append(render_month_html(month, day_phases, phase_colors, excluded_days))
+    return render_month_row(blocks)
+
+
+def render_full_calendar(df, phase_colors, excluded_days, cache=None):
+    """전체 기간 캘린더 HTML (이미지/HTML 내보내기용)"""
+    intervals = phase_intervals(df)
+    return ''.join(
+        render_calendar_page(df, months, phase_colors, excluded_days, cache, intervals)
+        for months in calendar_pages(calendar_months(df, intervals))
+    )
@@ -0,0 +1,202 @@
+# plm/calendars.py - 이름 있는 근무 캘린더 (공급사/공장별 근무 요일·휴일) - 캘린더마다 근무일 인덱스를 한 번만 만들어 재사용
+#
+# 정의 파일(working_calendars.json) 형식:
+#   {"calendars": [
+#       {"name": "중국 공장", "workdays": "월화수목금토", "holidays": ["2026-02-16", "2026-02-17"]},
+#       {"name": "국내 부자재", "workdays": "월화수목금", "holiday_files": ["공휴일_2025_Second_exclude_settings.json"]}
+#   ]}
+#
+# 단계의 '캘린더' 칸에 이름을 적으면 그 단계는 제품 제외일 대신 해당 캘린더의 근무일로 역산한다
+# (비워 두면 기존처럼 월~금 + 제품 제외일).
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from plm.excludes import ExcludeSet
+from plm.holidays import load_exclude_json
+from plm.schedule import WEEKDAYS, BusinessDayIndex
+
+CALENDARS_PATH = "working_calendars.json"
+CALENDAR_YEARS = (2020, 2040)  # 처음 만드는 근무일 인덱스 범위 (벗어나면 넓혀서 다시 만듦)
+WEEKDAY_NAMES = "월화수목금토일"
+
+
+def parse_workdays(spec):
+    """근무 요일 지정 → date.weekday() 튜플 ("월화수목금토", ["월", "토"], [0, 5] 모두 가능, 비어 있으면 월~금)"""
+    if not spec:
+        return WEEKDAYS
+    days = set()
+    for item in spec:
+        if isinstance(item, str):
+            item = item.strip()
+            if not item:
+                continue
+            if len(item) != 1 or item not in WEEKDAY_NAMES:
+                raise ValueError(f"근무 요일 형식이 올바르지 않습니다: {item!r}")
+            item = WEEKDAY_NAMES.index(item)
+        if not isinstance(item, int) or not 0 <= item < 7:
+            raise ValueError(f"근무 요일 형식이 올바르지 않습니다: {item!r}")
+        days.add(item)
+    if not days:
+        raise ValueError("근무 요일이 하루 이상 있어야 합니다")
+    return tuple(sorted(days))
+
+
+class WorkingCalendar:
+    """근무 요일 + 휴일 캘린더 1개
+
+    근무일 인덱스(BusinessDayIndex)는 처음 역산할 때 CALENDAR_YEARS 범위로 한 번 만들고
+    이후 모든 제품/단계가 공유한다 (범위를 벗어난 날짜가 오면 넓혀서 다시 만듦).
+    """
+
+    def __init__(self, name, workdays=WEEKDAYS, holidays=(), years=CALENDAR_YEARS):
+        self.name = name
+        self.workdays = parse_workdays(workdays)
+        self.holidays = holidays if isinstance(holidays, ExcludeSet) else ExcludeSet(holidays)
+        self._range = (date(years[0], 1, 1), date(years[1], 12, 31))
+        self._index = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        labels = "".join(WEEKDAY_NAMES[day] for day in self.workdays)
+        return f"WorkingCalendar({self.name!r}, {labels}, 휴일 {len(self.holidays)}일)"
+
+    @property
+    def signature(self):
+        """정의가 같으면 같은 값 (일정 캐시 키용)"""
+        return (self.name, self.workdays, self.holidays.to_token())
+
+    @property
+    def weekmask(self):
+        """np.busday_count 등의 weekmask 인자 ("1111110" 형식, 월요일부터)"""
+        return "".join("1" if day in self.workdays else "0" for day in range(7))
+
+    def is_workday(self, day):
+        return day.weekday() in self.workdays and day not in self.holidays
+
+    def index_covering(self, end_date, lead_time):
+        """end_date 다음 날까지 포함하고 end_date 이전 근무일이 lead_time개보다 많은 근무일 인덱스"""
+        index = self._index
+        if index is not None and index.end > end_date and index.position(end_date) > lead_time:
+            return index
+        with self._lock:
+            first, last = self._range
+            while True:
+                if self._index is None or self._index.start != first or self._index.end != last:
+                    self._index = BusinessDayIndex(first, last, self.holidays, self.workdays)
+                index = self._index
+                if index.end > end_date and index.position(end_date) > lead_time:
+                    self._range = (first, last)
+                    return index
+                # 모자란 쪽만 넓힘 (앞쪽은 리드타임의 달력일 환산보다 넉넉하게)
+                if index.end <= end_date:
+                    last = end_date + timedelta(days=366)
+                if index.position(end_date) <= lead_time:
+                    first -= timedelta(days=lead_time * 14 // len(self.workdays) + 366)
+                if first.year < 1900:
+                    raise ValueError(f"'{self.name}' 캘린더에서 근무일 {lead_time}일을 역산할 수 없습니다")
+
+    def backward_start(self, end_date, lead_time):
+        """end_date에서 lead_time 근무일을 역산한 시작일 - backward_schedule과 같은 규칙
+
+        리드타임만큼 근무일을 역산한 날(0이면 end_date)의 다음 날이 근무일이면 그 날, 아니면 그 이전의 마지막 근무일.
+        """
+        lead_time = max(int(lead_time), 0)
+        index = self.index_covering(end_date, lead_time)
+        ordinals = index.ordinals
+        cursor = int(ordinals[index.position(end_date) - lead_time]) if lead_time > 0 else end_date.toordinal()
+        return date.fromordinal(int(ordinals[np.searchsorted(ordinals, cursor + 1, side="right") - 1]))
+
+    def backward_starts(self, end_ordinals, lead_times):
+        """backward_start를 종료일 서수 배열에 한 번에 적용 - 시작일 서수 배열 (시나리오/단축 계획용)"""
+        ends = np.asarray(end_ordinals, dtype=np.int64)
+        leads = np.maximum(np.broadcast_to(np.asarray(lead_times, dtype=np.int64), ends.shape), 0)
+        if not ends.size:
+            return ends.copy()
+        # 가장 늦은 종료일까지 포함하도록 넓힌 뒤, 가장 이른 종료일에서 가장 긴 리드타임을 역산할 수 있게 앞쪽을 넓힘
+        self.index_covering(date.fromordinal(int(ends.max())), 0)
+        index = self.index_covering(date.fromordinal(int(ends.min())), int(leads.max()))
+        return index.backward_starts(ends, leads)
+
+    def to_json(self):
+        return {
+            "name": self.name,
+            "workdays": "".join(WEEKDAY_NAMES[day] for day in self.workdays),
+            "holidays": [day.isoformat() for day in self.holidays],
+        }
+
+    @classmethod
+    def from_json(cls, data, base_dir="."):
+        """정의 1개 → WorkingCalendar (holiday_files는 *_exclude_settings.json 형식, base_dir 기준 경로)"""
+        name = str(data.get("name") or "").strip()
+        if not name:
+            raise ValueError("캘린더 이름이 없습니다")
+        holidays = ExcludeSet(datetime.fromisoformat(day).date() for day in data.get("holidays", []))
+        for path in data.get("holiday_files", []):
+            holidays.update(load_exclude_json(os.path.join(base_dir, path)))
+        return cls(name, data.get("workdays"), holidays)
+
+
+class CalendarRegistry(Mapping):
+    """이름 → WorkingCalendar (backward_schedule의 calendars 인자로 그대로 전달)"""
+
+    def __init__(self, calendars=()):
+        self._calendars = {}
+        for calendar in calendars:
+            if calendar.name in self._calendars:
+                raise ValueError(f"캘린더 이름이 중복되었습니다: {calendar.name}")
+            self._calendars[calendar.name] = calendar
+
+    def __getitem__(self, name):
+        return self._calendars[name]
+
+    def __iter__(self):
+        return iter(self._calendars)
+
+    def __len__(self):
+        return len(self._calendars)
+
+    def __repr__(self):
+        return f"CalendarRegistry({list(self._calendars)})"
+
+    @property
+    def signature(self):
+        return tuple(calendar.signature for calendar in self._calendars.values())
+
+    def unknown(self, phases):
+        """단계 목록에서 등록되지 않은 캘린더 이름 (빈 칸 제외, 처음 나온 순서)"""
+        names = []
+        for phase in phases:
+            name = str(phase.get("캘린더") or "").strip()
+            if name and name not in self._calendars and name not in names:
+                names.append(name)
+        return names
+
+    def to_json(self):
+        return {"calendars": [calendar.to_json() for calendar in self._calendars.values()]}
+
+    @classmethod
+    def from_json(cls, data, base_dir="."):
+        return cls(WorkingCalendar.from_json(item, base_dir) for item in data.get("calendars", []))
+
+
+def phase_calendars(phases, calendars=None):
+    """단계별 WorkingCalendar 목록 - 캘린더가 없거나 등록되지 않은 단계는 None (backward_schedule과 같은 규칙)"""
+    return [calendars.get(phase.get("캘린더") or "") if calendars else None for phase in phases]
+
+
+def load_calendars(path=CALENDARS_PATH):
+    """정의 파일 읽기 (파일이 없으면 빈 목록) - 형식 오류는 ValueError"""
+    if not path or not os.path.exists(path):
+        return CalendarRegistry()
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"캘린더 정의 파일 형식이 올바르지 않습니다: {path} ({e})") from None
+    return CalendarRegistry.from_json(data, os.path.dirname(os.path.abspath(path)))
@@ -0,0 +1,244 @@
+# plm/cli.py - 제품 JSON 디렉터리 일괄 일정 계산 (Streamlit/Selenium 없이 실행)
+#
+# 사용 예:
+#   python -m plm schedule ./products --output ./schedule_output
+#   python -m plm schedule ./products --targets targets.csv --format jsonl --workers 8
+#   python -m plm schedule ./products --target-date 2026-03-31 --holidays 공휴일_2025_Second_exclude_settings.json --html
+#   python -m plm schedule ./products --calendars working_calendars.json
+#   python -m plm serve --products ./products --port 8765
+#   python -m plm asana-sync ./products --token $ASANA_ACCESS_TOKEN
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+
+from plm.calendars import CALENDARS_PATH, load_calendars
+from plm.repository import PRODUCT_FILE_SUFFIX, normalize_phase_record, read_product_file
+from plm.schedule import backward_schedule
+
+OUTPUT_COLUMNS = ["단계", "시작일", "종료일", "담당자", "Asana Task 코드"]
+SUMMARY_COLUMNS = ["제품", "파일", "목표완료일", "단계 수", "최초 시작일", "오류"]
+
+
+def _parse_date(text):
+    return datetime.fromisoformat(text).date()
+
+
+def load_targets(path):
+    """제품별 목표완료일 파일 읽기 - JSON {제품명: 날짜} 또는 CSV(제품, 목표완료일)"""
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return {name: _parse_date(value) for name, value in json.load(f).items()}
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return {row["제품"]: _parse_date(row["목표완료일"]) for row in csv.DictReader(f) if row.get("제품")}
+
+
+def load_extra_holidays(paths):
+    """공통 제외일 JSON(exclude_dates) 파일들의 날짜 서수 목록"""
+    ordinals = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            ordinals.update(_parse_date(d).toordinal() for d in json.load(f).get("exclude_dates", []))
+    return sorted(ordinals)
+
+
+@lru_cache(maxsize=None)
+def _calendars(path):
+    """근무 캘린더 정의 (워커 프로세스마다 한 번만 읽어 근무일 인덱스를 공유)"""
+    return load_calendars(path)
+
+
+def find_product_files(directory):
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(PRODUCT_FILE_SUFFIX)
+    )
+
+
+def schedule_product_file(path, target_date=None, extra_holidays=(), with_html=False, calendars_path=None,
+                          targets=None):
+    """제품 파일 1개의 일정 계산 (워커 프로세스에서 실행, 결과는 직렬화하기 쉬운 dict)
+
+    목표완료일 우선순위: targets[파일 안의 제품명] > target_date(--target-date) > 파일에 저장된 목표일
+    """
+    result = {"파일": os.path.basename(path), "제품": None, "목표완료일": None, "일정": [], "html": None, "오류": ""}
+    try:
+        data = read_product_file(path)
+        result["제품"] = data.get("product_name") or os.path.basename(path)[:-len(PRODUCT_FILE_SUFFIX)]
+        if targets and result["제품"] in targets:
+            target_date = targets[result["제품"]]
+        if target_date is None and data.get("target_date"):
+            target_date = _parse_date(data["target_date"])
+        if target_date is None:
+            result["오류"] = "목표완료일 없음"
+            return result
+        result["목표완료일"] = target_date.isoformat()
+
+        excluded = {_parse_date(d) for d in data.get("custom_excludes", [])}
+        excluded.update(date.fromordinal(ordinal) for ordinal in extra_holidays)
+        phases = [normalize_phase_record(phase) for phase in data.get("phases", [])]
+        schedule = backward_schedule(target_date, phases, excluded, _calendars(calendars_path))
+        result["일정"] = [
+            {**row, "시작일": row["시작일"].isoformat(), "종료일": row["종료일"].isoformat()}
+            for row in schedule
+        ]
+
+        if with_html and schedule:
+            # 캘린더 HTML은 요청 시에만 pandas를 불러옴
+            import pandas as pd
+            from plm.calendar_html import PHASE_COLORS, render_full_calendar
+
+            result["html"] = render_full_calendar(pd.DataFrame(schedule), PHASE_COLORS, excluded)
+    except Exception as e:  # 한 제품의 오류가 전체 배치를 멈추지 않도록 기록만 함
+        result["오류"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _schedule_task(task):
+    return schedule_product_file(*task)
+
+
+def run_batch(tasks, workers):
+    """작업 목록을 워커 프로세스에 나눠 실행 (workers <= 1이면 현재 프로세스에서 실행)"""
+    if workers <= 1 or len(tasks) <= 1:
+        return [_schedule_task(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_schedule_task, tasks, chunksize=chunksize))
+
+
+def _output_name(result):
+    return result["파일"][:-len(PRODUCT_FILE_SUFFIX)]
+
+
+def write_results(results, output_dir, fmt):
+    """결과 기록 - csv: 제품별 CSV + _요약.csv, jsonl: schedules.jsonl 한 파일"""
+    os.makedirs(output_dir, exist_ok=True)
+    if fmt == "jsonl":
+        with open(os.path.join(output_dir, "schedules.jsonl"), "w", encoding="utf-8") as f:
+            for result in results:
+                record = {key: value for key, value in result.items() if key != "html"}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        for result in results:
+            if not result["일정"]:
+                continue
+            path = os.path.join(output_dir, f"{_output_name(result)}_개발일정표.csv")
+            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(result["일정"])
+
+    with open(os.path.join(output_dir, "_요약.csv"), "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)
+        for result in results:
+            schedule = result["일정"]
+            writer.writerow([
+                result["제품"], result["파일"], result["목표완료일"] or "", len(schedule),
+                min((row["시작일"] for row in schedule), default=""), result["오류"],
+            ])
+
+    for result in results:
+        if result["html"]:
+            path = os.path.join(output_dir, f"{_output_name(result)}_캘린더.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f'<html><head><meta charset="utf-8"></head><body>{result["html"]}</body></html>')
+
+
+def asana_sync_command(args):
+    from plm.asana_sync import sync_task_dates
+    from plm.repository import ProductRepository
+
+    if not args.token:
+        print("Asana 토큰이 필요합니다 (--token 또는 ASANA_ACCESS_TOKEN)", file=sys.stderr)
+        return 2
+    repository = ProductRepository(args.directory)
+    products = {name: repository.load(name) for name in repository.names()}
+    client_options = {"rate": args.rate, "concurrency": args.concurrency, "batch_size": args.batch_size}
+    if args.base_url:
+        client_options["base_url"] = args.base_url
+    report = sync_task_dates(products, args.token, state_path=args.state, force=args.force,
+                             calendars=load_calendars(args.calendars), **client_options)
+    print(json.dumps({key: value for key, value in report.items() if key != "errors"}, ensure_ascii=False, indent=2))
+    for error in report["errors"]:
+        print(f"  ❌ {error}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plm", description="이퀄베리 PLM 일정 일괄 계산")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    schedule_cmd = commands.add_parser("schedule", help="제품 JSON 디렉터리의 모든 제품 일정 역산")
+    schedule_cmd.add_argument("directory", help="*_product_data.json 파일이 있는 디렉터리")
+    schedule_cmd.add_argument("--output", default="schedule_output", help="결과 디렉터리")
+    schedule_cmd.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    schedule_cmd.add_argument("--target-date", type=_parse_date, help="모든 제품에 적용할 목표완료일")
+    schedule_cmd.add_argument("--targets", help="제품별 목표완료일 파일 (JSON 또는 CSV: 제품,목표완료일)")
+    schedule_cmd.add_argument("--holidays", action="append", default=[], help="모든 제품에 추가할 제외일 JSON")
+    schedule_cmd.add_argument("--html", action="store_true", help="제품별 캘린더 HTML도 생성")
+    schedule_cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    schedule_cmd.add_argument("--calendars", default=CALENDARS_PATH, help="단계별 근무 캘린더 정의 JSON (없으면 무시)")
+
+    serve_cmd = commands.add_parser("serve", help="로컬 HTTP 일정 계산 API 실행 (plm.api)")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+    serve_cmd.add_argument("--products", help="제품 JSON 디렉터리 (제품명/Task 코드 조회용)")
+    serve_cmd.add_argument("--cache-size", type=int, default=1024, help="응답 캐시 항목 수")
+    serve_cmd.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    serve_cmd.add_argument("--calendars", default=CALENDARS_PATH, help="단계별 근무 캘린더 정의 JSON (없으면 무시)")
+
+    sync_cmd = commands.add_parser("asana-sync", help="제품 JSON 디렉터리의 단계별 날짜를 Asana 작업에 동기화")
+    sync_cmd.add_argument("directory", help="*_product_data.json 파일이 있는 디렉터리")
+    sync_cmd.add_argument("--token", default=os.environ.get("ASANA_ACCESS_TOKEN", ""), help="Asana 개인 액세스 토큰")
+    sync_cmd.add_argument("--base-url", help="Asana API 주소 (가짜 서버 테스트용)")
+    sync_cmd.add_argument("--state", default="asana_sync_state.json", help="전송 해시 저장 파일")
+    sync_cmd.add_argument("--force", action="store_true", help="변경 없는 작업도 다시 전송")
+    sync_cmd.add_argument("--rate", type=float, default=2.5, help="초당 요청 수")
+    sync_cmd.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    sync_cmd.add_argument("--batch-size", type=int, default=10, help="Batch API 요청당 작업 수 (1이면 개별 요청)")
+    sync_cmd.add_argument("--calendars", default=CALENDARS_PATH, help="단계별 근무 캘린더 정의 JSON (없으면 무시)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from plm.api import serve
+        return serve(args.host, args.port, args.products, args.cache_size, args.verbose, args.calendars)
+    if args.command == "asana-sync":
+        return asana_sync_command(args)
+
+    started = time.perf_counter()
+
+    files = find_product_files(args.directory)
+    targets = load_targets(args.targets) if args.targets else {}
+    extra_holidays = load_extra_holidays(args.holidays)
+
+    # 제품명은 파일명에서 복원할 수 없어(공백/'_', 충돌 시 해시 접미사) 워커가 파일 안의 제품명으로 찾음
+    tasks = [(path, args.target_date, extra_holidays, args.html, args.calendars, targets) for path in files]
+
+    results = run_batch(tasks, args.workers)
+    write_results(results, args.output, args.format)
+
+    unmatched = sorted(set(targets) - {result["제품"] for result in results})
+    if unmatched:
+        print(f"⚠️ 목표완료일 파일에서 일치하는 제품이 없는 이름: {', '.join(unmatched)}", file=sys.stderr)
+
+    failed = [result for result in results if result["오류"]]
+    print(
+        f"제품 {len(results)}개 처리 (오류 {len(failed)}개) - "
+        f"{time.perf_counter() - started:.2f}초, 결과: {os.path.abspath(args.output)}"
+    )
+    for result in failed:
+        print(f"  ❌ {result['파일']}: {result['오류']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# plm/drift.py - 저장된(Sheets) 일정과 현재 데이터로 다시 계산한 일정의 차이 검출
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from plm.excludes import as_exclude_set
+from plm.schedule import backward_schedule
+from plm.state import ProductState
+
+DRIFT_COLUMNS = [
+    "제품", "순번", "단계", "상태", "원인",
+    "저장 시작일", "시작일", "시작일 차이(일)", "저장 종료일", "종료일", "종료일 차이(일)",
+]
+STATUS_SAME = "일치"
+STATUS_MOVED = "날짜 변경"
+STATUS_RENAMED = "단계 변경"
+STATUS_ADDED = "단계 추가"
+STATUS_REMOVED = "단계 삭제"
+
+
+def _schedule_frame(product_name, schedule, lead_times, calendar_names=()):
+    """일정 목록 → 제품/순번 열을 붙인 DataFrame (날짜는 datetime64, 단계별 리드타임/캘린더 포함)"""
+    calendar_names = list(calendar_names)[:len(schedule)]
+    frame = pd.DataFrame({
+        "제품": product_name,
+        "순번": np.arange(len(schedule), dtype=np.int64),
+        "단계": [row.get("단계", "") for row in schedule],
+        "시작일": pd.to_datetime([row.get("시작일") for row in schedule]),
+        "종료일": pd.to_datetime([row.get("종료일") for row in schedule]),
+        "리드타임": np.asarray(list(lead_times) + [-1] * (len(schedule) - len(lead_times)), dtype=np.int64)[:len(schedule)],
+        "캘린더": calendar_names + [""] * (len(schedule) - len(calendar_names)),
+    })
+    return frame
+
+
+class DriftDetector:
+    """제품별 저장 일정과 재계산 일정을 한 번의 merge로 비교
+
+    재계산 일정은 제품 상태 해시(digest)별로, 비교 결과는 (저장본, 상태) 조합별로 기억하므로
+    바뀌지 않은 제품은 다시 계산하지 않고, 저장본도 set_stored()/mark_saved()로 받은 것만 쓴다.
+    calendars(단계별 근무 캘린더)를 바꾸면 재계산 일정과 비교 결과를 모두 버린다.
+    """
+
+    def __init__(self, calendars=None):
+        self.calendars = calendars
+        self._stored = {}   # 제품명 → (저장본 키, DataFrame, 목표일, 제외일 코드)
+        self._fresh = {}    # 제품명 → (digest, DataFrame)
+        self._report = (None, None)
+        self._loads = itertools.count(1)
+
+    # ✅ 저장본 등록
+    def set_stored(self, product_name, loaded_data, revision=None):
+        """Sheets에서 읽은 제품 데이터(parse_product_values 결과)의 '단계별 시작/종료일' 섹션을 저장본으로 등록"""
+        schedule_df = loaded_data.get("schedule")
+        schedule = [] if schedule_df is None or schedule_df.empty else schedule_df.to_dict(orient="records")
+        phases_df = loaded_data.get("phases")
+        leads = [] if phases_df is None or phases_df.empty else [int(lead) for lead in phases_df["리드타임"]]
+        calendar_names = [] if phases_df is None or "캘린더" not in phases_df else phases_df["캘린더"].fillna("").tolist()
+        self._stored[product_name] = (
+            ("sheets", revision, next(self._loads)),
+            _schedule_frame(product_name, schedule, leads, calendar_names),
+            loaded_data.get("target_date"),
+            as_exclude_set(loaded_data.get("custom_excludes")).to_token(),
+        )
+
+    def mark_saved(self, product_name, product_state):
+        """방금 저장한 상태를 저장본으로 등록 (저장한 일정 = 그 상태의 계산 결과이므로 다시 읽지 않음)"""
+        product_state = ProductState.from_product(product_state)
+        self._stored[product_name] = (
+            ("state", product_state.digest()),
+            self._fresh_frame(product_name, product_state),
+            product_state.target_date,
+            product_state.custom_excludes.to_token(),
+        )
+
+    def set_calendars(self, calendars):
+        """근무 캘린더 교체 (정의가 같으면 그대로 유지)"""
+        if getattr(calendars, "signature", calendars) == getattr(self.calendars, "signature", self.calendars):
+            return
+        self.calendars = calendars
+        self._fresh.clear()
+        self._report = (None, None)
+
+    def forget(self, product_name):
+        self._stored.pop(product_name, None)
+        self._fresh.pop(product_name, None)
+
+    def stored_names(self):
+        return list(self._stored)
+
+    # ✅ 비교
+    def _fresh_frame(self, product_name, product_state):
+        digest = product_state.digest()
+        cached = self._fresh.get(product_name)
+        if cached and cached[0] == digest:
+            return cached[1]
+        schedule = backward_schedule(
+            product_state.target_date, product_state.phase_dicts(), product_state.custom_excludes, self.calendars
+        ) if product_state.phases and product_state.target_date else []
+        frame = _schedule_frame(
+            product_name, schedule,
+            [record.lead_time for record in product_state.phases], [record.calendar for record in product_state.phases],
+        )
+        self._fresh[product_name] = (digest, frame)
+        return frame
+
+    def report(self, products):
+        """저장본이 있는 제품 전체의 단계별 비교표 (DRIFT_COLUMNS)
+
+        상태: 일치 / 날짜 변경 / 단계 변경(이름이 다름) / 단계 추가 / 단계 삭제
+        원인(날짜 변경 행): 목표일, 제외일, 리드타임/캘린더(해당 단계), 이후 단계(리드타임/캘린더 변경, 추가/삭제)
+        """
+        names = [name for name in self._stored if name in products]
+        states = {name: ProductState.from_product(products[name]) for name in names}
+        key = tuple((name, self._stored[name][0], states[name].digest()) for name in names)
+        if self._report[0] == key:
+            return self._report[1]
+
+        if not names:
+            report = pd.DataFrame(columns=DRIFT_COLUMNS)
+            self._report = (key, report)
+            return report
+
+        fresh = pd.concat([self._fresh_frame(name, states[name]) for name in names], ignore_index=True)
+        stored = pd.concat([self._stored[name][1] for name in names], ignore_index=True)
+        merged = fresh.merge(stored, on=["제품", "순번"], how="outer", suffixes=("", " 저장"), indicator=True)
+        merged = merged.sort_values(["제품", "순번"], kind="stable").reset_index(drop=True)
+
+        both = merged["_merge"] == "both"
+        renamed = both & (merged["단계"] != merged["단계 저장"])
+        moved = both & ~renamed & (
+            (merged["시작일"] != merged["시작일 저장"]) | (merged["종료일"] != merged["종료일 저장"])
+        )
+        merged["상태"] = np.select(
+            [merged["_merge"] == "left_only", merged["_merge"] == "right_only", renamed, moved],
+            [STATUS_ADDED, STATUS_REMOVED, STATUS_RENAMED, STATUS_MOVED],
+            STATUS_SAME,
+        )
+
+        # 원인 - 역산이므로 i번째 단계 날짜는 i번째 이후 단계의 리드타임/추가/삭제에 영향을 받음
+        product_info = pd.DataFrame({
+            "제품": names,
+            "목표일 변경": [self._stored[name][2] != states[name].target_date for name in names],
+            "제외일 변경": [self._stored[name][3] != states[name].custom_excludes.to_token() for name in names],
+        })
+        merged = merged.merge(product_info, on="제품", how="left")
+        lead_changed = both & (merged["리드타임"] != merged["리드타임 저장"])
+        calendar_changed = both & (merged["캘린더"] != merged["캘린더 저장"])
+        phase_changed = (lead_changed | calendar_changed | ~both).astype(np.int64)
+        later_changed = (
+            phase_changed[::-1].groupby(merged["제품"][::-1]).cumsum()[::-1] - phase_changed
+        ) > 0
+        causes = [
+            (merged["목표일 변경"], "목표일"),
+            (merged["제외일 변경"], "제외일"),
+            (lead_changed, "리드타임"),
+            (calendar_changed, "캘린더"),
+            (later_changed, "이후 단계"),
+        ]
+        cause = pd.Series("", index=merged.index)
+        for flag, label in causes:
+            cause = cause.where(~flag.astype(bool), cause + np.where(cause == "", "", ", ") + label)
+        merged["원인"] = cause.where(merged["상태"] == STATUS_MOVED, "")
+
+        merged["단계"] = merged["단계"].fillna(merged["단계 저장"])
+        merged["저장 시작일"] = merged["시작일 저장"]
+        merged["저장 종료일"] = merged["종료일 저장"]
+        merged["시작일 차이(일)"] = (merged["시작일"] - merged["시작일 저장"]).dt.days
+        merged["종료일 차이(일)"] = (merged["종료일"] - merged["종료일 저장"]).dt.days
+        report = merged[DRIFT_COLUMNS]
+        self._report = (key, report)
+        return report
+
+
+def drift_summary(report):
+    """제품별 상태 개수 (일치가 아닌 행이 있는 제품만)"""
+    changed = report[report["상태"] != STATUS_SAME]
+    if changed.empty:
+        return pd.DataFrame(columns=["제품"])
+    return changed.pivot_table(index="제품", columns="상태", values="순번", aggfunc="count", fill_value=0).reset_index()
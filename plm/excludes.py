@@ -0,0 +1,196 @@
+# plm/excludes.py - 일 서수(ordinal) 인덱스 비트맵 기반 제외일 집합
+
+import base64
+import zlib
+from datetime import date
+
+import numpy as np
+
+TOKEN_PREFIX = "x1:"
+
+
+class ExcludeSet:
+    """제외일 집합 - set[date]와 같은 방식으로 쓸 수 있고 내부는 numpy bool 배열
+
+    _bits[i]가 True이면 date.fromordinal(_base + i)가 제외일. 메모리/직렬화 크기는
+    날짜 개수가 아니라 첫 제외일~마지막 제외일 사이 일수에 비례한다.
+    """
+
+    __slots__ = ("_base", "_bits")
+    __hash__ = None
+
+    def __init__(self, dates=()):
+        self._base = 0
+        self._bits = np.zeros(0, dtype=bool)
+        self.update(dates)
+
+    # ✅ 생성
+    @classmethod
+    def from_mask(cls, start, mask):
+        """start 날짜부터 시작하는 bool 배열로 생성 (앞뒤 빈 구간은 잘라냄)"""
+        result = cls()
+        mask = np.asarray(mask, dtype=bool)
+        nonzero = np.flatnonzero(mask)
+        if len(nonzero):
+            result._base = start.toordinal() + int(nonzero[0])
+            result._bits = mask[nonzero[0]:nonzero[-1] + 1].copy()
+        return result
+
+    @classmethod
+    def from_ordinals(cls, ordinals):
+        result = cls()
+        result._set_ordinals(np.asarray(ordinals, dtype=np.int64), True)
+        return result
+
+    @classmethod
+    def from_token(cls, token):
+        """to_token()으로 만든 문자열에서 복원 (빈 문자열은 빈 집합)"""
+        if not token:
+            return cls()
+        if not token.startswith(TOKEN_PREFIX):
+            raise ValueError(f"제외일 코드 형식이 아닙니다: {token[:20]}")
+        base_text, _, payload = token[len(TOKEN_PREFIX):].partition(":")
+        base_ordinal, _, size_text = base_text.partition("+")
+        packed = np.frombuffer(zlib.decompress(base64.urlsafe_b64decode(payload)), dtype=np.uint8)
+        bits = np.unpackbits(packed, count=int(size_text), bitorder="little").astype(bool)
+        return cls.from_mask(date.fromordinal(int(base_ordinal)), bits)
+
+    # ✅ 내부 연산
+    def _ensure(self, lo, hi):
+        """서수 lo~hi를 담을 수 있도록 배열 확장"""
+        if not len(self._bits):
+            self._base = lo
+            self._bits = np.zeros(hi - lo + 1, dtype=bool)
+            return
+        new_base = min(self._base, lo)
+        new_end = max(self._base + len(self._bits) - 1, hi)
+        if new_base == self._base and new_end == self._base + len(self._bits) - 1:
+            return
+        bits = np.zeros(new_end - new_base + 1, dtype=bool)
+        bits[self._base - new_base:self._base - new_base + len(self._bits)] = self._bits
+        self._base, self._bits = new_base, bits
+
+    def _set_ordinals(self, ordinals, value):
+        if not len(ordinals):
+            return
+        if value:
+            self._ensure(int(ordinals.min()), int(ordinals.max()))
+        else:
+            ordinals = ordinals[(ordinals >= self._base) & (ordinals < self._base + len(self._bits))]
+        self._bits[ordinals - self._base] = value
+
+    # ✅ set 호환 인터페이스
+    def __contains__(self, day):
+        try:
+            index = day.toordinal() - self._base
+        except AttributeError:
+            return False
+        return 0 <= index < len(self._bits) and bool(self._bits[index])
+
+    def __len__(self):
+        return int(np.count_nonzero(self._bits))
+
+    def __bool__(self):
+        return bool(self._bits.any())
+
+    def __iter__(self):
+        """제외일을 날짜순으로 반환"""
+        for ordinal in self.ordinals().tolist():
+            yield date.fromordinal(ordinal)
+
+    def __eq__(self, other):
+        if isinstance(other, ExcludeSet):
+            return np.array_equal(self.ordinals(), other.ordinals())
+        if isinstance(other, (set, frozenset)):
+            return set(self) == other
+        return NotImplemented
+
+    def __or__(self, other):
+        result = self.copy()
+        result.update(other)
+        return result
+
+    __ror__ = __or__
+
+    def __repr__(self):
+        return f"ExcludeSet({len(self)}개, {self.to_token()!r})"
+
+    def add(self, day):
+        ordinal = day.toordinal()
+        self._ensure(ordinal, ordinal)
+        self._bits[ordinal - self._base] = True
+
+    def discard(self, day):
+        index = day.toordinal() - self._base
+        if 0 <= index < len(self._bits):
+            self._bits[index] = False
+
+    def remove(self, day):
+        if day not in self:
+            raise KeyError(day)
+        self.discard(day)
+
+    def update(self, *others):
+        for other in others:
+            if isinstance(other, ExcludeSet):
+                if len(other._bits):
+                    self._ensure(other._base, other._base + len(other._bits) - 1)
+                    offset = other._base - self._base
+                    self._bits[offset:offset + len(other._bits)] |= other._bits
+            else:
+                self._set_ordinals(np.fromiter((d.toordinal() for d in other), dtype=np.int64), True)
+
+    def issuperset(self, other):
+        """other의 모든 날짜가 이 집합에 포함되는지 (새 배열을 거의 만들지 않음)"""
+        other = as_exclude_set(other)
+        if not len(other._bits):
+            return True
+        start = date.fromordinal(other._base)
+        end = date.fromordinal(other._base + len(other._bits) - 1)
+        return not np.any(other._bits & ~self.mask(start, end))
+
+    def clear(self):
+        self._base, self._bits = 0, np.zeros(0, dtype=bool)
+
+    def copy(self):
+        result = ExcludeSet()
+        result._base, result._bits = self._base, self._bits.copy()
+        return result
+
+    # ✅ 벡터 연산용 변환
+    def ordinals(self):
+        """제외일 서수 배열 (오름차순)"""
+        return np.flatnonzero(self._bits) + self._base
+
+    def to_datetime64(self):
+        """np.busday_count 등의 holidays 인자로 쓸 datetime64[D] 배열"""
+        return (self.ordinals() - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+
+    def mask(self, start, end):
+        """start~end(포함) 각 날짜의 제외일 여부"""
+        lo, hi = start.toordinal(), end.toordinal()
+        result = np.zeros(max(hi - lo + 1, 0), dtype=bool)
+        src_lo, src_hi = max(lo, self._base), min(hi, self._base + len(self._bits) - 1)
+        if src_lo <= src_hi:
+            result[src_lo - lo:src_hi - lo + 1] = self._bits[src_lo - self._base:src_hi - self._base + 1]
+        return result
+
+    def to_token(self):
+        """짧은 문자열로 직렬화 - 'x1:<시작 서수>+<일수>:<zlib+base64 비트>'"""
+        # self를 바꾸지 않음 - 공유 중인 집합을 직렬화하는 도중 다른 스레드가 읽어도 안전
+        bits = self._bits
+        nonzero = np.flatnonzero(bits)
+        if not len(nonzero):
+            return ""
+        base = self._base + int(nonzero[0])
+        bits = bits[nonzero[0]:nonzero[-1] + 1]
+        packed = np.packbits(bits, bitorder="little").tobytes()
+        payload = base64.urlsafe_b64encode(zlib.compress(packed, 9)).decode("ascii")
+        return f"{TOKEN_PREFIX}{base}+{len(bits)}:{payload}"
+
+
+def as_exclude_set(excludes):
+    """set/list/None 등을 ExcludeSet으로 변환 (이미 ExcludeSet이면 그대로)"""
+    if isinstance(excludes, ExcludeSet):
+        return excludes
+    return ExcludeSet(excludes or ())
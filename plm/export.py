@@ -0,0 +1,240 @@
+# plm/export.py - 전체 제품 일정 일괄 내보내기 (ZIP 스트리밍)
+
+import io
+import re
+import tempfile
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from plm.portfolio import iter_product_schedules
+
+# Parquet 관련 라이브러리 (선택적)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXPORT_COLUMNS = ["단계", "시작일", "종료일", "담당자", "Asana Task 코드"]
+SUMMARY_COLUMNS = ["제품", "목표완료일", "단계 수", "최초 시작일", "담당자 수"]
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\[\]]')
+
+
+def safe_name(name, max_length=None):
+    """파일명/시트명에 쓸 수 없는 문자를 '_'로 치환"""
+    cleaned = _UNSAFE_FILENAME.sub("_", str(name)).strip() or "제품"
+    return cleaned[:max_length] if max_length else cleaned
+
+
+def available_formats():
+    """사용 가능한 내보내기 형식 {표시명: 형식 코드}"""
+    formats = {"CSV (utf-8-sig)": "csv"}
+    if PARQUET_AVAILABLE:
+        formats["Parquet"] = "parquet"
+    formats["XLSX (제품별 시트)"] = "xlsx"
+    return formats
+
+
+def iter_schedule_frames(products, calendars=None):
+    """제품별 (제품명, 요약 행, 일정 DataFrame) 생성 - 한 번에 한 제품만 메모리에 유지"""
+    for product_name, product_data, schedule in iter_product_schedules(products, calendars):
+        schedule_df = pd.DataFrame(schedule, columns=EXPORT_COLUMNS)
+        summary = {
+            "제품": product_name,
+            "목표완료일": product_data["target_date"],
+            "단계 수": len(schedule_df),
+            "최초 시작일": schedule_df["시작일"].min() if len(schedule_df) else None,
+            "담당자 수": schedule_df["담당자"].replace("", pd.NA).nunique(),
+        }
+        yield product_name, summary, schedule_df
+
+
+class StreamingXlsxWriter:
+    """시트 단위로 바로 기록하는 최소 XLSX 작성기 (인라인 문자열, 날짜 서식 1종)"""
+
+    _EPOCH = date(1899, 12, 30).toordinal()
+
+    def __init__(self, fileobj):
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheets = []
+
+    @staticmethod
+    def _column_letter(index):
+        letters = ""
+        index += 1
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            letters = chr(65 + remainder) + letters
+        return letters
+
+    def _cell(self, ref, value):
+        if value is None or (isinstance(value, float) and value != value) or value is pd.NaT:
+            return ""
+        if isinstance(value, datetime):
+            value = value.date()
+        if isinstance(value, date):
+            return f'<c r="{ref}" s="1"><v>{value.toordinal() - self._EPOCH}</v></c>'
+        if isinstance(value, bool):
+            return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)):
+            return f'<c r="{ref}"><v>{value}</v></c>'
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+    def _row(self, letters, row_number, values):
+        cells = "".join(self._cell(f"{letters[i]}{row_number}", value) for i, value in enumerate(values))
+        return f'<row r="{row_number}">{cells}</row>'.encode("utf-8")
+
+    def write_sheet(self, title, header, rows, first=False):
+        """시트 1개를 행 단위로 기록 (rows는 이터레이터여도 됨, first=True면 맨 앞 탭으로 배치)"""
+        part = len(self._sheets) + 1
+        self._sheets.append((title, part, first))
+        letters = [self._column_letter(i) for i in range(len(header))]
+        with self._zip.open(f"xl/worksheets/sheet{part}.xml", "w") as raw:
+            raw.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                      b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            raw.write(self._row(letters, 1, header))
+            for row_number, row in enumerate(rows, 2):
+                raw.write(self._row(letters, row_number, row))
+            raw.write(b"</sheetData></worksheet>")
+
+    def close(self):
+        """통합 문서 메타데이터(시트 목록, 서식, 관계) 기록 후 닫기"""
+        count = len(self._sheets)
+        sheet_types = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, count + 1)
+        )
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{sheet_types}</Types>'
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        ordered = sorted(self._sheets, key=lambda sheet: not sheet[2])
+        sheets = "".join(
+            f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{part}" r:id="rId{part}"/>'
+            for title, part, _ in ordered
+        )
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>'
+        ))
+        relationships = "".join(
+            f'<Relationship Id="rId{i}" '
+            f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, count + 1)
+        )
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relationships}'
+            f'<Relationship Id="rId{count + 1}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/></Relationships>'
+        ))
+        self._zip.writestr("xl/styles.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/></numFmts>'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'
+        ))
+        self._zip.close()
+
+
+def _unique_name(name, used, max_length=None):
+    """겹치지 않는 시트/파일 이름 - Excel 시트 이름과 Windows/macOS 파일명은 대소문자를 구분하지 않으므로 casefold로 비교"""
+    base = safe_name(name, max_length)
+    candidate, counter = base, 2
+    while candidate.casefold() in used:
+        suffix = f"_{counter}"
+        candidate = (base[:max_length - len(suffix)] if max_length else base) + suffix
+        counter += 1
+    used.add(candidate.casefold())
+    return candidate
+
+
+def _write_csv(zf, arcname, df):
+    with zf.open(arcname, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as text:
+        df.to_csv(text, index=False)
+
+
+def write_schedule_zip(products, fmt, fileobj, on_progress=None, calendars=None):
+    """전체 제품 일정을 fileobj에 ZIP으로 기록
+
+    fmt: "csv" (제품별 CSV), "parquet" (제품별 Parquet), "xlsx" (제품별 시트를 가진 XLSX 1개)
+    on_progress: 제품 하나를 기록할 때마다 호출 (완료 개수, 제품명)
+    calendars: 단계별 근무 캘린더 (iter_product_schedules에 전달)
+    """
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet 내보내기에는 'pyarrow' 패키지가 필요합니다.")
+
+    summaries = []
+    used_names = set()
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        if fmt == "xlsx":
+            # 시트를 하나씩 ZIP 안의 XLSX로 흘려보내므로 제품 수와 무관하게 메모리 일정
+            with zf.open("전체_개발일정표.xlsx", "w") as raw:
+                workbook = StreamingXlsxWriter(raw)
+                for count, (product_name, summary, schedule_df) in enumerate(iter_schedule_frames(products, calendars), 1):
+                    title = _unique_name(product_name, used_names, max_length=31)
+                    workbook.write_sheet(title, EXPORT_COLUMNS, schedule_df.itertuples(index=False, name=None))
+                    summaries.append(summary)
+                    if on_progress:
+                        on_progress(count, product_name)
+                workbook.write_sheet(
+                    _unique_name("요약", used_names, max_length=31),
+                    SUMMARY_COLUMNS,
+                    ([summary[column] for column in SUMMARY_COLUMNS] for summary in summaries),
+                    first=True,
+                )
+                workbook.close()
+        else:
+            for count, (product_name, summary, schedule_df) in enumerate(iter_schedule_frames(products, calendars), 1):
+                base = _unique_name(product_name, used_names)
+                if fmt == "csv":
+                    _write_csv(zf, f"{base}_개발일정표.csv", schedule_df)
+                else:
+                    with zf.open(f"{base}_개발일정표.parquet", "w") as raw:
+                        schedule_df.to_parquet(raw, index=False)
+                summaries.append(summary)
+                if on_progress:
+                    on_progress(count, product_name)
+            _write_csv(zf, "_요약.csv", pd.DataFrame(summaries, columns=SUMMARY_COLUMNS))
+    return len(summaries)
+
+
+def build_schedule_zip(products, fmt, on_progress=None, spool_size=32 * 1024 * 1024, calendars=None):
+    """ZIP을 임시 파일(작으면 메모리)에 만든 뒤 bytes로 반환 - (bytes, 제품 수, 파일명)"""
+    with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+        count = write_schedule_zip(products, fmt, spool, on_progress, calendars)
+        spool.seek(0)
+        data = spool.read()
+    filename = f"전체제품_개발일정_{fmt}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return data, count, filename
@@ -0,0 +1,168 @@
+# plm/fake_asana.py - 오프라인 테스트/벤치마크용 로컬 가짜 Asana API 서버
+#
+# 사용 예:
+#   python -m plm.fake_asana --port 8766 --latency-ms 50 --max-rps 25
+#   python -m plm asana-sync ./products --base-url http://127.0.0.1:8766/api/1.0 --token test
+#
+# 지원: PUT /api/1.0/tasks/<gid>, GET /api/1.0/tasks/<gid>, POST /api/1.0/batch
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from plm.ratelimit import TokenBucket
+
+API_PREFIX = "/api/1.0"
+
+
+class FakeAsanaState:
+    """가짜 서버의 작업 저장소와 요청 통계"""
+
+    def __init__(self, latency=0.0, max_rps=None, known_gids=None):
+        self.latency = latency
+        self.bucket = TokenBucket(max_rps) if max_rps else None
+        self.known_gids = set(known_gids) if known_gids is not None else None
+        self.tasks = {}
+        self.stats = {"requests": 0, "batches": 0, "updates": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    def update_task(self, gid, fields):
+        """작업 1개 갱신 - (상태 코드, 응답 본문)"""
+        if self.known_gids is not None and gid not in self.known_gids:
+            return 404, {"errors": [{"message": f"task: Unknown object: {gid}"}]}
+        allowed = {key: value for key, value in fields.items() if key in ("start_on", "due_on", "name", "notes")}
+        with self._lock:
+            task = self.tasks.setdefault(gid, {"gid": gid, "resource_type": "task"})
+            task.update(allowed)
+            self.stats["updates"] += 1
+            return 200, {"data": dict(task)}
+
+    def get_task(self, gid):
+        with self._lock:
+            task = self.tasks.get(gid)
+        if task is None:
+            return 404, {"errors": [{"message": f"task: Unknown object: {gid}"}]}
+        return 200, {"data": dict(task)}
+
+
+class FakeAsanaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _admit(self):
+        """인증/속도 제한/지연 처리 - 요청을 계속 처리해도 되면 True"""
+        state = self.server.state
+        with state._lock:
+            state.stats["requests"] += 1
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send(401, {"errors": [{"message": "Not Authorized"}]})
+            return False
+        if state.bucket is not None and not state.bucket.try_acquire():
+            with state._lock:
+                state.stats["rate_limited"] += 1
+            self._send(429, {"errors": [{"message": "Rate limit exceeded"}]}, {"Retry-After": "1"})
+            return False
+        if state.latency:
+            time.sleep(state.latency)
+        return True
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _task_gid(self, path):
+        prefix = f"{API_PREFIX}/tasks/"
+        return path[len(prefix):].strip("/") if path.startswith(prefix) else None
+
+    def do_GET(self):
+        gid = self._task_gid(urlsplit(self.path).path)
+        if gid is None:
+            self._send(404, {"errors": [{"message": "Not found"}]})
+        elif self._admit():
+            self._send(*self.server.state.get_task(gid))
+
+    def do_PUT(self):
+        gid = self._task_gid(urlsplit(self.path).path)
+        if gid is None:
+            self._send(404, {"errors": [{"message": "Not found"}]})
+        elif self._admit():
+            self._send(*self.server.state.update_task(gid, self._read_json().get("data", {})))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != f"{API_PREFIX}/batch":
+            self._send(404, {"errors": [{"message": "Not found"}]})
+            return
+        if not self._admit():
+            return
+        state = self.server.state
+        actions = self._read_json().get("data", {}).get("actions", [])
+        if len(actions) > 10:
+            self._send(400, {"errors": [{"message": "Batch request may contain at most 10 actions"}]})
+            return
+        with state._lock:
+            state.stats["batches"] += 1
+        results = []
+        for action in actions:
+            gid = self._task_gid(API_PREFIX + action.get("relative_path", ""))
+            if gid is None or action.get("method", "").lower() != "put":
+                results.append({"status_code": 400, "headers": {}, "body": {"errors": [{"message": "Unsupported"}]}})
+                continue
+            status, body = state.update_task(gid, action.get("data", {}))
+            results.append({"status_code": status, "headers": {}, "body": body})
+        self._send(200, {"data": results})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_fake_asana(host="127.0.0.1", port=0, latency=0.0, max_rps=None, known_gids=None):
+    """가짜 Asana 서버 생성 (port=0이면 빈 포트) - server.state로 저장된 작업/통계 확인"""
+    server = ThreadingHTTPServer((host, port), FakeAsanaHandler)
+    server.daemon_threads = True
+    server.state = FakeAsanaState(latency, max_rps, known_gids)
+    return server
+
+
+def start_fake_asana(**kwargs):
+    """백그라운드 스레드에서 실행 - (server, base_url) 반환, 종료는 server.shutdown()"""
+    server = make_fake_asana(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}{API_PREFIX}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 Asana API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가할 지연")
+    parser.add_argument("--max-rps", type=float, help="초당 허용 요청 수 (초과 시 429)")
+    args = parser.parse_args(argv)
+
+    server = make_fake_asana(args.host, args.port, args.latency_ms / 1000, args.max_rps)
+    print(f"가짜 Asana 서버 실행 중: http://{args.host}:{server.server_address[1]}{API_PREFIX} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.state.stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# plm/fake_sheets.py - 오프라인 테스트/벤치마크용 메모리 내 가짜 Google Sheets (gspread 객체 흉내)
+#
+# 사용 예:
+#   backend = FakeSheetsBackend(quota_per_minute=60, latency=0.05)
+#   client = backend.client()                      # gspread.authorize(...) 결과 대신 사용
+#   spreadsheet = client.create("이퀄베리_PLM_데이터")
+#   backend.fail_next(503, times=2)                # 다음 요청 2번은 일시 오류
+#
+# 지원: client.open_by_key/create, spreadsheet.worksheets/worksheet/add_worksheet/del_worksheet/values_get,
+#       worksheet.update/get_all_values - 할당량 초과 시 gspread APIError처럼 status 429 + Retry-After
+
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+
+from plm.ratelimit import TokenBucket
+
+
+class FakeResponse:
+    """APIError.response 대용 (status_code, headers만)"""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    """gspread.exceptions.APIError와 같은 속성(code, response)을 가진 오류"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(f"APIError: [{status}]: {message}")
+        self.code = status
+        self.response = FakeResponse(status, headers)
+
+
+class WorksheetNotFound(Exception):
+    pass
+
+
+class FakeWorksheet:
+    def __init__(self, backend, spreadsheet_id, sheet_id, title, rows, cols):
+        self._backend = backend
+        self._spreadsheet_id = spreadsheet_id
+        self.id = sheet_id
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._values = []
+
+    def update(self, range_name, values=None):
+        """range_name 셀부터 values(2차원 목록) 쓰기 - gspread 6처럼 (values, range_name) 순서도 허용"""
+        if isinstance(range_name, list):
+            range_name, values = values or "A1", range_name
+        self._backend._admit("write")
+        row, col = _cell_position(range_name)
+        with self._backend._lock:
+            for r, line in enumerate(values or []):
+                target = row + r
+                while len(self._values) <= target:
+                    self._values.append([])
+                current = self._values[target]
+                if len(current) < col + len(line):
+                    current.extend([""] * (col + len(line) - len(current)))
+                current[col:col + len(line)] = ["" if value is None else str(value) for value in line]
+        return {"updatedRange": f"{self.title}!{range_name}", "updatedRows": len(values or [])}
+
+    def get_all_values(self):
+        """빈 뒤쪽 행/열을 잘라낸 직사각형 문자열 행렬 (gspread와 같음)"""
+        self._backend._admit("read")
+        with self._backend._lock:
+            rows = [list(row) for row in self._values]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        width = max((max((i + 1 for i, value in enumerate(row) if value), default=0) for row in rows), default=0)
+        return [(row + [""] * width)[:width] for row in rows]
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, spreadsheet_id, title):
+        self._backend = backend
+        self.id = spreadsheet_id
+        self.title = title
+        self._worksheets = []
+        self._sheet_ids = itertools.count(1)
+
+    def worksheets(self):
+        self._backend._admit("read")
+        with self._backend._lock:
+            return list(self._worksheets)
+
+    def worksheet(self, title):
+        self._backend._admit("read")
+        with self._backend._lock:
+            for worksheet in self._worksheets:
+                if worksheet.title == title:
+                    return worksheet
+        raise WorksheetNotFound(title)
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self._backend._admit("write")
+        with self._backend._lock:
+            if any(worksheet.title == title for worksheet in self._worksheets):
+                raise FakeAPIError(400, f'A sheet with the name "{title}" already exists.')
+            worksheet = FakeWorksheet(self._backend, self.id, next(self._sheet_ids), title, rows, cols)
+            self._worksheets.insert(len(self._worksheets) if index is None else index, worksheet)
+            return worksheet
+
+    def values_get(self, range_name, params=None):
+        """"'시트'" 또는 "'시트'!B3" 범위 값 - API처럼 뒤쪽 빈 행/칸은 생략한 응답 dict"""
+        self._backend._admit("read")
+        title, _, cell = range_name.rpartition("!") if "!" in range_name else (range_name, "", "")
+        title = title[1:-1].replace("''", "'") if title.startswith("'") else title
+        with self._backend._lock:
+            worksheet = next((ws for ws in self._worksheets if ws.title == title), None)
+            if worksheet is None:
+                raise FakeAPIError(400, f"Unable to parse range: {range_name}")
+            rows = [list(row) for row in worksheet._values]
+        if cell:
+            row, col = _cell_position(cell)
+            rows = [[rows[row][col]]] if row < len(rows) and col < len(rows[row]) and rows[row][col] else []
+        rows = [row[:max((i + 1 for i, value in enumerate(row) if value), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        response = {"range": range_name, "majorDimension": "ROWS"}
+        if rows:
+            response["values"] = rows
+        return response
+
+    def del_worksheet(self, worksheet):
+        self._backend._admit("write")
+        with self._backend._lock:
+            if worksheet not in self._worksheets:
+                raise FakeAPIError(400, f"No grid with id: {worksheet.id}")
+            self._worksheets.remove(worksheet)
+
+
+class FakeSheetsClient:
+    """gspread.Client 대용"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def open_by_key(self, key):
+        self._backend._admit("read")
+        with self._backend._lock:
+            spreadsheet = self._backend.spreadsheets.get(key)
+        if spreadsheet is None:
+            raise FakeAPIError(404, f"Requested entity was not found: {key}")
+        return spreadsheet
+
+    def create(self, title):
+        self._backend._admit("write")
+        spreadsheet = FakeSpreadsheet(self._backend, uuid.uuid4().hex, title)
+        with self._backend._lock:
+            self._backend.spreadsheets[spreadsheet.id] = spreadsheet
+        return spreadsheet
+
+
+class FakeSheetsBackend:
+    """가짜 Sheets 저장소와 요청 통계 - 할당량(분당 요청 수), 요청 지연, 예정된/주기적 오류 주입
+
+    fail_every=N이면 N번째 요청마다 503 (재시도 동작 확인용)
+    """
+
+    def __init__(self, quota_per_minute=None, latency=0.0, retry_after=1, fail_every=None):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.bucket = TokenBucket(quota_per_minute / 60.0, quota_per_minute) if quota_per_minute else None
+        self.spreadsheets = {}
+        self.stats = {"requests": 0, "reads": 0, "writes": 0, "rate_limited": 0, "failed": 0}
+        self._failures = deque()
+        self._lock = threading.Lock()
+
+    def client(self):
+        return FakeSheetsClient(self)
+
+    def fail_next(self, status, times=1):
+        """다음 times번의 요청을 status 오류로 실패시킴 (예: 500/503 일시 오류)"""
+        with self._lock:
+            self._failures.extend([status] * times)
+
+    def _admit(self, kind):
+        """요청 1회 처리 - 할당량 초과/예정된 오류면 FakeAPIError"""
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["reads" if kind == "read" else "writes"] += 1
+            failure = self._failures.popleft() if self._failures else None
+            if failure is None and self.fail_every and self.stats["requests"] % self.fail_every == 0:
+                failure = 503
+            if failure is not None:
+                self.stats["failed"] += 1
+        if failure is not None:
+            raise FakeAPIError(failure, "The service is currently unavailable.")
+        if self.bucket is not None and not self.bucket.try_acquire():
+            with self._lock:
+                self.stats["rate_limited"] += 1
+            raise FakeAPIError(429, "Quota exceeded for quota metric 'Read requests'",
+                               {"Retry-After": str(self.retry_after)} if self.retry_after else None)
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def _cell_position(label):
+    """'B3' → (2, 1) - 0부터 시작하는 (행, 열)"""
+    letters = "".join(ch for ch in label if ch.isalpha()).upper()
+    digits = "".join(ch for ch in label if ch.isdigit())
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - ord("A") + 1
+    return int(digits or 1) - 1, max(col, 1) - 1
@@ -0,0 +1,227 @@
+# plm/holidays.py - 다년도/지역별 공휴일 비트셋 저장소 (컴파일 후 mmap으로 조회)
+#
+# 파일 구조: MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 0 패딩(8바이트 정렬) | 지역별 비트셋
+#   - 비트셋은 base_ordinal부터 하루 1비트 (bitorder=little), 지역마다 ceil(days/8) 바이트
+#
+# 사용 예:
+#   python -m plm.holidays compile holiday_store.bin --region KR=공휴일_2025_Second_exclude_settings.json --years 2020-2035
+#   python -m plm.holidays query holiday_store.bin --region KR --start 2025-10-01 --end 2025-10-31
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from datetime import date, datetime
+
+import numpy as np
+
+from plm.excludes import ExcludeSet
+
+MAGIC = b"PLMHOL01"
+DEFAULT_REGION = "KR"
+
+
+def load_exclude_json(path):
+    """기존 *_exclude_settings.json 형식({"exclude_dates": [...]})에서 날짜 목록 읽기"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [datetime.fromisoformat(date_str).date() for date_str in data.get("exclude_dates", [])]
+
+
+def _iter_source_dates(source):
+    """소스 하나(JSON 파일 경로 또는 날짜/ISO 문자열 목록)의 날짜들"""
+    if isinstance(source, (str, os.PathLike)):
+        return load_exclude_json(source)
+    return [datetime.fromisoformat(d).date() if isinstance(d, str) else d for d in source]
+
+
+def compile_holiday_store(path, sources, start_year, end_year):
+    """지역별 공휴일 소스를 start_year~end_year 범위의 비트셋 파일로 컴파일 (원자적 쓰기)
+
+    sources: {지역명: [소스, ...]} - 소스는 JSON 파일 경로 또는 날짜 목록
+    """
+    base = date(start_year, 1, 1).toordinal()
+    days = date(end_year, 12, 31).toordinal() - base + 1
+    regions = list(sources)
+
+    bitsets = []
+    counts = {}
+    for region in regions:
+        mask = np.zeros(days, dtype=bool)
+        for source in sources[region]:
+            ordinals = np.array([d.toordinal() for d in _iter_source_dates(source)], dtype=np.int64) - base
+            mask[ordinals[(ordinals >= 0) & (ordinals < days)]] = True
+        counts[region] = int(mask.sum())
+        bitsets.append(np.packbits(mask, bitorder="little"))
+
+    header = json.dumps({
+        "base_ordinal": base,
+        "days": days,
+        "regions": regions,
+        "holiday_counts": counts,
+        "compiled_at": datetime.now().isoformat(),
+    }, ensure_ascii=False).encode("utf-8")
+    prefix_len = len(MAGIC) + 4 + len(header)
+    padding = (-prefix_len) % 8
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".holidays_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(b"\0" * padding)
+            for bits in bitsets:
+                f.write(bits.tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+class HolidayCalendarStore:
+    """컴파일된 공휴일 비트셋 파일을 mmap으로 열어 근무일/구간 질의에 응답"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"공휴일 저장소 형식이 아닙니다: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[header_start:header_start + header_len].decode("utf-8"))
+        self.base_ordinal = self.header["base_ordinal"]
+        self.days = self.header["days"]
+        self.regions = list(self.header["regions"])
+
+        data_start = header_start + header_len
+        data_start += (-data_start) % 8
+        bytes_per_region = (self.days + 7) // 8
+        self._bits = {
+            region: np.frombuffer(self._mmap, dtype=np.uint8, count=bytes_per_region,
+                                  offset=data_start + i * bytes_per_region)
+            for i, region in enumerate(self.regions)
+        }
+
+    @property
+    def first_date(self):
+        return date.fromordinal(self.base_ordinal)
+
+    @property
+    def last_date(self):
+        return date.fromordinal(self.base_ordinal + self.days - 1)
+
+    def _region_bits(self, region):
+        try:
+            return self._bits[region]
+        except KeyError:
+            raise KeyError(f"등록되지 않은 지역입니다: {region} (사용 가능: {', '.join(self.regions)})") from None
+
+    def is_holiday(self, day, region=DEFAULT_REGION):
+        """저장소 범위 밖의 날짜는 공휴일이 아닌 것으로 간주"""
+        index = day.toordinal() - self.base_ordinal
+        if index < 0 or index >= self.days:
+            return False
+        return bool((self._region_bits(region)[index >> 3] >> (index & 7)) & 1)
+
+    def is_working_day(self, day, region=DEFAULT_REGION):
+        return day.weekday() < 5 and not self.is_holiday(day, region)
+
+    def holiday_mask(self, start, end, region=DEFAULT_REGION):
+        """start~end(포함) 각 날짜의 공휴일 여부 (numpy bool 배열)"""
+        start_index = start.toordinal() - self.base_ordinal
+        end_index = end.toordinal() - self.base_ordinal
+        mask = np.zeros(max(end_index - start_index + 1, 0), dtype=bool)
+        lo, hi = max(start_index, 0), min(end_index, self.days - 1)
+        if lo <= hi:
+            bits = self._region_bits(region)[lo >> 3:(hi >> 3) + 1]
+            unpacked = np.unpackbits(bits, bitorder="little")
+            offset = lo - ((lo >> 3) << 3)
+            mask[lo - start_index:hi - start_index + 1] = unpacked[offset:offset + hi - lo + 1]
+        return mask
+
+    def working_mask(self, start, end, region=DEFAULT_REGION):
+        """start~end(포함) 각 날짜의 근무일 여부 (주말/공휴일 제외)"""
+        ordinals = np.arange(start.toordinal(), end.toordinal() + 1)
+        weekdays = (ordinals - 1) % 7  # date.fromordinal(1)은 월요일
+        return (weekdays < 5) & ~self.holiday_mask(start, end, region)
+
+    def count_working_days(self, start, end, region=DEFAULT_REGION):
+        return int(self.working_mask(start, end, region).sum())
+
+    def holidays_between(self, start, end, region=DEFAULT_REGION):
+        """start~end(포함) 사이 공휴일 (numpy datetime64[D] 배열)"""
+        offsets = np.flatnonzero(self.holiday_mask(start, end, region))
+        return (np.datetime64(start, "D") + offsets).astype("datetime64[D]")
+
+    def holiday_dates(self, region=DEFAULT_REGION, start=None, end=None):
+        """공휴일을 date 목록으로 (화면 표시/기존 set 기반 코드 연동용)"""
+        days = self.holidays_between(start or self.first_date, end or self.last_date, region)
+        return days.astype(object).tolist()
+
+    def exclude_set(self, region=DEFAULT_REGION, start=None, end=None):
+        """공휴일을 ExcludeSet으로 (비트 구간을 그대로 옮기므로 날짜 객체를 만들지 않음)"""
+        start = start or self.first_date
+        return ExcludeSet.from_mask(start, self.holiday_mask(start, end or self.last_date, region))
+
+    def close(self):
+        """mmap 닫기 (여러 번 불러도 됨) - 다른 스레드가 아직 비트 배열을 보고 있으면 그 참조가 사라질 때 해제됨"""
+        self._bits = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def _parse_date(value):
+    return datetime.fromisoformat(value).date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공휴일 비트셋 저장소 컴파일/조회")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="JSON 공휴일 소스를 비트셋 파일로 컴파일")
+    compile_cmd.add_argument("output")
+    compile_cmd.add_argument("--region", action="append", required=True, metavar="지역=파일[,파일...]")
+    compile_cmd.add_argument("--years", default="2020-2035", metavar="시작-종료")
+
+    query_cmd = commands.add_parser("query", help="구간의 공휴일/근무일 수 조회")
+    query_cmd.add_argument("store")
+    query_cmd.add_argument("--region", default=DEFAULT_REGION)
+    query_cmd.add_argument("--start", type=_parse_date, required=True)
+    query_cmd.add_argument("--end", type=_parse_date, required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "compile":
+        sources = {}
+        for spec in args.region:
+            region, _, files = spec.partition("=")
+            sources.setdefault(region, []).extend(path for path in files.split(",") if path)
+        start_year, _, end_year = args.years.partition("-")
+        compile_holiday_store(args.output, sources, int(start_year), int(end_year or start_year))
+        store = HolidayCalendarStore(args.output)
+        print(json.dumps(store.header, ensure_ascii=False, indent=2))
+        store.close()
+    else:
+        store = HolidayCalendarStore(args.store)
+        holidays = [d.isoformat() for d in store.holiday_dates(args.region, args.start, args.end)]
+        print(json.dumps({
+            "region": args.region,
+            "holidays": holidays,
+            "working_days": store.count_working_days(args.start, args.end, args.region),
+        }, ensure_ascii=False, indent=2))
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# plm/kanban.py - 칸반 진행 상태 분류
+
+import numpy as np
+import pandas as pd
+
+KANBAN_STATUSES = ["준비중", "진행중", "완료"]
+
+
+def classify_status(df, today):
+    """오늘 날짜 기준 진행 상태를 한 번의 벡터 비교로 판단 (준비중/진행중/완료)"""
+    today = pd.Timestamp(today)
+    start = pd.to_datetime(df["시작일"])
+    end = pd.to_datetime(df["종료일"])
+    status = np.select(
+        [(start > today) & (end > today), (start < today) & (end < today)],
+        ["준비중", "완료"],
+        default="진행중",
+    )
+    return pd.Series(status, index=df.index, name="상태")
@@ -0,0 +1,193 @@
+# plm/overlay.py - 포트폴리오 겹침 캘린더 (전 제품 단계 구간 색인 → 일별 진행 단계 수, 담당자 중복 배정)
+
+import html
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from plm.calendar_html import WEEKDAY_LABELS, render_month_row
+from plm.portfolio import occupied_ends
+
+# 기간 집계 결과 - days: 일자(datetime64[D]), total: 일별 진행 단계 수,
+# by_phase / by_assignee: (단계명/담당자 코드 × 일자) 진행 건수, rows: 기간과 겹치는 구간 번호
+OverlayWindow = namedtuple("OverlayWindow", ["days", "total", "by_phase", "by_assignee", "rows"])
+
+MAX_TOOLTIP_LINES = 12
+MAX_CONFLICT_LABELS = 10  # 중복 목록의 '제품 · 단계'는 앞에서 이만큼만 적고 나머지는 '외 N건'
+
+
+def _day_numbers(values):
+    """날짜 열 → 1970-01-01 기준 일 번호 (이미 datetime64 열이면 변환 없이 그대로)"""
+    values = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values)
+    return values.to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+class PhaseIntervalIndex:
+    """전 제품의 단계 구간을 시작일 순으로 정렬해 둔 색인
+
+    기간 질의는 시작일 이진 탐색(가장 긴 구간 길이만큼 앞에서부터)으로 후보를 좁히고,
+    일별 건수는 날짜를 펼치지 않고 (분류 × 일자) 차분 배열의 누적합으로 센다.
+    날짜는 1970-01-01 기준 일 번호(int64)로 보관. 종료일은 인계일을 다음 단계 몫으로 보는 점유 마지막 날
+    (portfolio.occupied_ends) - 한 담당자가 이어지는 두 단계를 맡아도 인계일에 중복으로 잡히지 않음.
+    """
+
+    def __init__(self, portfolio_df):
+        starts = _day_numbers(portfolio_df["시작일"])
+        ends = _day_numbers(occupied_ends(portfolio_df))
+        valid = ~(pd.isna(portfolio_df["시작일"]).to_numpy() | pd.isna(portfolio_df["종료일"]).to_numpy())
+        valid &= ends >= starts
+        order = np.flatnonzero(valid)[np.argsort(starts[valid], kind="stable")]
+
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.products = portfolio_df["제품"].to_numpy(dtype=object)[order]
+        self.phases = portfolio_df["단계"].fillna("").astype(str).to_numpy(dtype=object)[order]
+        self.assignees = portfolio_df["담당자"].fillna("").astype(str).str.strip().to_numpy(dtype=object)[order]
+        self.phase_codes, self.phase_names = pd.factorize(self.phases)
+        self.assignee_codes, self.assignee_names = pd.factorize(self.assignees)
+        self.max_length = int((self.ends - self.starts).max()) if len(order) else 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def span(self):
+        """(첫 시작일, 마지막 종료일) 일 번호 - 비어 있으면 None"""
+        return (int(self.starts[0]), int(self.ends.max())) if len(self) else None
+
+    def overlapping(self, lo, hi):
+        """[lo, hi] 일 번호 구간과 겹치는 구간 번호 (시작일 순)"""
+        left = np.searchsorted(self.starts, lo - self.max_length, side="left")
+        right = np.searchsorted(self.starts, hi, side="right")
+        candidates = np.arange(left, right)
+        return candidates[self.ends[candidates] >= lo]
+
+    def _active(self, rows, codes, size, lo, hi):
+        """구간별 분류 코드 × 일자 진행 건수 - 구간 양 끝에 +1/-1을 찍고 일자 방향 누적합"""
+        grid = np.zeros((size, hi - lo + 2), dtype=np.int64)
+        first = np.maximum(self.starts[rows], lo) - lo
+        after_last = np.minimum(self.ends[rows], hi) - lo + 1
+        np.add.at(grid, (codes, first), 1)
+        np.add.at(grid, (codes, after_last), -1)
+        return np.cumsum(grid, axis=1)[:, :-1]
+
+    def window(self, start_date, end_date):
+        """start_date~end_date(포함) 일별 집계 (OverlayWindow)"""
+        lo = int(np.datetime64(start_date, "D").astype(np.int64))
+        hi = int(np.datetime64(end_date, "D").astype(np.int64))
+        rows = self.overlapping(lo, hi)
+        by_phase = self._active(rows, self.phase_codes[rows], len(self.phase_names), lo, hi)
+        by_assignee = self._active(rows, self.assignee_codes[rows], len(self.assignee_names), lo, hi)
+        days = np.arange(lo, hi + 1).astype("datetime64[D]")
+        return OverlayWindow(days, by_phase.sum(axis=0), by_phase, by_assignee, rows)
+
+    def conflict_mask(self, window):
+        """(담당자 코드 × 일자) 중복 배정 여부 - 미정(빈 담당자)과 주말은 제외"""
+        weekday = (window.days.astype(np.int64) + 3) % 7 < 5
+        assigned = np.array([bool(name) for name in self.assignee_names], dtype=bool)
+        return (window.by_assignee > 1) & assigned[:, None] & weekday[None, :]
+
+    def conflicts(self, window):
+        """중복 배정 목록 DataFrame[날짜, 담당자, 건수, 단계] - 단계는 '제품 · 단계' 목록 (시작일 순)"""
+        assignee_idx, day_idx = np.nonzero(self.conflict_mask(window))
+        # 기간 구간을 담당자 코드별로 한 번 묶어 두고 중복 칸마다 해당 담당자 구간만 확인
+        grouped = window.rows[np.argsort(self.assignee_codes[window.rows], kind="stable")]
+        bounds = np.searchsorted(self.assignee_codes[grouped], np.arange(len(self.assignee_names) + 1))
+        records = []
+        for a, d in zip(assignee_idx, day_idx):
+            day = int(window.days[d].astype(np.int64))
+            rows = grouped[bounds[a]:bounds[a + 1]]
+            rows = rows[(self.starts[rows] <= day) & (self.ends[rows] >= day)]
+            labels = [f"{self.products[r]} · {self.phases[r]}" for r in rows[:MAX_CONFLICT_LABELS]]
+            if len(rows) > MAX_CONFLICT_LABELS:
+                labels.append(f"외 {len(rows) - MAX_CONFLICT_LABELS}건")
+            records.append({
+                "날짜": window.days[d].astype(object),
+                "담당자": self.assignee_names[a],
+                "건수": int(window.by_assignee[a, d]),
+                "단계": ", ".join(labels),
+            })
+        return pd.DataFrame(records, columns=["날짜", "담당자", "건수", "단계"])
+
+
+def _heat_color(count, max_count):
+    """진행 단계 수 → 배경색 (많을수록 진한 파랑)"""
+    if not count:
+        return "white"
+    alpha = 0.12 + 0.68 * count / max(max_count, 1)
+    return f"rgba(33, 150, 243, {alpha:.2f})"
+
+
+def _tooltip(index, window, d, conflict_codes):
+    lines = [f"진행 단계 {int(window.total[d])}개"]
+    phase_counts = window.by_phase[:, d]
+    for code in np.argsort(-phase_counts, kind="stable")[:MAX_TOOLTIP_LINES]:
+        if phase_counts[code]:
+            lines.append(f"· {index.phase_names[code]}: {int(phase_counts[code])}")
+    for code in conflict_codes:
+        lines.append(f"⚠️ {index.assignee_names[code]} 중복 {int(window.by_assignee[code, d])}건")
+    return html.escape("\n".join(lines)).replace("\n", "&#10;")
+
+
+def render_overlay_month_html(index, window, month, max_count):
+    """월 1개 겹침 캘린더 HTML - 칸마다 진행 단계 수(색 농도), 담당자 중복은 빨간 테두리 + ⚠️, 마우스를 올리면 내역"""
+    conflicts = index.conflict_mask(window)
+    origin = window.days[0].astype(object)
+    month_first = month.start_time.date()
+    month_last = month.end_time.date()
+    html_parts = [
+        '<div style="border: 2px solid #e0e0e0; border-radius: 8px; padding: 15px; background: #fafafa; flex: 1; min-width: 200px;">',
+        f'<h4 style="margin: 0 0 15px 0; text-align: center; color: #333;">{month.strftime("%Y년 %m월")}</h4>',
+        '<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 10px;">',
+    ]
+    html_parts.extend(
+        f'<div style="text-align: center; font-weight: bold; font-size: 12px; padding: 5px;">{day}</div>'
+        for day in WEEKDAY_LABELS
+    )
+    html_parts.append('</div>')
+
+    current = month_first - timedelta(days=month_first.weekday())
+    while current <= month_last:
+        html_parts.append('<div style="display: grid; grid-template-columns: repeat(7, 1fr); gap: 2px; margin-bottom: 5px;">')
+        for k in range(7):
+            day = current + timedelta(days=k)
+            style = "text-align: center; padding: 4px 2px; font-size: 12px; border-radius: 4px; min-height: 34px;"
+            if not month_first <= day <= month_last:
+                html_parts.append(f'<div style="{style} color: #ccc;">{day.day}</div>')
+                continue
+            d = (day - origin).days
+            if day.weekday() >= 5:
+                html_parts.append(f'<div style="{style} color: #ff4444; background: #f8f8f8;">{day.day}</div>')
+                continue
+            count = int(window.total[d])
+            conflict_codes = np.flatnonzero(conflicts[:, d])
+            style += f" background: {_heat_color(count, max_count)};"
+            style += " border: 2px solid #e53935;" if len(conflict_codes) else " border: 1px solid #eee;"
+            badge = f'<div style="font-size: 10px; font-weight: bold;">{count}{" ⚠️" if len(conflict_codes) else ""}</div>' if count else ""
+            title = _tooltip(index, window, d, conflict_codes) if count else ""
+            html_parts.append(f'<div style="{style}" title="{title}">{day.day}{badge}</div>')
+        html_parts.append('</div>')
+        current += timedelta(days=7)
+    html_parts.append('</div>')
+    return "".join(html_parts)
+
+
+def overlay_months(index):
+    """색인 전체 기간이 걸친 월 목록 (pd.Period)"""
+    span = index.span()
+    if span is None:
+        return []
+    first, last = (np.array(span).astype("datetime64[D]")).astype("datetime64[M]")
+    return list(pd.period_range(pd.Period(str(first), freq="M"), pd.Period(str(last), freq="M"), freq="M"))
+
+
+def render_overlay_page(index, months):
+    """보이는 월들(한 페이지)의 겹침 캘린더 HTML과 그 기간의 집계 - (HTML, OverlayWindow)"""
+    window = index.window(months[0].start_time.date(), months[-1].end_time.date())
+    weekday = (window.days.astype(np.int64) + 3) % 7 < 5
+    max_count = int(window.total[weekday].max()) if weekday.any() else 0
+    blocks = [render_overlay_month_html(index, window, month, max_count) for month in months]
+    return render_month_row(blocks), window
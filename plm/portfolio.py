@@ -0,0 +1,115 @@
+# plm/portfolio.py - 전체 제품(포트폴리오) 일정 집계
+
+import numpy as np
+import pandas as pd
+
+from plm.schedule import backward_schedule
+from plm.state import ProductState
+
+SCHEDULE_COLUMNS = ["제품", "단계", "시작일", "종료일", "담당자", "Asana Task 코드", "캘린더"]
+
+
+def iter_product_schedules(products, calendars=None):
+    """제품별 일정(backward_schedule 결과)을 하나씩 생성 - (제품명, 제품 데이터, 일정 목록)
+
+    calendars: 이름 → WorkingCalendar (단계별 근무 캘린더, 모든 제품이 같은 근무일 인덱스를 공유)
+    """
+    for product_name, product_data, _, schedule in _iter_phase_schedules(products, calendars):
+        yield product_name, product_data, schedule
+
+
+def _iter_phase_schedules(products, calendars=None):
+    """iter_product_schedules와 같고 단계 목록도 함께 - (제품명, 제품 데이터, 단계 목록, 일정 목록)"""
+    for product_name, product_data in products.items():
+        if isinstance(product_data, ProductState):
+            # 불변 상태는 DataFrame을 만들지 않고 단계 레코드에서 바로 계산
+            phases = product_data.phase_dicts()
+        else:
+            phases_df = product_data.get("phases")
+            phases = [] if phases_df is None else phases_df.to_dict(orient="records")
+        if not phases or not product_data.get("target_date"):
+            continue
+        schedule = backward_schedule(
+            product_data["target_date"],
+            phases,
+            product_data.get("custom_excludes", set()),
+            calendars,
+        )
+        yield product_name, product_data, phases, schedule
+
+
+def compute_portfolio_schedule(products, calendars=None):
+    """모든 제품의 일정을 역산해 하나의 DataFrame으로 합침 (제품, 단계별 근무 캘린더 컬럼 추가)"""
+    records = []
+    for product_name, _, phases, schedule in _iter_phase_schedules(products, calendars):
+        for row, phase in zip(schedule, phases):
+            row["제품"] = product_name
+            row["캘린더"] = phase.get("캘린더") or ""
+            records.append(row)
+
+    portfolio_df = pd.DataFrame(records, columns=SCHEDULE_COLUMNS)
+    portfolio_df["시작일"] = pd.to_datetime(portfolio_df["시작일"])
+    portfolio_df["종료일"] = pd.to_datetime(portfolio_df["종료일"])
+    return portfolio_df
+
+
+def occupied_ends(portfolio_df):
+    """단계별로 실제 점유하는 마지막 날 (datetime64[D] 배열) - 부하/겹침 집계용
+
+    backward_schedule에서 앞 단계의 종료일은 다음 단계의 시작일과 같아 양 끝을 모두 세면 인계일이 두 번 세어짐.
+    같은 제품의 다른 단계가 종료일에 시작하면 그 날은 다음 단계 몫으로 보고 하루 앞당긴다 (제품의 마지막 단계는 종료일 포함).
+    """
+    starts = portfolio_df["시작일"].to_numpy().astype("datetime64[D]")
+    ends = portfolio_df["종료일"].to_numpy().astype("datetime64[D]")
+    products = pd.factorize(portfolio_df["제품"])[0]
+    starting = pd.Series(1, index=pd.MultiIndex.from_arrays([products, starts])).groupby(level=[0, 1]).size()
+    at_end = starting.reindex(pd.MultiIndex.from_arrays([products, ends])).fillna(0).to_numpy()
+    # 리드타임 0 단계처럼 시작일 = 종료일이면 자기 자신은 빼고 셈
+    handoff = at_end - (starts == ends) > 0
+    return np.where(handoff, ends - np.timedelta64(1, "D"), ends)
+
+
+def aggregate_for_gantt(portfolio_df, max_bars=1500):
+    """간트 차트용 막대 데이터 - 막대 수가 max_bars를 넘으면 제품 단위로 합치고, 그래도 넘으면 제품 묶음으로 솎아냄
+
+    반환: (표시 수준, DataFrame[라벨, 시작일, 종료일, 그룹, 상세])
+    """
+    if len(portfolio_df) <= max_bars:
+        bars = pd.DataFrame({
+            "라벨": portfolio_df["제품"] + " · " + portfolio_df["단계"],
+            "시작일": portfolio_df["시작일"],
+            "종료일": portfolio_df["종료일"],
+            "그룹": portfolio_df["단계"],
+            "상세": "👤 " + portfolio_df["담당자"].replace("", "미정").fillna("미정"),
+        })
+        return "단계", bars.reset_index(drop=True)
+
+    # 1차 집계: 제품별 전체 기간
+    per_product = (
+        portfolio_df.groupby("제품", sort=False)
+        .agg(시작일=("시작일", "min"), 종료일=("종료일", "max"), 단계수=("단계", "size"))
+        .reset_index()
+        .sort_values("시작일", kind="stable")
+    )
+    if len(per_product) <= max_bars:
+        bars = pd.DataFrame({
+            "라벨": per_product["제품"],
+            "시작일": per_product["시작일"],
+            "종료일": per_product["종료일"],
+            "그룹": "제품 전체 일정",
+            "상세": "단계 " + per_product["단계수"].astype(str) + "개",
+        })
+        return "제품", bars.reset_index(drop=True)
+
+    # 2차 집계: 시작일 순으로 정렬된 제품을 bucket_size개씩 묶음
+    bucket_size = -(-len(per_product) // max_bars)
+    bucket = pd.Series(range(len(per_product)), index=per_product.index) // bucket_size
+    grouped = per_product.groupby(bucket.values)
+    bars = pd.DataFrame({
+        "라벨": grouped["제품"].first() + " 외 " + (grouped["제품"].size() - 1).astype(str) + "개",
+        "시작일": grouped["시작일"].min(),
+        "종료일": grouped["종료일"].max(),
+        "그룹": "제품 묶음",
+        "상세": "제품 " + grouped["제품"].size().astype(str) + "개",
+    })
+    return "제품 묶음", bars.reset_index(drop=True)
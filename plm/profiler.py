@@ -0,0 +1,143 @@
+# plm/profiler.py - 재실행 구간별 성능 프로파일러
+
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# ✅ 기본 설정
+PROFILE_LOG_PATH = os.environ.get("PLM_PROFILE_LOG", "plm_profile.jsonl")
+PROFILE_ENABLED_BY_ENV = os.environ.get("PLM_PROFILE", "") == "1"
+TOTAL_SECTION = "전체 재실행"
+
+
+def percentile(values, q):
+    """최근접 순위 방식 백분위수 (values가 비어있으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class RerunProfiler:
+    """재실행 단위로 구간/Sheets 호출 소요 시간을 기록하고 p50/p95를 집계"""
+
+    def __init__(self, window=200, log_path=PROFILE_LOG_PATH):
+        self.window = window
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._history = defaultdict(lambda: deque(maxlen=self.window))
+        self._kinds = {}
+        # Streamlit은 세션마다 별도 스레드에서 스크립트를 실행하므로 실행 상태는 스레드별로 보관
+        self._local = threading.local()
+
+    @property
+    def enabled(self):
+        return getattr(self._local, "enabled", False)
+
+    def begin_run(self, enabled):
+        """재실행 시작 - 이전 실행이 중단(st.rerun 등)되었으면 버림"""
+        state = self._local
+        state.enabled = bool(enabled)
+        state.timings = []
+        state.lap = None
+        state.run_start = time.perf_counter()
+
+    def record(self, name, elapsed_ms, kind="section"):
+        if not self.enabled:
+            return
+        self._local.timings.append((name, elapsed_ms, kind))
+
+    def mark(self, name):
+        """이전 구간을 닫고 새 구간 시작 (스크립트 위에서 아래로 흐르는 구간용)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        lap = self._local.lap
+        if lap is not None:
+            self.record(lap[0], (now - lap[1]) * 1000)
+        self._local.lap = (name, now) if name else None
+
+    @contextmanager
+    def section(self, name):
+        """중첩 가능한 구간 측정"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed_call(self, name, fn, *args, **kwargs):
+        """외부 API 호출 1회의 소요 시간 측정"""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, kind="call")
+
+    def end_run(self):
+        """재실행 종료 - 집계에 반영하고 JSONL 로그에 한 줄 추가"""
+        if not self.enabled:
+            return None
+        self.mark(None)
+        state = self._local
+        total_ms = (time.perf_counter() - state.run_start) * 1000
+        timings = state.timings + [(TOTAL_SECTION, total_ms, "run")]
+        state.timings = []
+
+        with self._lock:
+            for name, elapsed_ms, kind in timings:
+                self._history[name].append(elapsed_ms)
+                self._kinds[name] = kind
+
+        entry = {
+            "ts": datetime.now().isoformat(),
+            "total_ms": round(total_ms, 3),
+            "timings": [
+                {"name": name, "ms": round(elapsed_ms, 3), "kind": kind}
+                for name, elapsed_ms, kind in timings[:-1]
+            ],
+        }
+        try:
+            with self._lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+        return entry
+
+    def summary(self):
+        """구간별 최근 window회 기준 통계"""
+        with self._lock:
+            snapshot = {name: list(values) for name, values in self._history.items()}
+            kinds = dict(self._kinds)
+        rows = []
+        for name, values in snapshot.items():
+            rows.append({
+                "구간": name,
+                "종류": {"section": "구간", "call": "API 호출", "run": "전체"}.get(kinds.get(name), ""),
+                "횟수": len(values),
+                "최근(ms)": round(values[-1], 2),
+                "p50(ms)": round(percentile(values, 50), 2),
+                "p95(ms)": round(percentile(values, 95), 2),
+            })
+        rows.sort(key=lambda row: row["p95(ms)"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+            self._kinds.clear()
+
+
+# 프로세스 전역 프로파일러 (Streamlit 재실행 간에도 모듈은 유지됨)
+profiler = RerunProfiler()
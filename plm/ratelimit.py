@@ -0,0 +1,83 @@
+# plm/ratelimit.py - 토큰 버킷 속도 제한 (스레드/asyncio 공용)
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더 값 → 기다릴 초 (초 단위 숫자 또는 HTTP 날짜, 없거나 해석할 수 없거나 0 이하면 None)"""
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            retry_at = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - (now or datetime.now(timezone.utc))).total_seconds()
+    return seconds if seconds > 0 else None
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷
+
+    acquire()는 스레드에서, acquire_async()는 이벤트 루프에서 사용 - 같은 버킷을 함께 써도 됨
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens):
+        """토큰을 차감(미리 예약)하고 기다려야 할 초를 반환 - 대기 순서가 공정하게 유지됨"""
+        if tokens > self.capacity:
+            raise ValueError(f"한 번에 요청할 수 있는 토큰은 최대 {self.capacity:g}개입니다")
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens=1):
+        """기다리지 않고 토큰을 얻을 수 있으면 True"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기 (대기한 초 반환)"""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1):
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, seconds):
+        """서버가 Retry-After를 보냈을 때 그 시간만큼 토큰 공급을 멈춤 (동시에 여러 번 받아도 누적하지 않음)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
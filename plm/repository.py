@@ -0,0 +1,229 @@
+# plm/repository.py - 로컬 디렉터리 기반 제품 저장소 (*_product_data.json + 인덱스 파일)
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from plm.excludes import ExcludeSet
+
+PRODUCT_FILE_SUFFIX = "_product_data.json"
+INDEX_FILENAME = "product_index.json"
+PHASE_COLUMNS = ["단계", "리드타임", "담당자", "Asana Task 코드", "캘린더"]
+
+
+def product_filename(product_name):
+    """제품명 → 파일명 (공백은 '_', 파일명에 쓸 수 없는 문자도 '_')"""
+    cleaned = "".join("_" if ch in '\\/:*?"<>|' or ch.isspace() else ch for ch in product_name.strip())
+    return f"{cleaned or '제품'}{PRODUCT_FILE_SUFFIX}"
+
+
+def lead_time_value(value):
+    """리드타임 셀 값 → int (빈 칸/NaN/숫자가 아닌 값은 0, "20.0" 같은 실수 표기도 허용)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def hashed_product_filename(product_name):
+    """product_filename이 다른 제품과 겹칠 때 쓰는 파일명 (제품명 해시 8자리를 덧붙임)"""
+    digest = hashlib.sha1(product_name.encode("utf-8")).hexdigest()[:8]
+    return product_filename(product_name).replace(PRODUCT_FILE_SUFFIX, f"_{digest}{PRODUCT_FILE_SUFFIX}")
+
+
+def atomic_write_json(path, data):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (쓰다가 중단되어도 기존 파일 유지)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def normalize_phase_record(phase):
+    """저장 파일의 단계 1개를 앱 컬럼 구성으로 (이전 '비고' 컬럼은 Asana Task 코드가 비었을 때만 사용, 캘린더가 없는 이전 파일은 빈 칸)"""
+    asana_code = phase.get("Asana Task 코드") or phase.get("비고") or ""
+    return {
+        "단계": str(phase.get("단계", "")),
+        "리드타임": lead_time_value(phase.get("리드타임")),
+        "담당자": str(phase.get("담당자") or ""),
+        "Asana Task 코드": str(asana_code),
+        "캘린더": str(phase.get("캘린더") or "").strip(),
+    }
+
+
+def product_to_json(product_name, product_data):
+    """제품 데이터 → 저장 파일 형식 (기존 *_product_data.json과 동일한 키)"""
+    phases = product_data["phases"]
+    records = phases.to_dict(orient="records") if hasattr(phases, "to_dict") else list(phases)
+    target_date = product_data.get("target_date")
+    return {
+        "product_name": product_name,
+        "phases": [normalize_phase_record(phase) for phase in records],
+        "custom_excludes": [d.isoformat() for d in sorted(product_data.get("custom_excludes") or ())],
+        "target_date": target_date.isoformat() if target_date else "",
+        "team_members": list(product_data.get("team_members") or []),
+        "saved_at": datetime.now().isoformat(),
+    }
+
+
+def product_from_json(data, as_dataframe=True):
+    """저장 파일 형식 → 제품 데이터 (as_dataframe=False면 phases를 dict 목록으로 유지)"""
+    phases = [normalize_phase_record(phase) for phase in data.get("phases", [])]
+    if as_dataframe:
+        import pandas as pd
+        phases = pd.DataFrame(phases, columns=PHASE_COLUMNS)
+    target_date = data.get("target_date")
+    return {
+        "phases": phases,
+        "custom_excludes": ExcludeSet(datetime.fromisoformat(d).date() for d in data.get("custom_excludes", [])),
+        "target_date": datetime.fromisoformat(target_date).date() if target_date else None,
+        "team_members": list(data.get("team_members", [])),
+    }
+
+
+def read_product_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ProductRepository:
+    """디렉터리의 *_product_data.json을 인덱스로 관리 - 본문은 선택 시에만 읽음"""
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._index = {}
+        self._signature = None
+        self.refresh()
+
+    def _summary(self, filename, data):
+        return {
+            "file": filename,
+            "target_date": data.get("target_date", ""),
+            "phase_count": len(data.get("phases", [])),
+            "saved_at": data.get("saved_at", ""),
+            "mtime": os.path.getmtime(os.path.join(self.directory, filename)),
+        }
+
+    def _stat_signature(self):
+        """(디렉터리 mtime, 인덱스 파일 mtime) - 다른 프로세스가 파일을 추가/교체/삭제하면 바뀜"""
+        try:
+            index_mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            index_mtime = None
+        return os.stat(self.directory).st_mtime_ns, index_mtime
+
+    def refresh_if_changed(self):
+        """디렉터리나 인덱스 파일이 마지막 확인 이후 바뀌었을 때만 refresh (바뀌었으면 True)"""
+        if self._stat_signature() == self._signature:
+            return False
+        self.refresh()
+        return True
+
+    def refresh(self):
+        """인덱스 파일을 읽고 디렉터리와 맞춤 (새로 생기거나 바뀐 파일만 열어봄)"""
+        with self._lock:
+            try:
+                stored = read_product_file(self.index_path).get("products", {})
+            except (FileNotFoundError, ValueError):
+                stored = {}
+
+            files = {name for name in os.listdir(self.directory) if name.endswith(PRODUCT_FILE_SUFFIX)}
+            index = {}
+            known = {}
+            for product_name, entry in stored.items():
+                filename = entry.get("file")
+                if filename not in files:
+                    continue
+                mtime = os.path.getmtime(os.path.join(self.directory, filename))
+                if entry.get("mtime") == mtime:
+                    index[product_name] = entry
+                    known[filename] = product_name
+
+            for filename in sorted(files - set(known)):
+                try:
+                    data = read_product_file(os.path.join(self.directory, filename))
+                except (OSError, ValueError):
+                    continue
+                product_name = data.get("product_name") or filename[:-len(PRODUCT_FILE_SUFFIX)]
+                index[product_name] = self._summary(filename, data)
+
+            self._index = index
+            if index != stored:
+                self._write_index()
+            self._signature = self._stat_signature()
+
+    def _write_index(self):
+        atomic_write_json(self.index_path, {"products": self._index, "updated_at": datetime.now().isoformat()})
+
+    def _new_filename(self, product_name):
+        """새 제품의 파일명 - 다른 제품이 이미 쓰는 파일명이면 ("A B"와 "A_B" 등) 제품명 해시를 덧붙임"""
+        used = {entry["file"] for entry in self._index.values()}
+        stem = hashed_product_filename(product_name)[:-len(PRODUCT_FILE_SUFFIX)]
+        candidates = [product_filename(product_name), hashed_product_filename(product_name)]
+        counter = 2
+        while True:
+            for filename in candidates:
+                if filename not in used and not os.path.exists(os.path.join(self.directory, filename)):
+                    return filename
+            candidates = [f"{stem}_{counter}{PRODUCT_FILE_SUFFIX}"]
+            counter += 1
+
+    def names(self):
+        return list(self._index)
+
+    def summary(self, product_name):
+        return self._index.get(product_name)
+
+    def __contains__(self, product_name):
+        return product_name in self._index
+
+    def load(self, product_name, as_dataframe=True):
+        """제품 본문 읽기 (없으면 None)"""
+        entry = self._index.get(product_name)
+        if entry is None:
+            return None
+        data = read_product_file(os.path.join(self.directory, entry["file"]))
+        return product_from_json(data, as_dataframe=as_dataframe)
+
+    def save(self, product_name, product_data):
+        """제품 파일과 인덱스를 원자적으로 기록"""
+        data = product_to_json(product_name, product_data)
+        with self._lock:
+            entry = self._index.get(product_name)
+            filename = entry["file"] if entry else self._new_filename(product_name)
+            atomic_write_json(os.path.join(self.directory, filename), data)
+            self._index[product_name] = self._summary(filename, data)
+            self._write_index()
+            self._signature = self._stat_signature()
+        return filename
+
+    def delete(self, product_name):
+        with self._lock:
+            entry = self._index.pop(product_name, None)
+            if entry is None:
+                return False
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+            self._write_index()
+            self._signature = self._stat_signature()
+        return True
@@ -0,0 +1,192 @@
+# plm/scenarios.py - 리드타임/제외일/목표일 변형 시나리오 일괄 계산 (시나리오 × 단계 행렬)
+
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from plm.calendars import phase_calendars
+from plm.excludes import as_exclude_set
+
+BASELINE_NAME = "기준"
+SCENARIO_COLUMNS = ["시나리오", "목표일 이동(일)", "추가 제외일"]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # 날짜 서수 → datetime64[D] 변환 기준
+
+# lead_times: {단계 번호(0부터): 리드타임} - 없는 단계는 기준 리드타임 사용
+Scenario = namedtuple("Scenario", ["name", "lead_times", "extra_excludes", "target_shift"])
+
+
+def baseline_scenario():
+    return Scenario(BASELINE_NAME, {}, (), 0)
+
+
+def phase_column_labels(phases):
+    """편집 표의 단계별 리드타임 열 이름 (단계명이 겹칠 수 있어 번호를 붙임)"""
+    return [f"{i + 1}. {phase.get('단계', '')}" for i, phase in enumerate(phases)]
+
+
+def parse_date_list(text):
+    """'2026-11-03, 2026-11-04' 형식 문자열 → (날짜 목록, 해석하지 못한 항목 목록)"""
+    dates, invalid = [], []
+    for token in re.split(r"[,\s]+", str(text or "").strip()):
+        if not token:
+            continue
+        try:
+            dates.append(date.fromisoformat(token))
+        except ValueError:
+            invalid.append(token)
+    return dates, invalid
+
+
+def scenarios_from_frame(df, phases):
+    """시나리오 편집 표 → (Scenario 목록, 해석하지 못한 제외일 목록)
+
+    단계 열이 비어 있으면 기준 리드타임을 그대로 쓰고, 이름이 없는 행은 건너뜀.
+    """
+    labels = phase_column_labels(phases)
+    scenarios, invalid = [], []
+    for row in df.to_dict(orient="records"):
+        name = "" if pd.isna(row.get("시나리오")) else str(row.get("시나리오")).strip()
+        if not name:
+            continue
+        lead_times = {
+            i: int(row[label]) for i, label in enumerate(labels)
+            if label in row and not pd.isna(row[label])
+        }
+        extra, bad = parse_date_list("" if pd.isna(row.get("추가 제외일")) else row.get("추가 제외일"))
+        invalid.extend(bad)
+        shift = row.get("목표일 이동(일)")
+        scenarios.append(Scenario(name, lead_times, extra, 0 if pd.isna(shift) else int(shift)))
+    return scenarios, invalid
+
+
+def lead_time_matrix(phases, scenarios):
+    """시나리오 × 단계 리드타임 행렬 (int64)"""
+    base = np.array([max(int(phase.get("리드타임") or 0), 0) for phase in phases], dtype=np.int64)
+    matrix = np.tile(base, (len(scenarios), 1))
+    for row, scenario in enumerate(scenarios):
+        for column, lead in (scenario.lead_times or {}).items():
+            if 0 <= column < len(base) and lead is not None:
+                matrix[row, column] = max(int(lead), 0)
+    return matrix
+
+
+def _workday_tables(lo, hi, exclude_sets):
+    """시나리오별 근무일 표 - (prefix, ordinals)
+
+    prefix[s, i]: lo+i 서수 이전의 근무일 수 (열 D+1개)
+    ordinals[s, j]: j번째 근무일 서수 (시나리오마다 근무일 수가 달라 뒤는 hi+1로 채움)
+    """
+    days = np.arange(lo, hi + 1, dtype=np.int64)
+    start, end = date.fromordinal(lo), date.fromordinal(hi)
+    weekday = (days - 1) % 7 < 5
+    workday = np.stack([weekday & ~exclude_set.mask(start, end) for exclude_set in exclude_sets])
+    prefix = np.zeros((len(exclude_sets), len(days) + 1), dtype=np.int64)
+    np.cumsum(workday, axis=1, out=prefix[:, 1:])
+
+    counts = prefix[:, -1]
+    ordinals = np.full((len(exclude_sets), int(counts.max()) + 1), hi + 1, dtype=np.int64)
+    rows, columns = np.nonzero(workday)
+    ordinals[rows, np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)] = days[columns]
+    return prefix, ordinals
+
+
+def schedule_matrix(target_dates, lead_times, exclude_sets, calendars=None):
+    """시나리오별 backward_schedule을 한 번에 계산 - (시작일 서수 행렬, 종료일 서수 행렬), 모양은 lead_times와 같음
+
+    target_dates: 시나리오별 목표일 목록, lead_times: 시나리오 × 단계 리드타임 행렬
+    exclude_sets: 시나리오별 제외일 집합 (주말은 요일로 판단) - 1개만 주면 모든 시나리오가 공유
+    calendars: 단계(열)별 WorkingCalendar 또는 None (phase_calendars) - 캘린더 열은 제외일 대신 그 캘린더로 역산
+    단계 순서대로 한 열씩 역산하되, 각 열은 모든 시나리오를 numpy 인덱싱으로 동시에 계산한다.
+    """
+    lead_times = np.asarray(lead_times, dtype=np.int64)
+    scenario_count, phase_count = lead_times.shape
+    exclude_sets = [as_exclude_set(excludes) for excludes in exclude_sets]
+    calendars = list(calendars) if calendars is not None else [None] * phase_count
+    targets = np.array([day.toordinal() for day in target_dates], dtype=np.int64)
+    starts = np.zeros_like(lead_times)
+    ends = np.zeros_like(lead_times)
+    if not scenario_count or not phase_count:
+        return starts, ends
+
+    # 리드타임 0 단계는 시작일이 종료일 다음 날이 될 수 있어 뒤쪽도 단계 수만큼 여유
+    hi = int(targets.max()) + phase_count + 1
+    span = int(lead_times.sum(axis=1).max()) * 7 // 5 + 14
+    rows = np.arange(scenario_count)
+    # 제외일이 같으면 근무일 표 1개를 모든 시나리오가 함께 씀
+    table_rows = rows if len(exclude_sets) > 1 else np.zeros(scenario_count, dtype=np.int64)
+    while True:
+        lo = int(targets.min()) - span
+        prefix, ordinals = _workday_tables(lo, hi, exclude_sets)
+        end = targets.copy()
+        for column in range(phase_count - 1, -1, -1):
+            lead = lead_times[:, column]
+            ends[:, column] = end
+            if calendars[column] is not None:
+                end = calendars[column].backward_starts(end, lead)
+                if (end < lo).any():
+                    break
+            else:
+                position = prefix[table_rows, end - lo]
+                if (position - lead <= 0).any():
+                    break
+                cursor = np.where(lead > 0, ordinals[table_rows, np.maximum(position - lead, 0)], end)
+                # 역산한 날의 다음 날 이전(포함)의 마지막 근무일이 시작일
+                end = ordinals[table_rows, prefix[table_rows, cursor + 2 - lo] - 1]
+            starts[:, column] = end
+        else:
+            return starts, ends
+        # 근무일 표가 짧아 역산이 범위를 벗어나면 넓혀서 다시 계산
+        span *= 2
+
+
+def run_scenarios(target_date, phases, excluded_days, scenarios, calendars=None):
+    """기준 + 시나리오 전체 일정 - (시나리오 목록, 시작일 행렬, 종료일 행렬), 첫 행은 기준
+
+    calendars: 이름 → WorkingCalendar - 캘린더 단계는 시나리오의 추가 제외일과 무관하게 그 캘린더로 역산
+    """
+    scenarios = [baseline_scenario()] + list(scenarios)
+    base_excludes = as_exclude_set(excluded_days)
+    exclude_sets = [base_excludes | scenario.extra_excludes if scenario.extra_excludes else base_excludes
+                    for scenario in scenarios]
+    target_dates = [target_date + timedelta(days=int(scenario.target_shift or 0)) for scenario in scenarios]
+    starts, ends = schedule_matrix(target_dates, lead_time_matrix(phases, scenarios), exclude_sets,
+                                   phase_calendars(phases, calendars))
+    return scenarios, starts, ends
+
+
+def compare_scenarios(target_date, phases, excluded_days, scenarios, calendars=None):
+    """시나리오 비교표 - (요약 DataFrame, 단계별 시작일 DataFrame)
+
+    요약: 시나리오별 첫 시작일/완료일/총 리드타임과 기준 대비 시작일 변화(일)
+    단계별: 행=단계, 열=시나리오, 값='YYYY-MM-DD (±일)' (기준 대비)
+    """
+    scenarios, starts, ends = run_scenarios(target_date, phases, excluded_days, scenarios, calendars)
+    names = [scenario.name for scenario in scenarios]
+    leads = lead_time_matrix(phases, scenarios)
+    if not phases:
+        return pd.DataFrame(columns=["시나리오"]), pd.DataFrame()
+
+    first_delta = starts[:, 0] - starts[0, 0]
+    summary = pd.DataFrame({
+        "시나리오": names,
+        "첫 시작일": [date.fromordinal(int(o)) for o in starts[:, 0]],
+        "시작일 변화(일)": first_delta,
+        "완료일": [date.fromordinal(int(o)) for o in ends[:, -1]],
+        "총 리드타임": leads.sum(axis=1),
+    })
+
+    deltas = starts - starts[0]
+    labels = (starts - EPOCH_ORDINAL).astype("datetime64[D]").astype(str)
+    cells = np.where(deltas == 0, labels, np.char.add(np.char.add(labels, " ("), np.char.add(
+        np.where(deltas > 0, "+", ""), np.char.add(deltas.astype(str), ")")
+    )))
+    cells[0] = labels[0]
+    by_phase = pd.DataFrame(
+        cells.T,
+        index=pd.Index(phase_column_labels(phases), name="단계"),
+        columns=names,
+    )
+    return summary, by_phase
@@ -0,0 +1,139 @@
+# plm/schedule.py - 일정 역산 및 근무일 계산
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from plm.excludes import as_exclude_set
+
+WEEKDAYS = (0, 1, 2, 3, 4)  # 기본 근무 요일 (월~금, date.weekday())
+
+
+# ✅ 일정 역산
+def backward_schedule(target_date, phases, excluded_days, calendars=None):
+    """calendars: 이름 → WorkingCalendar (plm.calendars) - 단계의 '캘린더'가 여기 있으면
+    그 단계만 제품 제외일 대신 해당 캘린더의 근무일로 역산 (근무일 인덱스 이진 탐색)"""
+    schedule = []
+    current_date = target_date
+    
+    for phase in reversed(phases):
+        name, lead_time = phase['단계'], phase['리드타임']
+        담당자, asana_code = phase.get("담당자", ""), phase.get("Asana Task 코드", "")
+        calendar = calendars.get(phase.get("캘린더") or "") if calendars else None
+        
+        if calendar is not None:
+            start_date = calendar.backward_start(current_date, lead_time)
+        else:
+            workdays, date_cursor = 0, current_date
+            
+            # 리드타임만큼 평일을 역산
+            while workdays < lead_time:
+                date_cursor -= timedelta(days=1)
+                if date_cursor.weekday() < 5 and date_cursor not in excluded_days:
+                    workdays += 1
+            
+            # 시작일이 주말이거나 제외일인 경우 평일로 조정
+            start_date = date_cursor + timedelta(days=1)
+            while start_date.weekday() >= 5 or start_date in excluded_days:
+                start_date -= timedelta(days=1)
+        
+        schedule.append({
+            "단계": name,
+            "시작일": start_date,
+            "종료일": current_date,
+            "담당자": 담당자,
+            "Asana Task 코드": asana_code
+        })
+        current_date = start_date
+    
+    return list(reversed(schedule))
+
+# ✅ 주말 제외일 자동 설정
+def get_weekends_between(start: date, end: date) -> set:
+    weekends = set()
+    current = start
+    while current <= end:
+        if current.weekday() >= 5:
+            weekends.add(current)
+        current += timedelta(days=1)
+    return weekends
+
+
+# ✅ 근무일 인덱스 (역산을 날짜 대신 근무일 번호로 계산)
+class BusinessDayIndex:
+    """start~end 사이 근무일(근무 요일이면서 제외일이 아닌 날)의 정렬된 서수 배열
+
+    근무일 n개 전/후를 하루씩 세지 않고 배열 인덱스로 구하므로, 리드타임을 바꿔 가며
+    일정을 여러 번 다시 계산하는 경우(단축 계획, 시나리오 비교 등)에 쓴다.
+    workdays: 근무 요일 (date.weekday() 값, 기본 월~금)
+    """
+
+    def __init__(self, start, end, excluded_days=None, workdays=WEEKDAYS):
+        self.start, self.end = start, end
+        ordinals = np.arange(start.toordinal(), end.toordinal() + 1, dtype=np.int64)
+        # 서수 1(0001-01-01)이 월요일이므로 (서수 - 1) % 7이 weekday()
+        weekday = (ordinals - 1) % 7
+        on_weekday = weekday < 5 if tuple(workdays) == WEEKDAYS else np.isin(weekday, list(workdays))
+        workday = on_weekday & ~as_exclude_set(excluded_days).mask(start, end)
+        self.ordinals = ordinals[workday]
+
+    @classmethod
+    def covering(cls, target_date, lead_times, excluded_days=None):
+        """target_date에서 lead_times 합만큼 역산해도 범위를 벗어나지 않는 인덱스
+
+        리드타임 0인 단계는 시작일이 종료일 다음 날이 될 수 있으므로 뒤쪽도 단계 수만큼 여유를 둔다.
+        """
+        workdays = sum(max(int(lead), 0) for lead in lead_times) + 1
+        span = workdays * 7 // 5 + 14
+        tail = timedelta(days=len(lead_times) + 1)
+        while True:
+            index = cls(target_date - timedelta(days=span), target_date + tail, excluded_days)
+            if index.position(target_date) > workdays:
+                return index
+            span *= 2
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def position(self, day):
+        """day보다 앞선 근무일 수 (day가 근무일이면 그 날의 인덱스)"""
+        return int(np.searchsorted(self.ordinals, day.toordinal(), side="left"))
+
+    def day(self, position):
+        return date.fromordinal(int(self.ordinals[position]))
+
+    def start_positions(self, target_date, lead_times):
+        """backward_schedule과 같은 규칙으로 단계별 시작일의 인덱스 목록 (단계 순서)
+
+        리드타임 L만큼 근무일을 역산한 날(L=0이면 종료일)의 다음 날이 근무일이면 그 날,
+        아니면 그 이전의 마지막 근무일이 시작일이다.
+        """
+        ordinals = self.ordinals
+        end_position, end_ordinal = self.position(target_date), target_date.toordinal()
+        positions = [0] * len(lead_times)
+        for i in range(len(lead_times) - 1, -1, -1):
+            lead = lead_times[i]
+            if lead > 0 and end_position - lead < 0:
+                raise IndexError("근무일 인덱스 범위를 벗어났습니다")
+            cursor = int(ordinals[end_position - lead]) if lead > 0 else end_ordinal
+            end_position = int(np.searchsorted(ordinals, cursor + 1, side="right")) - 1
+            end_ordinal = int(ordinals[end_position])
+            positions[i] = end_position
+        return positions
+
+    def backward_starts(self, end_ordinals, lead_times):
+        """종료일 서수 배열에서 리드타임만큼 역산한 시작일 서수 배열 (start_positions와 같은 규칙, 여러 종료일을 한 번에)
+
+        lead_times: 정수 또는 end_ordinals와 같은 길이의 배열. 인덱스 앞쪽 범위를 벗어나면 IndexError.
+        """
+        ordinals = self.ordinals
+        ends = np.asarray(end_ordinals, dtype=np.int64)
+        leads = np.asarray(lead_times, dtype=np.int64)
+        cursor_positions = np.searchsorted(ordinals, ends, side="left") - leads
+        if (cursor_positions < 0).any():
+            raise IndexError("근무일 인덱스 범위를 벗어났습니다")
+        cursor = np.where(leads > 0, ordinals[np.minimum(cursor_positions, len(ordinals) - 1)], ends)
+        start_positions = np.searchsorted(ordinals, cursor + 1, side="right") - 1
+        if (start_positions < 0).any():
+            raise IndexError("근무일 인덱스 범위를 벗어났습니다")
+        return ordinals[start_positions]
@@ -0,0 +1,48 @@
+# plm/sensitivity.py - 단계별 리드타임 지연이 첫 시작일에 미치는 영향 (전 단계 동시 계산)
+
+import numpy as np
+import pandas as pd
+
+from plm.calendars import phase_calendars
+from plm.excludes import as_exclude_set
+from plm.scenarios import EPOCH_ORDINAL, baseline_scenario, lead_time_matrix, schedule_matrix
+
+DEFAULT_STEPS = (1, 5)
+
+
+def _to_datetime64(ordinals):
+    return (np.asarray(ordinals) - EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def phase_sensitivity(target_date, phases, excluded_days, steps=DEFAULT_STEPS, calendars=None):
+    """단계마다 리드타임을 step 근무일 늘렸을 때 첫 단계 시작일이 앞당겨지는 일수
+
+    기준 + (단계 수 × step 수)개의 변형을 근무일 표 1개로 한 번에 역산한다. 주말/공휴일이
+    몰린 구간에 걸리면 근무일 1일 지연이 달력일로는 여러 날이 되므로 달력일과 근무일을 함께 표시.
+    calendars: 이름 → WorkingCalendar - 캘린더 단계는 그 캘린더로 역산 (근무일 열은 제품 기본 캘린더 기준)
+    반환 DataFrame: 단계, 리드타임, step별 앞당김(달력일/근무일), 영향 순위(첫 step 달력일 기준)
+    """
+    if not phases:
+        return pd.DataFrame(columns=["단계", "리드타임"])
+    excluded = as_exclude_set(excluded_days)
+    phase_count = len(phases)
+    base_leads = lead_time_matrix(phases, [baseline_scenario()])[0]
+
+    # 0행: 기준, 1 + k*단계수 + i행: i번째 단계만 steps[k]일 늘린 변형
+    leads = np.tile(base_leads, (1 + phase_count * len(steps), 1))
+    rows = np.arange(phase_count)
+    for k, step in enumerate(steps):
+        leads[1 + k * phase_count + rows, rows] += step
+    starts, _ = schedule_matrix([target_date] * len(leads), leads, [excluded], phase_calendars(phases, calendars))
+
+    first = starts[:, 0]
+    holidays = excluded.to_datetime64()
+    report = pd.DataFrame({"단계": [phase.get("단계", "") for phase in phases], "리드타임": base_leads})
+    for k, step in enumerate(steps):
+        moved = first[1 + k * phase_count:1 + (k + 1) * phase_count]
+        report[f"+{step}일 앞당김(달력일)"] = first[0] - moved
+        report[f"+{step}일 앞당김(근무일)"] = np.busday_count(
+            _to_datetime64(moved), _to_datetime64(np.full(phase_count, first[0])), holidays=holidays
+        )
+    report["영향 순위"] = report[f"+{steps[0]}일 앞당김(달력일)"].rank(ascending=False, method="min").astype(int)
+    return report
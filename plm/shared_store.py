@@ -0,0 +1,216 @@
+# plm/shared_store.py - 프로세스 전체가 공유하는 제품 저장소 (버전, compare-and-swap, 변경 알림)
+
+import threading
+import time
+from collections import deque
+
+
+class VersionConflict(Exception):
+    """다른 세션이 먼저 저장해 기대한 버전과 현재 버전이 다름"""
+
+    def __init__(self, product_name, expected, actual, author=None):
+        super().__init__(f"'{product_name}' 버전 충돌: 기대 {expected}, 현재 {actual}")
+        self.product_name = product_name
+        self.expected = expected
+        self.actual = actual
+        self.author = author
+
+
+class SharedProductStore:
+    """제품별 (버전, 불변 상태)를 보관 - 쓰기는 버전이 맞을 때만 성공하고 변경 기록(feed)에 남음
+
+    상태 객체(ProductState)는 불변이므로 읽을 때 복사하지 않고 그대로 공유한다.
+    버전 0은 '아직 없음'을 뜻하며, 새 제품은 expected_version=0으로 추가한다.
+    """
+
+    def __init__(self, feed_size=1000):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._entries = {}
+        self._feed = deque(maxlen=feed_size)
+        self._seq = 0
+
+    # ✅ 읽기
+    def get(self, product_name):
+        """(버전, 상태) - 없으면 (0, None)"""
+        with self._lock:
+            entry = self._entries.get(product_name)
+            return (entry["version"], entry["state"]) if entry else (0, None)
+
+    def version(self, product_name):
+        return self.get(product_name)[0]
+
+    def snapshot(self):
+        """{제품명: (버전, 상태)}와 그 시점의 변경 기록 번호"""
+        with self._lock:
+            return {name: (entry["version"], entry["state"]) for name, entry in self._entries.items()}, self._seq
+
+    @property
+    def seq(self):
+        return self._seq
+
+    # ✅ 쓰기 (compare-and-swap)
+    def _record(self, product_name, version, author, kind):
+        self._seq += 1
+        self._feed.append({
+            "seq": self._seq, "product": product_name, "version": version,
+            "author": author, "kind": kind, "at": time.time(),
+        })
+        self._changed.notify_all()
+
+    def put(self, product_name, state, expected_version, author=None):
+        """현재 버전이 expected_version일 때만 저장하고 새 버전 반환 (다르면 VersionConflict)"""
+        with self._lock:
+            entry = self._entries.get(product_name)
+            current = entry["version"] if entry else 0
+            if current != expected_version:
+                raise VersionConflict(product_name, expected_version, current, entry["author"] if entry else None)
+            if entry is not None and entry["state"] is state:
+                return current
+            version = current + 1
+            self._entries[product_name] = {"version": version, "state": state, "author": author}
+            self._record(product_name, version, author, "put")
+            return version
+
+    def delete(self, product_name, expected_version, author=None):
+        with self._lock:
+            entry = self._entries.get(product_name)
+            current = entry["version"] if entry else 0
+            if current != expected_version:
+                raise VersionConflict(product_name, expected_version, current, entry["author"] if entry else None)
+            if entry is None:
+                return
+            del self._entries[product_name]
+            self._record(product_name, 0, author, "delete")
+
+    # ✅ 변경 알림
+    def changes_since(self, seq):
+        """seq 이후의 변경 기록과 최신 번호 - 기록이 잘려 나갔으면 None(전체 다시 읽기 필요)"""
+        with self._lock:
+            if self._feed and self._feed[0]["seq"] > seq + 1:
+                return None, self._seq
+            return [change for change in self._feed if change["seq"] > seq], self._seq
+
+    def wait_for_changes(self, seq, timeout=None):
+        """seq 이후 변경이 생길 때까지 대기 (변경이 있으면 True)"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._seq > seq, timeout)
+
+
+class SessionSync:
+    """브라우저 세션 1개와 공유 저장소 사이의 동기화 상태 (세션별 기준 버전/상태, 마지막으로 읽은 변경 번호)"""
+
+    def __init__(self, store, author):
+        self.store = store
+        self.author = author
+        self.versions = {}
+        self.bases = {}
+        self.conflicts = {}
+        self.seq = 0
+
+    def _adopt(self, products, product_name, version, state):
+        products[product_name] = state
+        self.versions[product_name] = version
+        self.bases[product_name] = state
+        self.conflicts.pop(product_name, None)
+
+    def is_local_change(self, products, product_name):
+        """마지막 동기화 이후 이 세션에서 바꾼 제품인지 (불변 상태라 객체 동일성으로 판단)"""
+        return products.get(product_name) is not self.bases.get(product_name)
+
+    def attach(self, products):
+        """세션 시작 시 공유 저장소와 합치기 - 저장소 제품은 메모리에서 바로 가져오고(저장소 우선), 세션에만 있는 제품은 올림"""
+        snapshot, self.seq = self.store.snapshot()
+        for product_name, (version, state) in snapshot.items():
+            self._adopt(products, product_name, version, state)
+        for product_name in list(products):
+            if product_name not in snapshot:
+                self.push(product_name, products[product_name])
+
+    def pull(self, products, hold=()):
+        """다른 세션의 변경 반영 - (반영한 변경 목록, 새로 생긴 충돌 제품명 목록)
+
+        hold의 제품(편집 중인 제품)은 건너뜀 - 이번 실행의 편집을 반영한 뒤 push() 또는 refresh()로 처리한다.
+        """
+        changes, latest = self.store.changes_since(self.seq)
+        if changes is None:
+            # 변경 기록이 잘려 나간 경우 전체 상태와 비교
+            snapshot, latest = self.store.snapshot()
+            changes = [
+                {"product": name, "version": version, "author": None, "kind": "put"}
+                for name, (version, _) in snapshot.items() if version != self.versions.get(name)
+            ]
+        self.seq = latest
+
+        applied, conflicted = [], []
+        for change in changes:
+            product_name = change["product"]
+            if product_name in hold:
+                continue
+            if change["author"] == self.author and change["version"] == self.versions.get(product_name):
+                continue
+            version, state = self.store.get(product_name)
+            if version == self.versions.get(product_name, 0):
+                continue
+            if self.is_local_change(products, product_name) and product_name in products:
+                self.conflicts[product_name] = version
+                conflicted.append(product_name)
+            elif state is None:
+                products.pop(product_name, None)
+                self.versions.pop(product_name, None)
+                self.bases.pop(product_name, None)
+                applied.append(change)
+            else:
+                self._adopt(products, product_name, version, state)
+                applied.append(change)
+        return applied, conflicted
+
+    def refresh(self, products, product_name):
+        """로컬 변경이 없는 제품이면 공유 버전이 더 새로울 때 가져옴 (가져왔으면 True)"""
+        version, state = self.store.get(product_name)
+        if version == self.versions.get(product_name, 0) or self.is_local_change(products, product_name):
+            return False
+        if state is None:
+            products.pop(product_name, None)
+            self.versions.pop(product_name, None)
+            self.bases.pop(product_name, None)
+        else:
+            self._adopt(products, product_name, version, state)
+        return True
+
+    def push(self, product_name, state):
+        """이 세션의 변경을 저장소에 올림 - 다른 세션이 먼저 바꿨으면 충돌로 기록하고 False"""
+        if product_name in self.conflicts:
+            return False
+        try:
+            self.versions[product_name] = self.store.put(
+                product_name, state, self.versions.get(product_name, 0), self.author
+            )
+            self.bases[product_name] = state
+            return True
+        except VersionConflict as e:
+            self.conflicts[product_name] = e.actual
+            return False
+
+    def remove(self, product_name):
+        try:
+            self.store.delete(product_name, self.versions.get(product_name, 0), self.author)
+        except VersionConflict:
+            # 다른 세션이 먼저 수정한 제품은 삭제하지 않음 (다음 pull에서 다시 나타남)
+            pass
+        self.versions.pop(product_name, None)
+        self.bases.pop(product_name, None)
+        self.conflicts.pop(product_name, None)
+
+    def keep_mine(self, product_name, state):
+        """충돌 해결 - 현재 공유 버전 위에 내 변경을 덮어씀"""
+        self.conflicts.pop(product_name, None)
+        self.versions[product_name] = self.store.version(product_name)
+        return self.push(product_name, state)
+
+    def take_theirs(self, products, product_name):
+        """충돌 해결 - 내 변경을 버리고 공유 버전을 가져옴"""
+        self.conflicts.pop(product_name, None)
+        self.bases[product_name] = products.get(product_name)
+        self.refresh(products, product_name)
+        return products.get(product_name)
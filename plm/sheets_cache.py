@@ -0,0 +1,83 @@
+# plm/sheets_cache.py - 제품 워크시트 파싱 결과 캐시 (저장일시 셀로 변경 여부 확인 후 재사용)
+
+import threading
+from collections import OrderedDict
+
+# build_product_rows가 저장할 때마다 새로 쓰는 '저장일시' 값의 위치 - 워크시트의 버전으로 사용
+REVISION_CELL = "B3"
+
+
+def sheet_range(worksheet_title, cell=None):
+    """values_get에 쓸 A1 범위 - 시트 이름은 작은따옴표로 감쌈 ("'제품_데이터'!B3")"""
+    quoted = "'" + worksheet_title.replace("'", "''") + "'"
+    return f"{quoted}!{cell}" if cell else quoted
+
+
+def response_values(response):
+    """values_get 응답 → get_all_values()와 같은 직사각형 문자열 행렬 (API는 뒤쪽 빈 칸을 생략함)"""
+    rows = (response or {}).get("values") or []
+    width = max((len(row) for row in rows), default=0)
+    return [[str(value) for value in row] + [""] * (width - len(row)) for row in rows]
+
+
+def response_revision(response):
+    """저장일시 셀 1칸 응답 → 버전 문자열 (비어 있으면 "")"""
+    values = response_values(response)
+    return values[0][0] if values and values[0] else ""
+
+
+def copy_loaded(loaded_data):
+    """캐시에 보관한 파싱 결과를 호출자가 고쳐도 캐시가 바뀌지 않도록 복사"""
+    copied = dict(loaded_data)
+    for key in ("phases", "schedule"):
+        if copied.get(key) is not None:
+            copied[key] = copied[key].copy()
+    copied["custom_excludes"] = loaded_data["custom_excludes"].copy()
+    copied["team_members"] = list(loaded_data.get("team_members") or [])
+    return copied
+
+
+class ProductSheetCache:
+    """(스프레드시트 ID, 워크시트 이름) → (저장일시, parse_product_values 결과)
+
+    읽기 전에 저장일시 셀만 받아 비교하고, 같으면 전체 값 다운로드와 파싱을 생략한다.
+    저장일시가 없는(빈) 시트는 변경을 알 수 없으므로 캐시하지 않는다.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def get(self, spreadsheet_id, worksheet_title, revision):
+        """저장일시가 revision과 같은 항목의 복사본 - 없거나 다르면 None"""
+        key = (spreadsheet_id, worksheet_title)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not revision or entry[0] != revision:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return copy_loaded(entry[1])
+
+    def put(self, spreadsheet_id, worksheet_title, revision, loaded_data):
+        if not revision:
+            return
+        with self._lock:
+            self._entries[(spreadsheet_id, worksheet_title)] = (revision, copy_loaded(loaded_data))
+            self._entries.move_to_end((spreadsheet_id, worksheet_title))
+            self.stats["stored"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, spreadsheet_id=None, worksheet_title=None):
+        """항목 삭제 - 인자가 없으면 전체, worksheet_title이 없으면 해당 스프레드시트 전체"""
+        with self._lock:
+            for key in list(self._entries):
+                if spreadsheet_id is None or (key[0] == spreadsheet_id and worksheet_title in (None, key[1])):
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,173 @@
+# plm/sheets_format.py - 제품 데이터 ↔ 워크시트 값(행 목록) 변환
+
+from datetime import datetime
+
+import pandas as pd
+
+from plm.excludes import ExcludeSet, as_exclude_set
+from plm.repository import lead_time_value
+from plm.schedule import backward_schedule
+
+
+def build_product_rows(product_name, product_data, saved_at=None, calendars=None):
+    """제품 데이터를 워크시트에 쓸 행 목록으로 변환 (행 목록, 시작/종료일 계산 오류) - calendars는 backward_schedule에 전달"""
+    # 데이터 준비
+    phases_df = product_data["phases"]
+    excludes = as_exclude_set(product_data["custom_excludes"])
+    target_date = product_data["target_date"].isoformat() if product_data["target_date"] else ""
+    team_members = product_data.get("team_members", [])
+
+    # 헤더와 데이터 준비
+    data_to_write = []
+
+    # 1. 제품 정보
+    data_to_write.extend([
+        ["제품명", product_name],
+        ["목표완료일", target_date],
+        ["저장일시", saved_at or datetime.now().isoformat()],
+        ["제외일 코드", excludes.to_token()],  # 제외일 전체를 비트맵 문자열 한 칸으로 저장
+        [""],  # 빈 줄
+    ])
+
+    # 2. 담당자 목록
+    data_to_write.extend([
+        ["담당자 목록"],
+        ["번호", "담당자명"]
+    ])
+    for i, member in enumerate(team_members, 1):
+        data_to_write.append([i, member])
+    data_to_write.append([""])  # 빈 줄
+
+    # 3. 단계별 데이터
+    data_to_write.extend([
+        ["단계별 개발 일정"],
+        ["단계", "리드타임", "담당자", "Asana Task 코드", "캘린더"]
+    ])
+    for _, row in phases_df.iterrows():
+        data_to_write.append([
+            row["단계"],
+            row["리드타임"],
+            row["담당자"],
+            row["Asana Task 코드"],
+            row.get("캘린더", "") or ""
+        ])
+
+    # 4. 단계별 시작/종료일 계산 및 저장
+    schedule_error = None
+    try:
+        # target_date가 문자열인 경우 date 객체로 변환
+        if isinstance(target_date, str):
+            target_date = datetime.fromisoformat(target_date).date()
+        elif target_date is None:
+            target_date = datetime.today().date()
+
+        # 시작/종료일 계산
+        schedule_data = backward_schedule(target_date, phases_df.to_dict('records'), excludes, calendars)
+        schedule_df = pd.DataFrame(schedule_data)
+
+        data_to_write.extend([
+            [""],  # 빈 줄
+            ["단계별 시작/종료일"],
+            ["단계", "시작일", "종료일", "담당자", "Asana Task 코드"]
+        ])
+
+        for _, row in schedule_df.iterrows():
+            data_to_write.append([
+                row["단계"],
+                row["시작일"].strftime("%Y-%m-%d") if pd.notna(row["시작일"]) else "",
+                row["종료일"].strftime("%Y-%m-%d") if pd.notna(row["종료일"]) else "",
+                row["담당자"],
+                row["Asana Task 코드"]
+            ])
+    except Exception as e:
+        schedule_error = e
+        data_to_write.extend([
+            [""],  # 빈 줄
+            ["단계별 시작/종료일"],
+            ["⚠️ 시작/종료일 계산 실패"]
+        ])
+
+    return data_to_write, schedule_error
+
+
+def parse_product_values(all_data):
+    """worksheet.get_all_values() 결과를 제품 데이터로 파싱"""
+    product_name = ""
+    target_date = None
+    saved_at = ""
+    team_members = []
+    excludes = ExcludeSet()
+    phases_data = []
+
+    current_section = None
+    schedule_data = []  # 시작/종료일 데이터 저장용
+
+    for row in all_data:
+        if not row or not row[0]:  # 빈 줄 건너뛰기
+            continue
+
+        if row[0] == "제품명":
+            product_name = row[1] if len(row) > 1 else ""
+        elif row[0] == "목표완료일":
+            target_date_str = row[1] if len(row) > 1 else ""
+            if target_date_str:
+                target_date = datetime.fromisoformat(target_date_str).date()
+        elif row[0] == "저장일시":
+            saved_at = row[1] if len(row) > 1 else ""
+        elif row[0] == "제외일 코드":
+            excludes.update(ExcludeSet.from_token(row[1] if len(row) > 1 else ""))
+        elif row[0] == "담당자 목록":
+            current_section = "team_members"
+        elif row[0] == "제외일 목록":
+            current_section = "excludes"  # 이전 형식 (제외일 1개당 1행)
+        elif row[0] == "단계별 개발 일정":
+            current_section = "phases"
+        elif row[0] == "단계별 시작/종료일":
+            current_section = "schedule"
+        elif current_section == "team_members" and row[0] != "번호":
+            if len(row) > 1:
+                team_members.append(row[1])
+        elif current_section == "excludes" and row[0] != "번호":
+            if len(row) > 1:
+                try:
+                    exclude_date = datetime.fromisoformat(row[1]).date()
+                    excludes.add(exclude_date)
+                except:
+                    pass
+        elif current_section == "phases" and row[0] != "단계":
+            if len(row) >= 4:
+                phases_data.append({
+                    "단계": row[0],
+                    "리드타임": lead_time_value(row[1]),
+                    "담당자": row[2],
+                    "Asana Task 코드": row[3],
+                    "캘린더": row[4] if len(row) > 4 else ""  # 이전 형식은 캘린더 열 없음
+                })
+        elif current_section == "schedule" and row[0] != "단계" and row[0] != "⚠️ 시작/종료일 계산 실패":
+            if len(row) >= 5:
+                try:
+                    start_date = datetime.strptime(row[1], "%Y-%m-%d").date() if row[1] else None
+                    end_date = datetime.strptime(row[2], "%Y-%m-%d").date() if row[2] else None
+                    schedule_data.append({
+                        "단계": row[0],
+                        "시작일": start_date,
+                        "종료일": end_date,
+                        "담당자": row[3],
+                        "Asana Task 코드": row[4]
+                    })
+                except:
+                    pass
+
+    # DataFrame 생성
+    phases_df = pd.DataFrame(phases_data)
+    schedule_df = pd.DataFrame(schedule_data) if schedule_data else pd.DataFrame()
+
+    return {
+        "product_name": product_name,
+        "phases": phases_df,
+        "schedule": schedule_df,  # 시작/종료일 데이터 추가
+        "custom_excludes": excludes,
+        "target_date": target_date,
+        "team_members": team_members,
+        "saved_at": saved_at,  # 워크시트 버전 (캐시 확인용)
+    }
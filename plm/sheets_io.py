@@ -0,0 +1,157 @@
+# plm/sheets_io.py - Google Sheets API 호출 공통 계층 (할당량 속도 제한, 재시도, 동일 읽기 병합, 호출 통계)
+
+import random
+import threading
+import time
+from collections import defaultdict
+
+from plm.ratelimit import TokenBucket, parse_retry_after
+
+# Sheets API 기본 할당량: 사용자당 분당 60회 (읽기/쓰기 각각) - 두 종류를 한 버킷으로 보수적으로 제한
+SHEETS_QUOTA_PER_MINUTE = 60
+DEFAULT_RATE = SHEETS_QUOTA_PER_MINUTE / 60.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 32.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def error_status(error):
+    """예외의 HTTP 상태 코드 (gspread APIError는 response.status_code, 없으면 None)"""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_seconds(error):
+    """429 응답의 Retry-After 헤더 (초) - 없거나 해석할 수 없으면 None"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+def is_retryable(error):
+    """할당량 초과(429)/일시적 서버 오류(5xx)/연결 오류만 재시도 (WorksheetNotFound 등은 즉시 실패)"""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRY_STATUSES
+    return isinstance(error, (OSError, TimeoutError))
+
+
+class SheetsIO:
+    """모든 Sheets 호출이 거쳐 가는 계층 - 프로세스 전체가 버킷 1개를 공유
+
+    - 호출 전 토큰 버킷으로 할당량 이하 속도 유지 (429가 오면 Retry-After만큼 모든 호출이 함께 쉼)
+    - 429/5xx/연결 오류는 지수 백오프(+지터)로 재시도
+    - 같은 dedupe_key의 읽기가 진행 중이면 새로 호출하지 않고 그 결과를 기다림 (single-flight)
+    - 호출 이름별 횟수/재시도/오류/병합/지연 시간 집계
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=1.0, max_delay=MAX_BACKOFF_SECONDS, bucket=None, sleep=time.sleep):
+        self.bucket = bucket or TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {
+            "calls": 0, "requests": 0, "retries": 0, "errors": 0, "coalesced": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "wait_ms": 0.0,
+        })
+
+    # ✅ 호출
+    def call(self, name, fn, *args, dedupe_key=None, **kwargs):
+        """fn(*args, **kwargs) 실행 - dedupe_key가 있으면 같은 키의 진행 중 호출과 결과를 공유 (읽기 전용에만 사용)"""
+        if dedupe_key is None:
+            return self._call_with_retry(name, fn, args, kwargs)
+
+        key = (name, dedupe_key)
+        with self._lock:
+            waiter = self._inflight.get(key)
+            owner = waiter is None
+            if owner:
+                waiter = self._inflight[key] = {"event": threading.Event(), "result": None, "error": None}
+            else:
+                self._stats[name]["coalesced"] += 1
+
+        if not owner:
+            waiter["event"].wait()
+            if waiter["error"] is not None:
+                raise waiter["error"]
+            return waiter["result"]
+
+        try:
+            waiter["result"] = self._call_with_retry(name, fn, args, kwargs)
+            return waiter["result"]
+        except Exception as e:
+            waiter["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter["event"].set()
+
+    def backoff(self, attempt):
+        """attempt번째 재시도 전 대기 시간 - 지수 증가(상한 max_delay) × 0.5~1 지터"""
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _call_with_retry(self, name, fn, args, kwargs):
+        started = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                waited = self.bucket.acquire()
+                self._count(name, requests=1, wait_ms=waited * 1000)
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt == self.max_retries or not is_retryable(e):
+                        self._count(name, errors=1)
+                        raise
+                    self._count(name, retries=1)
+                    retry_after = retry_after_seconds(e)
+                    if retry_after:
+                        # 서버가 알려준 시간만큼 다른 호출도 함께 쉬도록 버킷에 반영
+                        self.bucket.penalize(retry_after)
+                    else:
+                        self._sleep(self.backoff(attempt))
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats = self._stats[name]
+                stats["calls"] += 1
+                stats["total_ms"] += elapsed_ms
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def _count(self, name, **deltas):
+        with self._lock:
+            stats = self._stats[name]
+            for field, delta in deltas.items():
+                stats[field] += delta
+
+    # ✅ 통계
+    def snapshot_stats(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def summary(self):
+        """호출 이름별 통계 표 (평균은 재시도/대기 포함 전체 소요 시간 기준)"""
+        rows = []
+        for name, stats in sorted(self.snapshot_stats().items()):
+            rows.append({
+                "호출": name,
+                "횟수": stats["calls"],
+                "요청": stats["requests"],
+                "재시도": stats["retries"],
+                "오류": stats["errors"],
+                "병합": stats["coalesced"],
+                "평균(ms)": round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0,
+                "최대(ms)": round(stats["max_ms"], 2),
+                "속도 제한 대기(ms)": round(stats["wait_ms"], 2),
+            })
+        return rows
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
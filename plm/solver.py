@@ -0,0 +1,150 @@
+# plm/solver.py - 목표 완료일을 지키기 위한 리드타임 단축 계획 (최소 비용)
+
+from datetime import date
+
+import numpy as np
+
+from plm.calendars import phase_calendars
+from plm.schedule import BusinessDayIndex, backward_schedule
+
+DEFAULT_CRASH_COST = 1.0
+
+
+def default_min_lead_time(lead_time):
+    """최소 리드타임 기본값 - 원래 리드타임의 75% (올림)"""
+    lead_time = max(int(lead_time), 0)
+    return lead_time - lead_time // 4
+
+
+def _cheapest_starts(phase_starts, target_date, leads, mins, costs):
+    """단계별 (시작일 → 최소 단축 비용, 선택한 리드타임, 다음 단계 시작일) 표를 뒤 단계부터 계산
+
+    시작일 규칙상 하루 단축해도 시작일이 0일 또는 2일 당겨질 수 있어(주말/제외일 경계) 단계별
+    독립 계산이 아니라 '다음 단계 시작일(서수)'을 상태로 두는 동적 계획법으로 푼다.
+    phase_starts[i](종료일 서수 배열, 리드타임) → 시작일 서수 배열: 단계 i의 근무일 규칙 (제품 제외일 또는 근무 캘린더)
+    상태 수는 단계 기간의 근무일 수 정도, 단계마다 (리드타임 후보 수 × 상태 수) 크기의 numpy 연산 한 번.
+    """
+    states = np.array([target_date.toordinal()], dtype=np.int64)
+    state_cost = np.zeros(1)
+    tables = []
+    for i in range(len(leads) - 1, -1, -1):
+        # (리드타임 후보 × 상태) 조합을 한 번에 역산
+        choices = np.arange(mins[i], leads[i] + 1, dtype=np.int64)
+        lead = np.repeat(choices, len(states))
+        ends = np.tile(states, len(choices))
+        cost = np.tile(state_cost, len(choices)) + (leads[i] - lead) * costs[i]
+        tables.append(_best_per_position(phase_starts[i](ends, lead), cost, lead, ends))
+        states, state_cost = tables[-1][0], tables[-1][1]
+    return tables[::-1]
+
+
+def _backward_first_start(phase_starts, target_date, leads):
+    """phase_starts 규칙으로 역산한 첫 단계 시작일 서수 (단계가 없으면 목표일)"""
+    end = np.array([target_date.toordinal()], dtype=np.int64)
+    for starts, lead in zip(reversed(phase_starts), reversed(leads)):
+        end = starts(end, lead)
+    return int(end[0])
+
+
+def _best_per_position(positions, cost, lead, previous):
+    """같은 시작 위치 후보 중 비용이 가장 낮은 것만 남김"""
+    order = np.lexsort((cost, positions))
+    positions, cost, lead, previous = positions[order], cost[order], lead[order], previous[order]
+    first = np.ones(len(positions), dtype=bool)
+    first[1:] = positions[1:] != positions[:-1]
+    return positions[first], cost[first], lead[first], previous[first]
+
+
+def solve_compression(target_date, phases, excluded_days, earliest_start=None, min_lead_times=None, crash_costs=None,
+                      calendars=None):
+    """첫 단계 시작일이 earliest_start(기본: 오늘) 이후가 되도록 리드타임을 최소 비용으로 단축
+
+    phases: backward_schedule과 같은 단계 dict 목록
+    min_lead_times / crash_costs: 단계별 최소 리드타임, 하루 단축 비용 (없으면 기본값)
+    calendars: 이름 → WorkingCalendar - 캘린더 단계는 그 캘린더의 근무일로 계산 (backward_schedule과 같은 규칙)
+
+    근무일 인덱스 위의 동적 계획법으로 최소 비용 해를 구하고 backward_schedule로 다시 검증한다.
+
+    반환 dict: feasible, verified, lead_times, cost, compressed(단계별 변경 목록),
+               original_start, start, earliest_start, shortfall(단축 전 부족 근무일 수, 제품 기본 캘린더 기준)
+    """
+    earliest_start = earliest_start or date.today()
+    leads = [max(int(phase.get("리드타임") or 0), 0) for phase in phases]
+    mins = [
+        min(max(int(m), 0), lead) for m, lead in zip(
+            min_lead_times if min_lead_times is not None else [default_min_lead_time(lead) for lead in leads], leads
+        )
+    ]
+    costs = [
+        float(c) if c is not None and c == c else DEFAULT_CRASH_COST
+        for c in (crash_costs if crash_costs is not None else [DEFAULT_CRASH_COST] * len(leads))
+    ]
+
+    # 원래 일정을 역산할 수 있을 때까지 제품 기본 캘린더 인덱스를 넓힘 (단축하면 모든 시작일이 늦어지므로 이 범위면 충분)
+    calendars_by_phase = phase_calendars(phases, calendars)
+    index = BusinessDayIndex.covering(target_date, leads, excluded_days)
+    while True:
+        phase_starts = [
+            calendar.backward_starts if calendar is not None else index.backward_starts
+            for calendar in calendars_by_phase
+        ]
+        try:
+            original_start = date.fromordinal(_backward_first_start(phase_starts, target_date, leads))
+            break
+        except IndexError:
+            index = BusinessDayIndex(index.start - (index.end - index.start), index.end, excluded_days)
+
+    result = {
+        "feasible": True,
+        "verified": True,
+        "lead_times": list(leads),
+        "cost": 0.0,
+        "compressed": [],
+        "original_start": original_start,
+        "start": original_start,
+        "earliest_start": earliest_start,
+        "shortfall": max(index.position(earliest_start) - index.position(original_start), 0),
+    }
+    if not leads or original_start >= earliest_start:
+        return result
+
+    tables = _cheapest_starts(phase_starts, target_date, leads, mins, costs)
+    positions, position_cost = tables[0][0], tables[0][1]
+    feasible = positions >= earliest_start.toordinal()
+    if not feasible.any():
+        # 최소 리드타임까지 줄여도 부족 - 가장 늦출 수 있는 시작일을 알려줌
+        result.update(feasible=False, lead_times=list(mins), start=date.fromordinal(int(positions.max())))
+        result["cost"] = sum((leads[i] - mins[i]) * costs[i] for i in range(len(leads)))
+        return result
+
+    # 비용이 가장 낮은 해 (같으면 시작일이 더 늦은 쪽), 앞 단계부터 선택을 따라가며 복원
+    candidates = np.flatnonzero(feasible)
+    best = candidates[np.lexsort((-positions[candidates], position_cost[candidates]))[0]]
+    start = int(positions[best])
+    current, state = [], start
+    for table_positions, _, table_lead, table_previous in tables:
+        row = int(np.searchsorted(table_positions, state))
+        current.append(int(table_lead[row]))
+        state = int(table_previous[row])
+
+    # 실제 역산 함수로 검증
+    compressed_phases = [dict(phase, 리드타임=lead) for phase, lead in zip(phases, current)]
+    verified_start = backward_schedule(target_date, compressed_phases, excluded_days, calendars)[0]["시작일"]
+
+    result.update(
+        lead_times=current,
+        start=date.fromordinal(start),
+        verified=verified_start == date.fromordinal(start) and verified_start >= earliest_start,
+        cost=sum((leads[i] - current[i]) * costs[i] for i in range(len(leads))),
+        compressed=[
+            {
+                "단계": phases[i].get("단계", ""),
+                "기존 리드타임": leads[i],
+                "단축 리드타임": current[i],
+                "단축일": leads[i] - current[i],
+                "비용": (leads[i] - current[i]) * costs[i],
+            }
+            for i in range(len(leads)) if current[i] != leads[i]
+        ],
+    )
+    return result
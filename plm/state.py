@@ -0,0 +1,189 @@
+# plm/state.py - 불변(copy-on-write) 제품 상태 - 실제로 바뀐 부분만 새로 만들고 나머지는 공유
+
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+from plm.excludes import ExcludeSet, as_exclude_set
+from plm.repository import lead_time_value
+
+PHASE_COLUMNS = ["단계", "리드타임", "담당자", "Asana Task 코드", "캘린더"]
+_TEXT_COLUMNS = ("단계", "담당자", "Asana Task 코드", "캘린더")
+
+
+def _text(value):
+    """셀 값을 문자열로 (None/NaN은 빈 문자열)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+@dataclass(frozen=True)
+class PhaseRecord:
+    """단계 1개 (불변, 같은 값이면 버전 간에 같은 객체를 공유)"""
+
+    __slots__ = ("name", "lead_time", "assignee", "asana_code", "calendar")
+    name: str
+    lead_time: int
+    assignee: str
+    asana_code: str
+    calendar: str  # 근무 캘린더 이름 (plm.calendars, 비우면 제품 제외일 기준)
+
+    @classmethod
+    def from_dict(cls, row):
+        return cls(
+            _text(row.get("단계")),
+            lead_time_value(row.get("리드타임")),
+            _text(row.get("담당자")),
+            _text(row.get("Asana Task 코드") or row.get("비고")),
+            _text(row.get("캘린더")).strip(),
+        )
+
+    def to_dict(self):
+        return {"단계": self.name, "리드타임": self.lead_time, "담당자": self.assignee, "Asana Task 코드": self.asana_code,
+                "캘린더": self.calendar}
+
+
+def phase_records(phases, previous=()):
+    """DataFrame/dict 목록 → PhaseRecord 튜플 (previous에 같은 값이 있으면 그 객체를 재사용)"""
+    rows = phases.to_dict(orient="records") if isinstance(phases, pd.DataFrame) else phases
+    shared = {record: record for record in previous}
+    records = []
+    for row in rows:
+        record = row if isinstance(row, PhaseRecord) else PhaseRecord.from_dict(row)
+        records.append(shared.get(record, record))
+    return tuple(records)
+
+
+def phases_frame(records):
+    """PhaseRecord 튜플 → 앱에서 쓰는 타입(문자열/정수)으로 맞춘 DataFrame"""
+    return pd.DataFrame(
+        [(r.name, r.lead_time, r.assignee, r.asana_code, r.calendar) for r in records],
+        columns=PHASE_COLUMNS,
+    ).astype({"단계": object, "리드타임": "int64", "담당자": object, "Asana Task 코드": object, "캘린더": object})
+
+
+def normalize_phases_frame(df):
+    """컬럼/타입이 이미 맞으면 그대로, 아니면 새 DataFrame 반환 (제자리 수정하지 않음)"""
+    if list(df.columns) == PHASE_COLUMNS and df["리드타임"].dtype == "int64" and all(
+        df[column].map(type).eq(str).all() for column in _TEXT_COLUMNS
+    ):
+        return df
+    return phases_frame(phase_records(df))
+
+
+@dataclass(frozen=True, eq=False)
+class ProductState(Mapping):
+    """제품 1개의 불변 상태 - 기존 제품 dict처럼 product["phases"] 등으로 읽을 수 있음
+
+    with_changes()는 값이 같으면 self를 그대로 돌려주므로 재실행 시 새 객체가 생기지 않는다.
+    custom_excludes는 공유되므로 제자리 수정 대신 새 ExcludeSet을 만들어 with_changes()에 넘긴다.
+    """
+
+    __slots__ = ("phases", "custom_excludes", "target_date", "team_members", "_frame", "_digest")
+    phases: tuple
+    custom_excludes: ExcludeSet
+    target_date: object
+    team_members: tuple
+
+    _KEYS = ("phases", "custom_excludes", "target_date", "team_members")
+
+    def __post_init__(self):
+        object.__setattr__(self, "_frame", None)
+        object.__setattr__(self, "_digest", None)
+
+    @classmethod
+    def from_product(cls, product_data):
+        """제품 dict(또는 ProductState) → ProductState"""
+        if isinstance(product_data, ProductState):
+            return product_data
+        phases = product_data.get("phases")
+        return cls(
+            phase_records(phases if phases is not None else ()),
+            as_exclude_set(product_data.get("custom_excludes")),
+            product_data.get("target_date"),
+            tuple(product_data.get("team_members") or ()),
+        )
+
+    # ✅ dict 호환 읽기 (phases는 캐시된 DataFrame)
+    def __getitem__(self, key):
+        if key == "phases":
+            return self.phases_frame()
+        if key in self._KEYS:
+            return list(self.team_members) if key == "team_members" else getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def phases_frame(self):
+        """단계 DataFrame (처음 한 번만 만들고 캐시 - 공유 객체이므로 제자리 수정 금지)"""
+        if self._frame is None:
+            object.__setattr__(self, "_frame", phases_frame(self.phases))
+        return self._frame
+
+    def digest(self):
+        """내용 해시 (같은 내용이면 같은 값 - 상태 객체마다 한 번만 계산)"""
+        if self._digest is None:
+            h = hashlib.sha1()
+            for record in self.phases:
+                h.update(repr((record.name, record.lead_time, record.assignee, record.asana_code, record.calendar)).encode("utf-8"))
+            target = self.target_date.isoformat() if self.target_date else ""
+            h.update(f"|{self.custom_excludes.to_token()}|{target}|{self.team_members!r}".encode("utf-8"))
+            object.__setattr__(self, "_digest", h.hexdigest())
+        return self._digest
+
+    def phase_dicts(self):
+        """backward_schedule에 넘길 단계 dict 목록 (DataFrame을 만들지 않음)"""
+        return [record.to_dict() for record in self.phases]
+
+    # ✅ copy-on-write 갱신
+    def with_changes(self, phases=None, custom_excludes=None, target_date=None, team_members=None):
+        """바뀐 필드만 교체한 새 상태 (아무것도 바뀌지 않았으면 self)"""
+        changes = {}
+        if phases is not None and phases is not self._frame:
+            records = phase_records(phases, self.phases)
+            if records != self.phases:
+                changes["phases"] = records
+        if custom_excludes is not None and custom_excludes is not self.custom_excludes:
+            if as_exclude_set(custom_excludes) != self.custom_excludes:
+                changes["custom_excludes"] = as_exclude_set(custom_excludes)
+        if target_date is not None and target_date != self.target_date:
+            changes["target_date"] = target_date
+        if team_members is not None and tuple(team_members) != self.team_members:
+            changes["team_members"] = tuple(team_members)
+        if not changes:
+            return self
+        updated = replace(self, **changes)
+        if "phases" not in changes:
+            object.__setattr__(updated, "_frame", self._frame)
+        return updated
+
+
+class SyncTracker:
+    """저장 대상(로컬 파일, Sheets 등)별로 마지막 동기화 때의 제품 내용 해시를 기억해 변경 여부 판단"""
+
+    def __init__(self):
+        self._synced = {}
+
+    def mark_synced(self, target, product_name, product_state):
+        self._synced.setdefault(target, {})[product_name] = product_state.digest()
+
+    def forget(self, product_name):
+        for synced in self._synced.values():
+            synced.pop(product_name, None)
+
+    def is_dirty(self, target, product_name, product_state):
+        return self._synced.get(target, {}).get(product_name) != product_state.digest()
+
+    def dirty(self, target, products):
+        """마지막 동기화 이후 바뀐(또는 한 번도 동기화하지 않은) 제품명 목록"""
+        return [name for name, state in products.items() if self.is_dirty(target, name, state)]
@@ -0,0 +1,244 @@
+# plm/storage.py - 제품 저장소 공통 인터페이스 (Google Sheets / 로컬 JSON / SQLite / 메모리 내 가짜 Sheets)
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from plm.fake_sheets import FakeSheetsBackend
+from plm.repository import ProductRepository, product_from_json, product_to_json
+from plm.sheets_cache import REVISION_CELL, response_revision, response_values, sheet_range
+from plm.sheets_format import build_product_rows, parse_product_values
+from plm.sheets_io import error_status, is_retryable
+
+SHEET_SUFFIX = "_데이터"
+
+
+class StorageBackend(ABC):
+    """제품 저장소 인터페이스 - 빠진 메서드가 있는 구현은 생성할 때 TypeError"""
+
+    label = ""
+
+    @abstractmethod
+    def names(self):
+        """저장된 제품명 목록"""
+
+    @abstractmethod
+    def load(self, product_name):
+        """제품 데이터 dict (phases DataFrame, custom_excludes, target_date, team_members) - 없으면 None"""
+
+    @abstractmethod
+    def save(self, product_name, product_data):
+        """저장 후 새 버전 문자열"""
+
+    @abstractmethod
+    def delete(self, product_name):
+        """삭제했으면 True"""
+
+    @abstractmethod
+    def revision(self, product_name):
+        """본문을 읽지 않고 확인하는 버전 문자열 (저장할 때마다 바뀜) - 없으면 None"""
+
+    def __contains__(self, product_name):
+        return self.revision(product_name) is not None
+
+
+# ✅ 로컬 JSON (*_product_data.json 디렉터리)
+class JsonStorage(StorageBackend):
+    label = "로컬 JSON"
+
+    def __init__(self, repository):
+        self.repository = repository if isinstance(repository, ProductRepository) else ProductRepository(repository)
+
+    def names(self):
+        return self.repository.names()
+
+    def load(self, product_name):
+        return self.repository.load(product_name)
+
+    def save(self, product_name, product_data):
+        self.repository.save(product_name, product_data)
+        return self.revision(product_name)
+
+    def delete(self, product_name):
+        return self.repository.delete(product_name)
+
+    def revision(self, product_name):
+        entry = self.repository.summary(product_name)
+        return entry["saved_at"] if entry else None
+
+
+# ✅ SQLite (파일 1개, 제품당 1행 - 본문은 JSON 파일과 같은 형식)
+class SqliteStorage(StorageBackend):
+    label = "SQLite"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "name TEXT PRIMARY KEY, data TEXT NOT NULL, version INTEGER NOT NULL, saved_at TEXT NOT NULL)"
+            )
+
+    def names(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM products ORDER BY rowid")]
+
+    def load(self, product_name):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM products WHERE name = ?", (product_name,)).fetchone()
+        return product_from_json(json.loads(row[0])) if row else None
+
+    def save(self, product_name, product_data):
+        data = product_to_json(product_name, product_data)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO products (name, data, version, saved_at) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data, version = version + 1, saved_at = excluded.saved_at",
+                (product_name, json.dumps(data, ensure_ascii=False), data["saved_at"]),
+            )
+            version = self._conn.execute("SELECT version FROM products WHERE name = ?", (product_name,)).fetchone()[0]
+        return str(version)
+
+    def delete(self, product_name):
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM products WHERE name = ?", (product_name,)).rowcount > 0
+
+    def revision(self, product_name):
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM products WHERE name = ?", (product_name,)).fetchone()
+        return str(row[0]) if row else None
+
+    def close(self):
+        self._conn.close()
+
+
+# ✅ Google Sheets (제품당 '<제품명>_데이터' 워크시트 1개)
+def sheet_cell_text(value):
+    """쓴 값 → Sheets가 돌려주는 표시 문자열과 같은 형태 (정수인 실수는 '20', None은 빈 칸)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _direct_call(name, fn, *args, dedupe_key=None, **kwargs):
+    return fn(*args, **kwargs)
+
+
+class SheetsStorage(StorageBackend):
+    """열려 있는 스프레드시트(gspread 또는 plm.fake_sheets) 위의 저장소
+
+    call: Sheets 호출 함수 (SheetsIO.call 또는 앱의 sheets_call) - 없으면 바로 호출
+    cache: ProductSheetCache - 있으면 저장일시 셀이 같을 때 전체 값을 다시 받지 않음
+    calendars: 단계별 근무 캘린더 (저장할 때 '단계별 시작/종료일' 계산에 사용)
+    """
+
+    label = "Google Sheets"
+
+    def __init__(self, spreadsheet, call=None, cache=None, calendars=None):
+        self.spreadsheet = spreadsheet
+        self.call = call or _direct_call
+        self.cache = cache
+        self.calendars = calendars
+
+    @property
+    def spreadsheet_id(self):
+        return self.spreadsheet.id
+
+    @staticmethod
+    def worksheet_title(product_name):
+        return f"{product_name}{SHEET_SUFFIX}"
+
+    def names(self):
+        worksheets = self.call("worksheets", self.spreadsheet.worksheets, dedupe_key=self.spreadsheet_id)
+        return [ws.title[:-len(SHEET_SUFFIX)] for ws in worksheets if ws.title.endswith(SHEET_SUFFIX)]
+
+    def revision(self, product_name):
+        """저장일시 셀 1칸만 읽음 - 워크시트가 없으면 None"""
+        title = self.worksheet_title(product_name)
+        try:
+            response = self.call(
+                "values_get", self.spreadsheet.values_get, sheet_range(title, REVISION_CELL),
+                dedupe_key=(self.spreadsheet_id, title, REVISION_CELL),
+            )
+        except Exception as e:
+            if error_status(e) == 400:  # 없는 시트 이름은 범위 해석 오류(400)
+                return None
+            raise
+        return response_revision(response)
+
+    def load(self, product_name):
+        title = self.worksheet_title(product_name)
+        if self.cache is not None:
+            revision = self.revision(product_name)
+            if revision is None:
+                return None
+            cached = self.cache.get(self.spreadsheet_id, title, revision)
+            if cached is not None:
+                return cached
+        try:
+            all_data = response_values(self.call(
+                "get_all_values", self.spreadsheet.values_get, sheet_range(title),
+                dedupe_key=(self.spreadsheet_id, title),
+            ))
+        except Exception as e:
+            if error_status(e) == 400:
+                return None
+            raise
+        # 전체 값의 저장일시로 캐시 - 두 번 읽는 사이 저장되어도 버전이 맞음
+        loaded_data = parse_product_values(all_data)
+        if self.cache is not None:
+            self.cache.put(self.spreadsheet_id, title, loaded_data["saved_at"], loaded_data)
+        return loaded_data
+
+    def write_rows(self, product_name, rows, saved_at):
+        """워크시트를 새로 만들어 rows 쓰기 (기존 탭은 삭제) - build_product_rows 결과를 그대로 받음"""
+        title = self.worksheet_title(product_name)
+        try:
+            existing = self.call("worksheet", self.spreadsheet.worksheet, title)
+        except Exception as e:
+            if is_retryable(e):
+                raise
+            existing = None  # 없는 탭 (gspread WorksheetNotFound)
+        if existing is not None:
+            self.call("del_worksheet", self.spreadsheet.del_worksheet, existing)
+        worksheet = self.call("add_worksheet", self.spreadsheet.add_worksheet, title=title, rows=100, cols=20)
+        self.call("update", worksheet.update, "A1", rows)
+
+        # 방금 쓴 값으로 캐시를 채워 다시 불러올 때 전체 값을 받지 않음
+        if self.cache is not None:
+            written = [[sheet_cell_text(value) for value in row] for row in rows]
+            self.cache.put(self.spreadsheet_id, title, saved_at, parse_product_values(written))
+        return saved_at
+
+    def save(self, product_name, product_data):
+        saved_at = datetime.now().isoformat()
+        rows, _ = build_product_rows(product_name, product_data, saved_at=saved_at, calendars=self.calendars)
+        return self.write_rows(product_name, rows, saved_at)
+
+    def delete(self, product_name):
+        title = self.worksheet_title(product_name)
+        try:
+            worksheet = self.call("worksheet", self.spreadsheet.worksheet, title)
+        except Exception as e:
+            if is_retryable(e):
+                raise
+            return False
+        self.call("del_worksheet", self.spreadsheet.del_worksheet, worksheet)
+        if self.cache is not None:
+            self.cache.invalidate(self.spreadsheet_id, title)
+        return True
+
+
+def fake_sheets_storage(quota_per_minute=None, latency=0.0, call=None, cache=None, **backend_options):
+    """메모리 내 가짜 Sheets 위의 저장소 - (저장소, 가짜 백엔드) 반환 (오프라인 테스트/벤치마크용)"""
+    backend = FakeSheetsBackend(quota_per_minute=quota_per_minute, latency=latency, **backend_options)
+    spreadsheet = backend.client().create("이퀄베리_PLM_데이터")
+    return SheetsStorage(spreadsheet, call=call, cache=cache), backend
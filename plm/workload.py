@@ -0,0 +1,94 @@
+# plm/workload.py - 담당자별 주간 근무일 부하 계산
+
+import numpy as np
+import pandas as pd
+
+from plm.excludes import ExcludeSet
+from plm.portfolio import occupied_ends
+
+UNASSIGNED = "미정"
+
+
+def _holiday_array(excluded_days):
+    if isinstance(excluded_days, ExcludeSet):
+        return excluded_days.to_datetime64()
+    if not excluded_days:
+        return np.array([], dtype="datetime64[D]")
+    return np.array(sorted(excluded_days), dtype="datetime64[D]")
+
+
+def split_by_week(starts, ends):
+    """[시작일, 종료일] 구간들을 ISO 주(월~일) 경계로 분할 (일 단위로 전개하지 않음)
+
+    반환: (원본 행 번호, 주 시작일(월), 조각 시작일, 조각 종료일) - 모두 numpy 배열
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    ends = np.asarray(ends, dtype="datetime64[D]")
+    # 1970-01-01은 목요일이므로 +3 하면 월요일=0 기준 요일이 됨
+    start_monday = starts - ((starts.astype(np.int64) + 3) % 7)
+    end_monday = ends - ((ends.astype(np.int64) + 3) % 7)
+    week_counts = np.maximum((end_monday - start_monday).astype(np.int64) // 7 + 1, 0)
+
+    rows = np.repeat(np.arange(len(starts)), week_counts)
+    first_piece = np.repeat(np.cumsum(week_counts) - week_counts, week_counts)
+    week_offset = np.arange(len(rows)) - first_piece
+    week_start = start_monday[rows] + week_offset * 7
+    piece_start = np.maximum(starts[rows], week_start)
+    piece_end = np.minimum(ends[rows], week_start + 6)
+    return rows, week_start, piece_start, piece_end
+
+
+def weekly_workload(portfolio_df, holidays_by_product=None, members=None, calendars=None):
+    """담당자 × ISO 주차별 근무일 부하 (주말/제품별 제외일 제외, 앞 단계와 겹치는 인계일은 다음 단계에만 셈)
+
+    portfolio_df: compute_portfolio_schedule 결과 (제품, 시작일, 종료일, 담당자, 캘린더)
+    holidays_by_product: {제품명: 제외일 집합}
+    members: 부하가 없어도 행으로 표시할 담당자 목록
+    calendars: 이름 → WorkingCalendar - 캘린더가 지정된 단계는 그 캘린더의 근무 요일/휴일로 셈 (backward_schedule과 같은 규칙)
+    """
+    holidays_by_product = holidays_by_product or {}
+    if portfolio_df.empty:
+        return pd.DataFrame(index=pd.Index(list(members or []), name="담당자"))
+
+    rows, week_start, piece_start, piece_end = split_by_week(portfolio_df["시작일"].to_numpy(), occupied_ends(portfolio_df))
+    products = portfolio_df["제품"].to_numpy()[rows]
+    loads = np.zeros(len(rows), dtype=np.int64)
+
+    # 근무 캘린더가 지정된 단계는 캘린더 단위로 한 번씩 벡터 연산
+    on_calendar = np.zeros(len(rows), dtype=bool)
+    if calendars and "캘린더" in portfolio_df:
+        calendar_names = portfolio_df["캘린더"].fillna("").astype(str).to_numpy()[rows]
+        for name in pd.unique(calendar_names):
+            calendar = calendars.get(name) if name else None
+            if calendar is None:
+                continue
+            mask = calendar_names == name
+            on_calendar |= mask
+            loads[mask] = np.busday_count(
+                piece_start[mask], piece_end[mask] + 1,
+                weekmask=calendar.weekmask, holidays=calendar.holidays.to_datetime64(),
+            )
+
+    # 나머지는 제외일이 제품마다 다를 수 있으므로 제품 단위로 한 번씩 벡터 연산
+    for product_name in pd.unique(products[~on_calendar]):
+        mask = (products == product_name) & ~on_calendar
+        holidays = _holiday_array(holidays_by_product.get(product_name))
+        loads[mask] = np.busday_count(piece_start[mask], piece_end[mask] + 1, holidays=holidays)
+
+    assignees = portfolio_df["담당자"].fillna("").astype(str).replace("", UNASSIGNED).to_numpy()[rows]
+    iso = pd.DatetimeIndex(week_start).isocalendar()
+    week_labels = iso["year"].astype(str).to_numpy() + "-W" + iso["week"].astype(str).str.zfill(2).to_numpy()
+
+    load_df = pd.DataFrame({"담당자": assignees, "주차": week_labels, "근무일": loads})
+    pivot = load_df.pivot_table(index="담당자", columns="주차", values="근무일", aggfunc="sum", fill_value=0)
+    pivot = pivot.reindex(columns=sorted(pivot.columns))
+
+    if members:
+        extra = [member for member in members if member not in pivot.index]
+        if extra:
+            pivot = pd.concat([pivot, pd.DataFrame(0, index=extra, columns=pivot.columns)])
+        ordered = [member for member in members if member in pivot.index]
+        ordered += [member for member in pivot.index if member not in ordered]
+        pivot = pivot.reindex(ordered)
+    pivot.index.name = "담당자"
+    return pivot.astype(int)
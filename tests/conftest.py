@@ -0,0 +1,35 @@
+# tests/conftest.py - 공용 픽스처 (저장소 루트를 import 경로에 추가)
+
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plm.excludes import ExcludeSet  # noqa: E402
+
+
+def make_product(lead_times=(5, 10, 3), target_date=date(2026, 3, 31), excludes=(date(2026, 3, 2),),
+                 codes=None, calendars=None, members=("김담당",)):
+    """테스트용 제품 데이터 1개 (앱/저장소와 같은 dict 형식)"""
+    codes = codes or [""] * len(lead_times)
+    calendars = calendars or [""] * len(lead_times)
+    phases = pd.DataFrame([
+        {"단계": f"단계 {i + 1}", "리드타임": lead, "담당자": members[0] if members else "",
+         "Asana Task 코드": code, "캘린더": calendar}
+        for i, (lead, code, calendar) in enumerate(zip(lead_times, codes, calendars))
+    ])
+    return {
+        "phases": phases,
+        "custom_excludes": ExcludeSet(excludes),
+        "target_date": target_date,
+        "team_members": list(members),
+    }
+
+
+@pytest.fixture
+def product():
+    return make_product()
@@ -0,0 +1,164 @@
+# tests/test_api.py - 로컬 일정 API: /schedule LRU 캐시, 동일 요청 병합(single-flight), 요청 검증
+
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date
+
+import pytest
+
+import plm.api as api
+from conftest import make_product
+from plm.api import MAX_LEAD_TIME, ApiError, ScheduleService, make_server
+from plm.repository import ProductRepository
+from plm.schedule import backward_schedule
+
+PAYLOAD = {
+    "target_date": "2026-03-31",
+    "phases": [{"단계": "기획", "리드타임": 5, "Asana Task 코드": "1201"}, {"단계": "생산", "리드타임": 3}],
+    "custom_excludes": ["2026-03-30"],
+}
+
+
+@pytest.fixture
+def server(tmp_path):
+    ProductRepository(str(tmp_path)).save("세럼", make_product(codes=["1201", "", "1203"]))
+    server = make_server(port=0, service=ScheduleService(ProductRepository(str(tmp_path)), cache_size=2))
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, payload=None):
+    host, port = server.server_address[:2]
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(f"http://{host}:{port}{path}", data=data), timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_schedule_matches_backward_schedule():
+    body = json.loads(ScheduleService().schedule(PAYLOAD))
+    expected = backward_schedule(date(2026, 3, 31), PAYLOAD["phases"], {date(2026, 3, 30)})
+    assert [row["시작일"] for row in body["schedule"]] == [row["시작일"].isoformat() for row in expected]
+    assert body["by_task"]["1201"]["단계"] == "기획"
+
+
+def test_lru_cache_hits_and_evicts():
+    service = ScheduleService(cache_size=2)
+    payloads = [dict(PAYLOAD, target_date=f"2026-03-{day}") for day in (27, 30, 31)]
+
+    first = service.schedule(payloads[0])
+    # 키 순서가 달라도 같은 요청
+    assert service.schedule(dict(reversed(list(payloads[0].items())))) is first
+    assert service.stats["hits"] == 1 and service.stats["misses"] == 1
+
+    service.schedule(payloads[1])
+    service.schedule(payloads[0])  # 가장 최근 사용으로 이동
+    service.schedule(payloads[2])  # payloads[1]이 밀려남
+    assert service.snapshot_stats()["cached"] == 2
+    misses = service.stats["misses"]
+    service.schedule(payloads[0])
+    assert service.stats["misses"] == misses
+    service.schedule(payloads[1])
+    assert service.stats["misses"] == misses + 1
+
+
+def test_identical_concurrent_requests_compute_once(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_schedule(*args):
+        calls.append(1)
+        release.wait(5)
+        return backward_schedule(*args)
+
+    monkeypatch.setattr(api, "backward_schedule", slow_schedule)
+    service = ScheduleService()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.schedule(PAYLOAD))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while service.snapshot_stats()["coalesced"] < 7:
+        assert time.monotonic() < deadline, "동시 요청이 병합되지 않았습니다"
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 8 and len(set(results)) == 1
+    assert service.stats["misses"] == 1 and service.stats["coalesced"] == 7
+
+
+def test_failed_computation_is_not_cached():
+    service = ScheduleService()
+    with pytest.raises(ApiError) as error:
+        service.schedule(dict(PAYLOAD, target_date="3월 말"))
+    assert error.value.status == 400
+    assert service.snapshot_stats()["cached"] == 0
+
+
+def test_product_requests_over_http(server):
+    status, body = request(server, "/schedule", {"product": "세럼"})
+    assert status == 200 and body["product"] == "세럼"
+    assert request(server, "/schedule", {"product": "세럼"})[1] == body
+    assert request(server, "/stats")[1]["hits"] == 1
+
+    status, body = request(server, "/tasks/1203")
+    assert status == 200 and body["matches"][0]["단계"] == "단계 3"
+
+
+@pytest.mark.parametrize("payload, status", [
+    ({"product": 3}, 400),
+    ({"product": ["세럼"]}, 400),
+    ({"product": None}, 400),
+    ({"product": "없는 제품"}, 404),
+    ({"target_date": "2026-03-31"}, 400),
+    ({"target_date": "bad", "phases": []}, 400),
+    ({"target_date": "2026-03-31", "phases": [{"단계": "기획", "리드타임": MAX_LEAD_TIME + 1}]}, 400),
+    ({"target_date": "2026-03-31", "phases": [{"단계": "기획", "리드타임": 10 ** 9}]}, 400),
+    ([1, 2], 400),
+])
+def test_malformed_requests_are_client_errors(server, payload, status):
+    code, body = request(server, "/schedule", payload)
+    assert code == status
+    assert body["error"]
+
+
+@pytest.mark.parametrize("length", ["-1", "abc"])
+def test_bad_content_length_is_rejected(server, length):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        connection.putrequest("POST", "/schedule")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read())["error"]
+    finally:
+        connection.close()
+
+
+def test_task_lookup_rescans_only_when_the_directory_changes(server, tmp_path, monkeypatch):
+    repository = server.service.repository
+    refreshed = []
+    original = repository.refresh
+    monkeypatch.setattr(repository, "refresh", lambda: refreshed.append(1) or original())
+
+    assert request(server, "/tasks/1203")[0] == 200
+    assert request(server, "/tasks/1203")[0] == 200
+    assert refreshed == []
+
+    ProductRepository(str(tmp_path)).save("크림", make_product(codes=["1203", "", ""]))
+    status, body = request(server, "/tasks/1203")
+    assert status == 200 and [match["product"] for match in body["matches"]] == ["세럼", "크림"]
+    assert refreshed == [1]
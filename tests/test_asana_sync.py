@@ -0,0 +1,193 @@
+# tests/test_asana_sync.py - Asana 날짜 동기화: 배치 전송, 변경 없는 작업 생략, 코드 검증 (로컬 가짜 서버)
+
+import asyncio
+import threading
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from conftest import make_product
+from plm.asana_sync import AsanaSyncClient, TaskUpdate, collect_task_updates, sync_task_dates, task_gid
+from plm.fake_asana import API_PREFIX, make_fake_asana
+from plm.ratelimit import TokenBucket, parse_retry_after
+
+
+def start_server(**kwargs):
+    """가짜 Asana 서버 실행 - (server, base_url), 종료 대기를 줄이려고 poll 간격을 짧게"""
+    server = make_fake_asana(**kwargs)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}{API_PREFIX}"
+
+
+@pytest.fixture
+def fake_asana():
+    server, base_url = start_server()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def portfolio(count=5, phases=5, target_date=date(2026, 3, 31)):
+    """제품 count개 × 단계 phases개, 모든 단계에 서로 다른 gid"""
+    return {
+        f"제품{p}": make_product(
+            lead_times=[3] * phases, target_date=target_date,
+            codes=[str(1200000 + p * 100 + i) for i in range(phases)],
+        )
+        for p in range(count)
+    }
+
+
+def sync(products, base_url, state_path=None, **options):
+    options.setdefault("rate", 1000)
+    options.setdefault("burst", 1000)
+    return sync_task_dates(products, "test-token", state_path=state_path, base_url=base_url, **options)
+
+
+@pytest.mark.parametrize("code, gid", [
+    ("1203", "1203"),
+    (" 1203 ", "1203"),
+    ("https://app.asana.com/0/1111/2222", "2222"),
+    ("https://app.asana.com/0/1111/2222/f?x=1", "2222"),
+    ("T-12", None),
+    ("12a", None),
+    ("https://example.com/tasks/abc", None),
+    ("", None),
+])
+def test_task_gid(code, gid):
+    assert task_gid(code) == gid
+
+
+def test_updates_are_sent_in_batches(fake_asana):
+    server, base_url = fake_asana
+    report = sync(portfolio(5, 5), base_url, batch_size=10)
+    assert (report["total"], report["sent"], report["failed"]) == (25, 25, 0)
+    assert report["requests"] == 3  # 10 + 10 + 5
+    assert server.state.stats["batches"] == 3
+    assert server.state.stats["updates"] == 25
+    assert server.state.tasks["1200000"]["due_on"]
+
+
+def test_single_task_uses_put(fake_asana):
+    server, base_url = fake_asana
+    report = sync(portfolio(1, 1), base_url)
+    assert report["sent"] == 1
+    assert server.state.stats["batches"] == 0 and server.state.stats["updates"] == 1
+
+
+def test_unchanged_tasks_are_skipped_by_digest(fake_asana, tmp_path):
+    server, base_url = fake_asana
+    state_path = str(tmp_path / "asana_sync_state.json")
+    products = portfolio(3, 4)
+
+    first = sync(products, base_url, state_path)
+    assert first["sent"] == 12
+
+    second = sync(products, base_url, state_path)
+    assert (second["sent"], second["skipped"], second["requests"]) == (0, 12, 0)
+
+    # 한 제품의 목표일만 바뀌면 그 제품 작업만 다시 전송
+    products["제품1"] = dict(products["제품1"], target_date=date(2026, 4, 30))
+    third = sync(products, base_url, state_path)
+    assert (third["sent"], third["skipped"]) == (4, 8)
+
+    assert sync(products, base_url, state_path, force=True)["sent"] == 12
+
+
+def test_failed_tasks_are_retried_next_time(tmp_path):
+    state_path = str(tmp_path / "asana_sync_state.json")
+    products = portfolio(1, 3)
+    server, base_url = start_server(known_gids={"1200000", "1200001"})
+    try:
+        report = sync(products, base_url, state_path)
+        assert (report["sent"], report["failed"]) == (2, 1)
+        assert "1200002" in report["errors"][0]
+        again = sync(products, base_url, state_path)
+        assert (again["sent"], again["skipped"], again["failed"]) == (0, 2, 1)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_invalid_and_duplicate_codes_are_reported_before_sending(fake_asana):
+    server, base_url = fake_asana
+    products = {
+        "A": make_product(lead_times=(3, 3, 3), codes=["1201", "T-12", "1202"]),
+        "B": make_product(lead_times=(3, 3), codes=["1202", "1203"]),
+    }
+    updates, invalid, duplicates = collect_task_updates(products)
+    assert sorted(update.gid for update in updates) == ["1201", "1203"]
+    assert invalid == ["A · 단계 2: T-12"]
+    assert duplicates == ["1202: A · 단계 3, B · 단계 1"]
+
+    report = sync(products, base_url)
+    assert report["sent"] == 2 and report["failed"] == 0
+    assert report["invalid"] == invalid and report["duplicates"] == duplicates
+    assert sorted(server.state.tasks) == ["1201", "1203"]
+
+
+class CountingBucket(TokenBucket):
+    """대기 없이 토큰을 주고 요청한 토큰 수와 penalize 호출을 기록하는 버킷"""
+
+    def __init__(self, capacity=5):
+        super().__init__(1000, capacity)
+        self.acquired = []
+        self.penalties = []
+
+    async def acquire_async(self, tokens=1):
+        self.acquired.append(tokens)
+        return 0.0
+
+    def penalize(self, seconds):
+        self.penalties.append(seconds)
+
+
+class ScriptedClient(AsanaSyncClient):
+    """HTTP 대신 미리 정한 응답을 순서대로 돌려주는 클라이언트"""
+
+    def __init__(self, responses, **kwargs):
+        super().__init__("test-token", **kwargs)
+        self.responses = list(responses)
+
+    def _request(self, method, path, payload):
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        status, headers, body = self.responses[0]
+        if path == "/batch":
+            body = {"data": [{"status_code": status, "body": {}} for _ in payload["data"]["actions"]]}
+        return status, headers, body
+
+
+def updates(count):
+    return [TaskUpdate(str(1200 + i), "A", f"단계 {i}", "2026-03-02", "2026-03-06") for i in range(count)]
+
+
+def test_parse_retry_after():
+    now = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now) == 30.0
+    assert parse_retry_after(format_datetime(now - timedelta(seconds=30), usegmt=True), now) is None
+    for value in (None, "", "0", "-3", "soon"):
+        assert parse_retry_after(value) is None
+
+
+def test_http_date_retry_after_penalizes_instead_of_failing():
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    bucket = CountingBucket()
+    client = ScriptedClient([(429, {"Retry-After": retry_at}, {}), (200, {}, {})], bucket=bucket)
+    results = asyncio.run(client.push(updates(1)))
+    assert results == [(updates(1)[0], None)]
+    assert len(bucket.penalties) == 1 and 50 < bucket.penalties[0] <= 60
+    assert client.stats == {"requests": 2, "retries": 1}
+
+
+def test_batch_takes_one_token_per_action():
+    bucket = CountingBucket(capacity=4)
+    client = ScriptedClient([(200, {}, {})], bucket=bucket, batch_size=10, concurrency=1)
+    results = asyncio.run(client.push(updates(13)))
+    assert [error for _, error in results] == [None] * 13
+    # 10개 묶음은 용량(4)씩 나눠 10토큰, 나머지 3개 묶음은 3토큰
+    assert sum(bucket.acquired) == 13 and max(bucket.acquired) <= 4
+    assert client.stats["requests"] == 2
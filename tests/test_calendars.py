@@ -0,0 +1,68 @@
+# tests/test_calendars.py - 근무 캘린더 역산이 backward_schedule / 하루씩 세는 규칙과 같은지 무작위 비교
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from plm.calendars import WorkingCalendar, parse_workdays
+from plm.excludes import ExcludeSet
+from plm.schedule import backward_schedule
+
+
+def reference_start(calendar, end_date, lead_time):
+    """backward_schedule의 하루씩 세는 규칙을 캘린더 근무일로 옮긴 기준 구현"""
+    workdays, cursor = 0, end_date
+    while workdays < lead_time:
+        cursor -= timedelta(days=1)
+        if calendar.is_workday(cursor):
+            workdays += 1
+    start = cursor + timedelta(days=1)
+    while not calendar.is_workday(start):
+        start -= timedelta(days=1)
+    return start
+
+
+def random_case(rng):
+    target_date = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+    leads = [rng.choice([0, 0, 1, 2, 5, 10, 25]) for _ in range(rng.randint(1, 5))]
+    holidays = ExcludeSet(target_date - timedelta(days=rng.randint(-10, 150)) for _ in range(rng.randint(0, 20)))
+    return target_date, leads, holidays
+
+
+def test_weekday_calendar_matches_backward_schedule():
+    rng = random.Random(20260331)
+    for _ in range(30):
+        target_date, leads, holidays = random_case(rng)
+        calendar = WorkingCalendar("국내", "월화수목금", holidays)
+        phases = [{"단계": f"단계 {i + 1}", "리드타임": lead, "캘린더": "국내"} for i, lead in enumerate(leads)]
+        with_calendar = backward_schedule(target_date, phases, ExcludeSet(), {"국내": calendar})
+        without = backward_schedule(target_date, [dict(phase, 캘린더="") for phase in phases], holidays)
+        assert with_calendar == without
+
+
+@pytest.mark.parametrize("workdays", ["월화수목금토", "월수금", "일"])
+def test_other_workdays_match_reference(workdays):
+    rng = random.Random(workdays)
+    for _ in range(30):
+        target_date, leads, holidays = random_case(rng)
+        calendar = WorkingCalendar("공장", workdays, holidays)
+        end = target_date
+        for lead in reversed(leads):
+            start = calendar.backward_start(end, lead)
+            assert start == reference_start(calendar, end, lead)
+            end = start
+
+
+def test_index_grows_for_dates_outside_the_initial_range():
+    calendar = WorkingCalendar("공장", "월화수목금토", years=(2026, 2026))
+    for end_date, lead in [(date(2026, 6, 30), 400), (date(2028, 2, 29), 10), (date(2026, 1, 5), 3)]:
+        assert calendar.backward_start(end_date, lead) == reference_start(calendar, end_date, lead)
+
+
+def test_weekmask_and_parse_workdays():
+    assert WorkingCalendar("공장", "월화수목금토").weekmask == "1111110"
+    assert WorkingCalendar("기본").weekmask == "1111100"
+    assert parse_workdays(["월", "토"]) == (0, 5)
+    with pytest.raises(ValueError):
+        parse_workdays("월요일")
@@ -0,0 +1,61 @@
+# tests/test_cli.py - 일괄 일정 계산 CLI (제품별 목표완료일, 결과 파일)
+
+import csv
+import json
+from datetime import date
+
+from conftest import make_product
+from plm.cli import main
+from plm.repository import ProductRepository
+
+
+def summary_rows(output_dir):
+    with open(output_dir / "_요약.csv", encoding="utf-8-sig", newline="") as f:
+        return {row["제품"]: row for row in csv.DictReader(f)}
+
+
+def test_targets_are_matched_by_product_name(tmp_path, capsys):
+    products = tmp_path / "products"
+    products.mkdir()
+    repository = ProductRepository(str(products))
+    # 'A B'와 'A_B'는 파일명이 겹쳐 한쪽은 해시 접미사 파일명이 됨, 'C D_E'는 공백과 '_'가 섞임
+    for name in ("A B", "A_B", "C D_E"):
+        repository.save(name, make_product(target_date=date(2026, 3, 31)))
+    targets = tmp_path / "targets.json"
+    targets.write_text(json.dumps({"A B": "2026-05-29", "A_B": "2026-06-30", "C D_E": "2026-07-31", "없는 제품": "2026-01-30"},
+                                  ensure_ascii=False), encoding="utf-8")
+
+    output = tmp_path / "out"
+    assert main(["schedule", str(products), "--output", str(output), "--targets", str(targets), "--workers", "1"]) == 0
+    rows = summary_rows(output)
+    assert {name: rows[name]["목표완료일"] for name in rows} == {
+        "A B": "2026-05-29", "A_B": "2026-06-30", "C D_E": "2026-07-31",
+    }
+    assert "없는 제품" in capsys.readouterr().err
+
+
+def test_target_date_option_applies_to_products_without_a_target(tmp_path):
+    products = tmp_path / "products"
+    products.mkdir()
+    repository = ProductRepository(str(products))
+    repository.save("A", make_product())
+    repository.save("B", make_product())
+    targets = tmp_path / "targets.csv"
+    targets.write_text("제품,목표완료일\nA,2026-05-29\n", encoding="utf-8")
+
+    output = tmp_path / "out"
+    main(["schedule", str(products), "--output", str(output), "--targets", str(targets),
+          "--target-date", "2026-09-30", "--workers", "1"])
+    rows = summary_rows(output)
+    assert (rows["A"]["목표완료일"], rows["B"]["목표완료일"]) == ("2026-05-29", "2026-09-30")
+
+
+def test_html_uses_the_paged_calendar(tmp_path):
+    products = tmp_path / "products"
+    products.mkdir()
+    ProductRepository(str(products)).save("A", make_product(lead_times=(5, 30, 3)))
+    output = tmp_path / "out"
+    assert main(["schedule", str(products), "--output", str(output), "--html", "--workers", "1"]) == 0
+    html = (output / "A_캘린더.html").read_text(encoding="utf-8")
+    assert "2026년 02월" in html and "2026년 03월" in html
+    assert "2026년 01월" not in html and "2026년 04월" not in html
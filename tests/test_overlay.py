@@ -0,0 +1,52 @@
+# tests/test_overlay.py - 포트폴리오 겹침 캘린더: 일별 진행 단계 수, 담당자 중복 배정
+
+from datetime import date
+
+from conftest import make_product
+from plm.overlay import PhaseIntervalIndex, overlay_months, render_overlay_page
+from plm.portfolio import compute_portfolio_schedule
+
+
+def index_for(products):
+    return PhaseIntervalIndex(compute_portfolio_schedule(products))
+
+
+def test_consecutive_phases_of_one_assignee_are_not_a_conflict():
+    # 기획(3일) 7/14~7/16, 생산(2일) 7/16~7/17 - 7/16 인계일은 생산 몫
+    index = index_for({"A": make_product(lead_times=(3, 2), target_date=date(2026, 7, 17), excludes=(),
+                                         members=("김",))})
+    window = index.window(date(2026, 7, 13), date(2026, 7, 17))
+    assert window.total.tolist() == [0, 1, 1, 1, 1]
+    assert index.conflicts(window).empty
+
+
+def test_overlapping_products_are_a_conflict():
+    index = index_for({
+        "A": make_product(lead_times=(3, 2), target_date=date(2026, 7, 17), excludes=(), members=("김",)),
+        "B": make_product(lead_times=(2,), target_date=date(2026, 7, 16), excludes=(), members=("김",)),
+    })
+    window = index.window(date(2026, 7, 13), date(2026, 7, 17))
+    assert window.total.tolist() == [0, 1, 2, 2, 1]
+    conflicts = index.conflicts(window)
+    assert conflicts["날짜"].tolist() == [date(2026, 7, 15), date(2026, 7, 16)]
+    assert conflicts["단계"].tolist() == ["A · 단계 1, B · 단계 1", "B · 단계 1, A · 단계 2"]
+    assert set(conflicts["담당자"]) == {"김"} and set(conflicts["건수"]) == {2}
+
+
+def test_unassigned_phases_and_weekends_are_not_conflicts():
+    index = index_for({
+        "A": make_product(lead_times=(10,), target_date=date(2026, 7, 17), excludes=(), members=()),
+        "B": make_product(lead_times=(10,), target_date=date(2026, 7, 17), excludes=(), members=()),
+    })
+    window = index.window(date(2026, 7, 6), date(2026, 7, 12))
+    assert window.total.tolist() == [2, 2, 2, 2, 2, 2, 2]  # 주말도 구간 안이면 진행 중
+    assert index.conflicts(window).empty
+
+
+def test_render_page_covers_the_schedule_months():
+    index = index_for({"A": make_product(lead_times=(20, 10), target_date=date(2026, 3, 31))})
+    months = overlay_months(index)
+    assert [str(month) for month in months] == ["2026-02", "2026-03"]
+    html, window = render_overlay_page(index, months)
+    assert "2026년 02월" in html and "2026년 03월" in html
+    assert len(window.days) == 28 + 31
@@ -0,0 +1,64 @@
+# tests/test_repository.py - 로컬 제품 저장소 (파일명 충돌, 외부 변경 반영, 리드타임 해석)
+
+import json
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import make_product
+from plm.repository import PRODUCT_FILE_SUFFIX, ProductRepository, normalize_phase_record, product_filename
+
+
+def test_colliding_names_get_separate_files(tmp_path):
+    repository = ProductRepository(str(tmp_path))
+    assert product_filename("A B") == product_filename("A_B")
+
+    first = repository.save("A B", make_product(lead_times=(1,)))
+    second = repository.save("A_B", make_product(lead_times=(2,)))
+    assert first != second
+    assert repository.save("A B", make_product(lead_times=(3,))) == first  # 같은 제품은 같은 파일
+
+    reopened = ProductRepository(str(tmp_path))
+    assert sorted(reopened.names()) == ["A B", "A_B"]
+    assert reopened.load("A B")["phases"]["리드타임"].tolist() == [3]
+    assert reopened.load("A_B")["phases"]["리드타임"].tolist() == [2]
+
+
+def test_external_writes_are_picked_up(tmp_path):
+    repository = ProductRepository(str(tmp_path))
+    assert not repository.refresh_if_changed()
+
+    ProductRepository(str(tmp_path)).save("다른 프로세스", make_product())
+    assert repository.refresh_if_changed()
+    assert repository.names() == ["다른 프로세스"]
+    assert not repository.refresh_if_changed()
+
+    os.remove(tmp_path / f"다른_프로세스{PRODUCT_FILE_SUFFIX}")
+    assert repository.refresh_if_changed()
+    assert repository.names() == []
+
+
+@pytest.mark.parametrize("value, expected", [
+    (20, 20), ("20", 20), ("20.0", 20), (20.0, 20), (math.nan, 0), (math.inf, 0), ("inf", 0), (None, 0), ("", 0), ("약 3주", 0),
+])
+def test_lead_time_is_parsed_leniently(value, expected):
+    assert normalize_phase_record({"단계": "기획", "리드타임": value})["리드타임"] == expected
+
+
+def test_bad_lead_time_does_not_break_loading(tmp_path):
+    data = {"product_name": "세럼", "target_date": "2026-03-31", "custom_excludes": [], "team_members": [],
+            "phases": [{"단계": "기획", "리드타임": "20.0"}, {"단계": "생산", "리드타임": "미정"}]}
+    (tmp_path / f"세럼{PRODUCT_FILE_SUFFIX}").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    loaded = ProductRepository(str(tmp_path)).load("세럼")
+    assert loaded["phases"]["리드타임"].tolist() == [20, 0]
+
+
+def test_repository_does_not_load_pandas():
+    """CLI 빠른 시작 - plm.cli / plm.repository import만으로는 pandas를 읽지 않아야 함"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, plm.cli, plm.repository; print('pandas' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,97 @@
+# tests/test_scenarios.py - 시나리오 일괄 계산(schedule_matrix)이 backward_schedule과 같은지 무작위 비교
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from plm.calendars import WorkingCalendar, phase_calendars
+from plm.excludes import ExcludeSet
+from plm.scenarios import Scenario, compare_scenarios, lead_time_matrix, run_scenarios, schedule_matrix
+from plm.schedule import backward_schedule
+
+
+def random_excludes(rng, target_date, count):
+    """목표일 앞뒤로 흩어진 제외일 (주말이 섞여도 됨)"""
+    return ExcludeSet(target_date - timedelta(days=rng.randint(-10, 200)) for _ in range(count))
+
+
+def expected_ordinals(target_date, leads, excludes):
+    schedule = backward_schedule(target_date, [{"단계": str(i), "리드타임": lead} for i, lead in enumerate(leads)],
+                                 excludes)
+    return [row["시작일"].toordinal() for row in schedule], [row["종료일"].toordinal() for row in schedule]
+
+
+def test_schedule_matrix_matches_backward_schedule():
+    rng = random.Random(20260331)
+    for _ in range(30):
+        scenario_count, phase_count = rng.randint(1, 6), rng.randint(1, 6)
+        target_dates = [date(2026, 1, 1) + timedelta(days=rng.randint(0, 365)) for _ in range(scenario_count)]
+        leads = [[rng.choice([0, 0, 1, 2, 5, 10, 30]) for _ in range(phase_count)] for _ in range(scenario_count)]
+        exclude_sets = [random_excludes(rng, day, rng.randint(0, 25)) for day in target_dates]
+
+        starts, ends = schedule_matrix(target_dates, leads, exclude_sets)
+        assert starts.shape == ends.shape == (scenario_count, phase_count)
+        for row in range(scenario_count):
+            expected_starts, expected_ends = expected_ordinals(target_dates[row], leads[row], exclude_sets[row])
+            assert starts[row].tolist() == expected_starts
+            assert ends[row].tolist() == expected_ends
+
+
+def test_shared_exclude_set():
+    excludes = ExcludeSet([date(2026, 3, 30), date(2026, 3, 27), date(2026, 3, 1)])
+    target_dates = [date(2026, 3, 31), date(2026, 4, 4), date(2026, 3, 29)]
+    leads = [[5, 0, 3], [0, 0, 0], [20, 1, 0]]
+    starts, ends = schedule_matrix(target_dates, leads, [excludes])
+    for row, target_date in enumerate(target_dates):
+        assert (starts[row].tolist(), ends[row].tolist()) == expected_ordinals(target_date, leads[row], excludes)
+
+
+def test_run_scenarios_applies_overrides():
+    phases = [{"단계": "기획", "리드타임": 5}, {"단계": "생산", "리드타임": 10}]
+    excludes = ExcludeSet([date(2026, 3, 2)])
+    scenarios = [Scenario("생산 단축", {1: 4}, (date(2026, 3, 20),), 7)]
+    assert lead_time_matrix(phases, scenarios).tolist() == [[5, 4]]
+
+    names, starts, _ = run_scenarios(date(2026, 3, 31), phases, excludes, scenarios)
+    assert [scenario.name for scenario in names] == ["기준", "생산 단축"]
+    expected, _ = expected_ordinals(date(2026, 4, 7), [5, 4], excludes | ExcludeSet([date(2026, 3, 20)]))
+    assert starts[1].tolist() == expected
+
+    summary, _ = compare_scenarios(date(2026, 3, 31), phases, excludes, scenarios)
+    assert summary["시작일 변화(일)"].tolist() == (starts[:, 0] - starts[0, 0]).tolist()
+    assert np.array_equal(summary["총 리드타임"].to_numpy(), [15, 9])
+
+
+def test_calendar_columns_match_backward_schedule():
+    rng = random.Random(20260717)
+    calendars = {
+        "중국 공장": WorkingCalendar("중국 공장", "월화수목금토", [date(2026, 2, 16), date(2026, 2, 17), date(2026, 2, 18)]),
+        "주 3일": WorkingCalendar("주 3일", "월수금"),
+    }
+    for _ in range(30):
+        phase_count = rng.randint(1, 6)
+        phases = [{"단계": str(i), "리드타임": rng.choice([0, 1, 3, 10, 30]),
+                   "캘린더": rng.choice(["", "", "중국 공장", "주 3일", "없는 캘린더"])} for i in range(phase_count)]
+        target_date = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+        excludes = random_excludes(rng, target_date, rng.randint(0, 25))
+
+        starts, ends = schedule_matrix([target_date], lead_time_matrix(phases, [Scenario("기준", {}, (), 0)]), [excludes],
+                                       phase_calendars(phases, calendars))
+        expected = backward_schedule(target_date, phases, excludes, calendars)
+        assert starts[0].tolist() == [row["시작일"].toordinal() for row in expected]
+        assert ends[0].tolist() == [row["종료일"].toordinal() for row in expected]
+
+
+def test_run_scenarios_with_calendars():
+    calendars = {"주 3일": WorkingCalendar("주 3일", "월수금")}
+    phases = [{"단계": "기획", "리드타임": 5}, {"단계": "생산", "리드타임": 6, "캘린더": "주 3일"}]
+    excludes = ExcludeSet([date(2026, 3, 2)])
+    # 추가 제외일은 제품 기본 캘린더 단계에만 적용됨
+    scenarios = [Scenario("생산 단축", {1: 3}, (date(2026, 3, 18),), 0)]
+    _, starts, _ = run_scenarios(date(2026, 3, 31), phases, excludes, scenarios, calendars)
+    assert starts[0].tolist() == [row["시작일"].toordinal()
+                                  for row in backward_schedule(date(2026, 3, 31), phases, excludes, calendars)]
+    shortened = [phases[0], dict(phases[1], 리드타임=3)]
+    assert starts[1].tolist() == [row["시작일"].toordinal() for row in backward_schedule(
+        date(2026, 3, 31), shortened, excludes | ExcludeSet([date(2026, 3, 18)]), calendars)]
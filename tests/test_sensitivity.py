@@ -0,0 +1,31 @@
+# tests/test_sensitivity.py - 단계별 지연 민감도가 backward_schedule로 직접 다시 계산한 값과 같은지
+
+from datetime import date
+
+import pytest
+
+from plm.calendars import WorkingCalendar
+from plm.excludes import ExcludeSet
+from plm.schedule import backward_schedule
+from plm.sensitivity import phase_sensitivity
+
+PHASES = [
+    {"단계": "기획", "리드타임": 5},
+    {"단계": "부자재", "리드타임": 8, "캘린더": "중국 공장"},
+    {"단계": "생산", "리드타임": 10},
+]
+CALENDARS = {"중국 공장": WorkingCalendar("중국 공장", "월화수목금토", [date(2026, 2, 16), date(2026, 2, 17)])}
+EXCLUDES = ExcludeSet([date(2026, 3, 2), date(2026, 3, 20)])
+
+
+@pytest.mark.parametrize("calendars", [None, CALENDARS])
+def test_sensitivity_matches_backward_schedule(calendars):
+    target_date = date(2026, 3, 31)
+    report = phase_sensitivity(target_date, PHASES, EXCLUDES, steps=(1, 5), calendars=calendars)
+    base = backward_schedule(target_date, PHASES, EXCLUDES, calendars)[0]["시작일"]
+    for i, phase in enumerate(PHASES):
+        for step in (1, 5):
+            delayed = [dict(p, 리드타임=p["리드타임"] + step) if j == i else p for j, p in enumerate(PHASES)]
+            moved = backward_schedule(target_date, delayed, EXCLUDES, calendars)[0]["시작일"]
+            assert report.loc[i, f"+{step}일 앞당김(달력일)"] == (base - moved).days
+    assert report["단계"].tolist() == ["기획", "부자재", "생산"]
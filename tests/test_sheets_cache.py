@@ -0,0 +1,102 @@
+# tests/test_sheets_cache.py - ProductSheetCache: 저장일시(B3) 셀로 재검증
+
+from datetime import date
+
+from conftest import make_product
+from plm.sheets_cache import REVISION_CELL, ProductSheetCache, response_revision, sheet_range
+from plm.storage import SheetsStorage, fake_sheets_storage
+
+
+def cached_storage():
+    cache = ProductSheetCache()
+    storage, backend = fake_sheets_storage(cache=cache)
+    return storage, backend, cache
+
+
+def test_revision_cell_is_the_saved_at_value():
+    storage, _ = fake_sheets_storage()
+    saved_at = storage.save("A", make_product())
+    response = storage.spreadsheet.values_get(sheet_range(storage.worksheet_title("A"), REVISION_CELL))
+    assert REVISION_CELL == "B3"
+    assert response_revision(response) == saved_at
+    assert storage.revision("A") == saved_at
+    assert storage.revision("없는 제품") is None
+
+
+def test_unchanged_sheet_is_served_from_cache_after_one_cell_read():
+    storage, backend, cache = cached_storage()
+    storage.save("A", make_product())
+
+    reads = backend.stats["reads"]
+    loaded = storage.load("A")
+    assert backend.stats["reads"] == reads + 1  # 저장일시 셀 1칸만 읽음
+    assert cache.stats["hits"] == 1
+    assert loaded["phases"]["리드타임"].tolist() == [5, 10, 3]
+
+
+def test_external_save_is_detected_by_the_revision_cell():
+    storage, backend, cache = cached_storage()
+    storage.save("A", make_product())
+    storage.load("A")
+
+    # 캐시를 모르는 다른 프로세스가 같은 워크시트에 저장
+    other = SheetsStorage(storage.spreadsheet)
+    other.save("A", make_product(lead_times=(1, 2, 3), target_date=date(2026, 6, 30)))
+
+    reads = backend.stats["reads"]
+    loaded = storage.load("A")
+    assert backend.stats["reads"] == reads + 2  # 저장일시 셀 + 전체 값
+    assert loaded["phases"]["리드타임"].tolist() == [1, 2, 3]
+    assert loaded["target_date"] == date(2026, 6, 30)
+
+    # 새 버전으로 다시 캐시됨
+    reads = backend.stats["reads"]
+    assert storage.load("A")["target_date"] == date(2026, 6, 30)
+    assert backend.stats["reads"] == reads + 1
+
+
+def test_cached_values_match_a_fresh_read():
+    """저장 직후 캐시에 넣은 값과 Sheets에서 새로 읽은 값이 같아야 함 (실수 리드타임 포함)"""
+    storage, _, _ = cached_storage()
+    product = make_product()
+    product["phases"]["리드타임"] = product["phases"]["리드타임"].astype(float)
+    storage.save("A", product)
+
+    from_cache = storage.load("A")
+    fresh = SheetsStorage(storage.spreadsheet).load("A")
+    assert from_cache["phases"].equals(fresh["phases"])
+    assert from_cache["phases"]["리드타임"].tolist() == [5, 10, 3]
+    assert from_cache["custom_excludes"] == fresh["custom_excludes"]
+
+
+def test_cache_returns_copies():
+    storage, _, _ = cached_storage()
+    storage.save("A", make_product())
+    first = storage.load("A")
+    first["phases"].loc[0, "리드타임"] = 99
+    first["team_members"].append("다른 사람")
+    second = storage.load("A")
+    assert second["phases"].loc[0, "리드타임"] == 5
+    assert second["team_members"] == ["김담당"]
+
+
+def test_entries_without_revision_are_not_cached():
+    cache = ProductSheetCache()
+    cache.put("sheet", "A_데이터", "", {"phases": None})
+    assert len(cache) == 0
+    assert cache.get("sheet", "A_데이터", "") is None
+
+
+def test_delete_invalidates_and_lru_evicts():
+    storage, _, cache = cached_storage()
+    storage.save("A", make_product())
+    assert storage.delete("A")
+    assert storage.load("A") is None
+    assert len(cache) == 0
+
+    small = ProductSheetCache(max_entries=2)
+    entry = {"phases": None, "schedule": None, "custom_excludes": make_product()["custom_excludes"], "team_members": []}
+    for title in ("A", "B", "C"):
+        small.put("sheet", title, "v1", entry)
+    assert small.get("sheet", "A", "v1") is None
+    assert small.get("sheet", "C", "v1") is not None
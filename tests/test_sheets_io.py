@@ -0,0 +1,176 @@
+# tests/test_sheets_io.py - SheetsIO 재시도/백오프, Retry-After, 동일 읽기 병합
+
+import threading
+import time
+
+import pytest
+
+from plm.fake_sheets import FakeAPIError, FakeSheetsBackend, WorksheetNotFound
+from plm.sheets_io import SheetsIO, is_retryable, retry_after_seconds
+
+
+class RecordingBucket:
+    """대기 없이 토큰을 주고 penalize 호출만 기록하는 버킷"""
+
+    def __init__(self):
+        self.penalties = []
+
+    def acquire(self, tokens=1):
+        return 0.0
+
+    def penalize(self, seconds):
+        self.penalties.append(seconds)
+
+
+def make_io(**kwargs):
+    sleeps = []
+    bucket = RecordingBucket()
+    return SheetsIO(bucket=bucket, sleep=sleeps.append, **kwargs), bucket, sleeps
+
+
+def failing(statuses, result="ok", headers=None):
+    """statuses 순서대로 FakeAPIError를 낸 뒤 result를 반환하는 함수"""
+    remaining = list(statuses)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if remaining:
+            raise FakeAPIError(remaining.pop(0), "error", headers)
+        return result
+    return fn, calls
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retries_transient_errors_with_backoff(status):
+    io, bucket, sleeps = make_io(base_delay=1.0, max_delay=32.0)
+    fn, calls = failing([status, status])
+    assert io.call("values_get", fn) == "ok"
+    assert len(calls) == 3
+    # 지수 백오프 × 0.5~1 지터
+    assert len(sleeps) == 2
+    assert 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+    stats = io.snapshot_stats()["values_get"]
+    assert (stats["calls"], stats["requests"], stats["retries"], stats["errors"]) == (1, 3, 2, 0)
+
+
+def test_retry_after_penalizes_shared_bucket_instead_of_sleeping():
+    io, bucket, sleeps = make_io()
+    fn, calls = failing([429], headers={"Retry-After": "7"})
+    assert io.call("worksheets", fn) == "ok"
+    assert bucket.penalties == [7.0]
+    assert sleeps == []
+
+
+def test_backoff_is_capped():
+    io, _, _ = make_io(base_delay=1.0, max_delay=4.0)
+    assert all(io.backoff(attempt) <= 4.0 for attempt in range(10))
+
+
+def test_gives_up_after_max_retries():
+    io, _, sleeps = make_io(max_retries=2)
+    fn, calls = failing([503] * 5)
+    with pytest.raises(FakeAPIError):
+        io.call("update", fn)
+    assert len(calls) == 3
+    assert io.snapshot_stats()["update"]["errors"] == 1
+
+
+def test_non_retryable_errors_fail_immediately():
+    io, _, sleeps = make_io()
+    fn, calls = failing([400])
+    with pytest.raises(FakeAPIError):
+        io.call("values_get", fn)
+    assert len(calls) == 1 and sleeps == []
+
+    spreadsheet = FakeSheetsBackend().client().create("x")
+    with pytest.raises(WorksheetNotFound):
+        io.call("worksheet", spreadsheet.worksheet, "없는 시트")
+
+
+def test_error_classification():
+    assert is_retryable(FakeAPIError(429, "quota"))
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(FakeAPIError(404, "not found"))
+    assert not is_retryable(WorksheetNotFound("x"))
+    assert retry_after_seconds(FakeAPIError(429, "quota", {"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(FakeAPIError(429, "quota", {"Retry-After": "soon"})) is None
+
+
+def test_against_fake_backend_failures():
+    backend = FakeSheetsBackend()
+    spreadsheet = backend.client().create("x")
+    io, _, _ = make_io()
+    worksheet = io.call("add_worksheet", spreadsheet.add_worksheet, title="A_데이터", rows=10, cols=5)
+    backend.fail_next(503, times=2)
+    io.call("update", worksheet.update, "A1", [["제품명", "A"]])
+    assert io.call("get_all_values", worksheet.get_all_values) == [["제품명", "A"]]
+    assert backend.stats["failed"] == 2
+
+
+def _concurrent_calls(io, fn, count, dedupe_key, release, stat_name="values_get"):
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(io.call(stat_name, fn, dedupe_key=dedupe_key))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    # 첫 호출이 진행 중인 동안 나머지가 모두 합류할 때까지 기다린 뒤 풀어줌
+    deadline = time.monotonic() + 5
+    while io.snapshot_stats().get(stat_name, {}).get("coalesced", 0) < count - 1:
+        assert time.monotonic() < deadline, "동시 호출이 병합되지 않았습니다"
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_identical_concurrent_reads_are_coalesced():
+    io, _, _ = make_io()
+    release = threading.Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        release.wait(5)
+        return [["제품명", "A"]]
+
+    results, errors = _concurrent_calls(io, read, 8, ("sheet", "A_데이터"), release)
+    assert errors == []
+    assert len(calls) == 1
+    assert results == [[["제품명", "A"]]] * 8
+    stats = io.snapshot_stats()["values_get"]
+    assert stats["coalesced"] == 7 and stats["requests"] == 1
+
+    # 끝난 뒤의 같은 읽기는 새로 호출
+    assert io.call("values_get", read, dedupe_key=("sheet", "A_데이터")) == [["제품명", "A"]]
+    assert len(calls) == 2
+
+
+def test_coalesced_waiters_receive_the_error():
+    io, _, _ = make_io(max_retries=0)
+    release = threading.Event()
+
+    def read():
+        release.wait(5)
+        raise FakeAPIError(503, "unavailable")
+
+    results, errors = _concurrent_calls(io, read, 4, "key", release)
+    assert results == []
+    assert len(errors) == 4 and all(isinstance(e, FakeAPIError) for e in errors)
+
+
+def test_different_keys_are_not_coalesced():
+    backend = FakeSheetsBackend()
+    spreadsheet = backend.client().create("x")
+    io, _, _ = make_io()
+    io.call("worksheets", spreadsheet.worksheets, dedupe_key="a")
+    io.call("worksheets", spreadsheet.worksheets, dedupe_key="b")
+    assert backend.stats["reads"] == 2
+    assert io.snapshot_stats()["worksheets"]["coalesced"] == 0
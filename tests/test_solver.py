@@ -0,0 +1,94 @@
+# tests/test_solver.py - 리드타임 단축(solve_compression) 결과가 backward_schedule과 같은지 무작위 비교
+
+import itertools
+import random
+from datetime import date, timedelta
+
+from plm.calendars import WorkingCalendar
+from plm.excludes import ExcludeSet
+from plm.schedule import backward_schedule
+from plm.solver import solve_compression
+
+
+CALENDARS = {
+    "중국 공장": WorkingCalendar("중국 공장", "월화수목금토", [date(2026, 2, 16), date(2026, 2, 17), date(2026, 2, 18)]),
+    "주 3일": WorkingCalendar("주 3일", "월수금"),
+}
+
+
+def phase_list(leads, calendar_names=None):
+    calendar_names = calendar_names or [""] * len(leads)
+    return [{"단계": f"단계 {i + 1}", "리드타임": lead, "캘린더": name}
+            for i, (lead, name) in enumerate(zip(leads, calendar_names))]
+
+
+def first_start(target_date, leads, excludes, calendar_names=None, calendars=None):
+    return backward_schedule(target_date, phase_list(leads, calendar_names), excludes, calendars)[0]["시작일"]
+
+
+def test_solve_compression_matches_backward_schedule():
+    rng = random.Random(20260331)
+    for _ in range(40):
+        target_date = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+        leads = [rng.choice([0, 1, 3, 5, 8, 12, 20]) for _ in range(rng.randint(1, 5))]
+        excludes = ExcludeSet(target_date - timedelta(days=rng.randint(0, 120)) for _ in range(rng.randint(0, 15)))
+        original = first_start(target_date, leads, excludes)
+        earliest = original + timedelta(days=rng.randint(-5, 20))
+
+        result = solve_compression(target_date, phase_list(leads), excludes, earliest_start=earliest)
+        assert result["original_start"] == original
+        assert result["start"] == first_start(target_date, result["lead_times"], excludes)
+        assert all(0 <= new <= old for new, old in zip(result["lead_times"], leads))
+        if result["feasible"]:
+            assert result["verified"]
+            assert result["start"] >= earliest
+        else:
+            assert result["start"] < earliest
+
+
+def test_no_compression_when_start_is_late_enough():
+    excludes = ExcludeSet([date(2026, 3, 2)])
+    result = solve_compression(date(2026, 3, 31), phase_list([5, 10, 3]), excludes, earliest_start=date(2026, 1, 5))
+    assert result["compressed"] == [] and result["cost"] == 0
+    assert result["start"] == result["original_start"] == first_start(date(2026, 3, 31), [5, 10, 3], excludes)
+
+
+def test_calendar_phases_match_backward_schedule_and_are_optimal():
+    rng = random.Random(20260717)
+    for _ in range(40):
+        target_date = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+        leads = [rng.choice([0, 1, 3, 5, 8]) for _ in range(rng.randint(1, 4))]
+        names = [rng.choice(["", "중국 공장", "주 3일"]) for _ in leads]
+        excludes = ExcludeSet(target_date - timedelta(days=rng.randint(0, 60)) for _ in range(rng.randint(0, 10)))
+        costs = [rng.choice([1.0, 2.0, 3.0]) for _ in leads]
+        original = first_start(target_date, leads, excludes, names, CALENDARS)
+        earliest = original + timedelta(days=rng.randint(1, 15))
+
+        result = solve_compression(target_date, phase_list(leads, names), excludes, earliest_start=earliest,
+                                   min_lead_times=[0] * len(leads), crash_costs=costs, calendars=CALENDARS)
+        assert result["original_start"] == original
+        assert result["start"] == first_start(target_date, result["lead_times"], excludes, names, CALENDARS)
+
+        # 작은 문제는 모든 리드타임 조합과 비교해 최소 비용인지 확인
+        feasible_costs = [
+            sum((lead - new) * cost for lead, new, cost in zip(leads, combo, costs))
+            for combo in itertools.product(*(range(lead + 1) for lead in leads))
+            if first_start(target_date, combo, excludes, names, CALENDARS) >= earliest
+        ]
+        assert result["feasible"] == bool(feasible_costs)
+        if feasible_costs:
+            assert result["verified"] and result["start"] >= earliest
+            assert result["cost"] == min(feasible_costs)
+
+
+def test_mixed_calendar_start_in_the_past_gets_a_real_plan():
+    """제품 기본 캘린더로만 보면 늦지 않지만 캘린더 단계 때문에 시작일이 지난 경우에도 단축안을 찾아야 함"""
+    phases = phase_list([5, 6], ["", "주 3일"])
+    excludes = ExcludeSet()
+    original = first_start(date(2026, 3, 31), [5, 6], excludes, ["", "주 3일"], CALENDARS)
+    assert original < first_start(date(2026, 3, 31), [5, 6], excludes)
+    earliest = original + timedelta(days=3)
+
+    result = solve_compression(date(2026, 3, 31), phases, excludes, earliest_start=earliest, calendars=CALENDARS)
+    assert result["feasible"] and result["verified"] and result["compressed"]
+    assert result["start"] >= earliest
@@ -0,0 +1,73 @@
+# tests/test_storage.py - 저장소 백엔드 (JSON / SQLite / 가짜 Sheets) 왕복 저장
+
+from datetime import date
+
+import pytest
+
+from conftest import make_product
+from plm.sheets_cache import ProductSheetCache
+from plm.storage import JsonStorage, SqliteStorage, StorageBackend, fake_sheets_storage
+
+
+@pytest.fixture(params=["json", "sqlite", "sheets", "sheets_cached"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        yield JsonStorage(str(tmp_path))
+    elif request.param == "sqlite":
+        backend = SqliteStorage(str(tmp_path / "products.db"))
+        yield backend
+        backend.close()
+    else:
+        cache = ProductSheetCache() if request.param == "sheets_cached" else None
+        yield fake_sheets_storage(cache=cache)[0]
+
+
+def assert_same_product(loaded, product):
+    columns = ["단계", "리드타임", "담당자", "Asana Task 코드", "캘린더"]
+    assert loaded["phases"][columns].to_dict("records") == product["phases"][columns].to_dict("records")
+    assert loaded["custom_excludes"] == product["custom_excludes"]
+    assert loaded["target_date"] == product["target_date"]
+    assert loaded["team_members"] == product["team_members"]
+
+
+def test_round_trip(storage):
+    product = make_product(
+        lead_times=(5, 0, 12), codes=["1201", "", "https://app.asana.com/0/1/1203"],
+        calendars=["", "국내 공장", ""], excludes=(date(2026, 3, 2), date(2026, 1, 1)),
+    )
+    assert storage.load("세럼") is None
+    assert "세럼" not in storage
+
+    revision = storage.save("세럼", product)
+    assert revision and storage.revision("세럼") == revision
+    assert "세럼" in storage
+    assert storage.names() == ["세럼"]
+    assert_same_product(storage.load("세럼"), product)
+
+
+def test_save_changes_revision_and_overwrites(storage):
+    first = storage.save("세럼", make_product())
+    updated = make_product(lead_times=(1, 2), target_date=date(2026, 9, 1), excludes=())
+    second = storage.save("세럼", updated)
+    assert second != first
+    assert storage.names() == ["세럼"]
+    assert_same_product(storage.load("세럼"), updated)
+
+
+def test_delete(storage):
+    storage.save("A", make_product())
+    storage.save("B", make_product())
+    assert storage.delete("A")
+    assert not storage.delete("A")
+    assert storage.names() == ["B"]
+    assert storage.load("A") is None
+    assert storage.revision("A") is None
+
+
+def test_backend_missing_a_method_fails_on_creation():
+    class Incomplete(StorageBackend):
+        def names(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,52 @@
+# tests/test_workload.py - 담당자별 주간 근무일 부하 (인계일 중복 없이, 근무 캘린더 반영)
+
+from datetime import date
+
+from conftest import make_product
+from plm.calendars import WorkingCalendar
+from plm.portfolio import compute_portfolio_schedule, occupied_ends
+from plm.workload import weekly_workload
+
+
+def workload(products, calendars=None, members=None):
+    portfolio_df = compute_portfolio_schedule(products, calendars)
+    holidays = {name: product["custom_excludes"] for name, product in products.items()}
+    return weekly_workload(portfolio_df, holidays, members, calendars)
+
+
+def test_handoff_day_is_counted_once():
+    # 기획(3일) 7/14~7/16, 생산(2일) 7/16~7/17 - 같은 담당자, 7/16은 한 번만
+    products = {"A": make_product(lead_times=(3, 2), target_date=date(2026, 7, 17), excludes=(), members=("김",))}
+    assert workload(products).to_dict("index") == {"김": {"2026-W29": 4}}
+
+
+def test_occupied_ends_keep_the_last_phase_and_other_products():
+    products = {
+        "A": make_product(lead_times=(3, 2), target_date=date(2026, 7, 17), excludes=()),
+        "B": make_product(lead_times=(2,), target_date=date(2026, 7, 16), excludes=()),
+    }
+    portfolio_df = compute_portfolio_schedule(products)
+    ends = [str(day) for day in occupied_ends(portfolio_df)]
+    # A의 기획은 생산 시작일(7/16) 하루 전까지, B는 A의 생산과 같은 날 시작해도 다른 제품이라 그대로
+    assert ends == ["2026-07-15", "2026-07-17", "2026-07-16"]
+
+
+def test_loads_span_weeks_and_respect_excludes():
+    products = {
+        "A": make_product(lead_times=(5, 5), target_date=date(2026, 3, 31), excludes=(date(2026, 3, 25),),
+                          members=("김",)),
+        "B": make_product(lead_times=(3,), target_date=date(2026, 3, 27), excludes=(), members=("이",)),
+    }
+    result = workload(products, members=["박", "김", "이"])
+    assert list(result.index) == ["박", "김", "이"]
+    assert result.loc["김"].sum() == 9  # 5 + 5 - 인계일 1일 (제외일 3/25는 빠짐)
+    assert result.loc["이"].sum() == 3
+    assert result.loc["박"].sum() == 0
+
+
+def test_calendar_phases_use_the_calendar_workdays():
+    calendars = {"토요일 근무": WorkingCalendar("토요일 근무", "월화수목금토", [date(2026, 7, 13)])}
+    products = {"A": make_product(lead_times=(4, 6), target_date=date(2026, 7, 17), excludes=(), members=("김",),
+                                  calendars=["", "토요일 근무"])}
+    # 생산 6일(토요일 포함, 7/13 휴일 제외) + 기획 4일 - 인계일(생산 몫) 1일
+    assert workload(products, calendars).loc["김"].sum() == 9